@@ -0,0 +1,142 @@
+"""RSVP write throughput and button latency, per-call connections vs utils.adb.
+
+Runs offline against a throwaway database:
+
+    python -m bench.db_rsvp [--writers 20] [--writes 50] [--clicks 200]
+
+"before" replays the old pattern (a fresh sqlite3.connect per call, executed
+on the event loop); "after" goes through the pooled, WAL-backed utils.adb
+layer. Button latency is measured from when a click was due to when its read
+returned, so time spent waiting for a blocked loop counts against it.
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+import zlib
+
+from utils import db, time as nova_time
+
+EVENT_ID = 1
+GUILD_ID = 1
+
+def _legacy_connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _discord_id(player_name):
+    # Stand-in snowflake: one Discord user per benchmark player name
+    return 10**17 + zlib.crc32(player_name.encode())
+
+def _legacy_set_rsvp(path, event_id, player_name, response, reminder_minutes=None, discord_id=None):
+    # Today's SQL, yesterday's connection handling
+    with _legacy_connect(path) as conn:
+        player_id = db._player_id(conn, GUILD_ID, _discord_id(player_name), player_name)
+        conn.execute("""
+            INSERT INTO rsvps (guild_id, event_id, player_id, response, reminder_minutes)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(event_id, player_id) DO UPDATE SET
+              response = excluded.response,
+              reminder_minutes = excluded.reminder_minutes
+        """, (GUILD_ID, event_id, player_id, response, reminder_minutes))
+        conn.commit()
+
+def _legacy_get_rsvp(path, event_id, player_name):
+    with _legacy_connect(path) as conn:
+        row = conn.execute("""
+            SELECT r.response FROM players p
+            JOIN rsvps r ON r.event_id = ? AND r.player_id = p.id
+            WHERE p.guild_id = ? AND p.discord_id = ?
+        """, (event_id, GUILD_ID, _discord_id(player_name))).fetchone()
+        return row["response"] if row else ""
+
+def _seed(path):
+    db.DB_PATH = path
+    db.init_db()
+    db.create_event(GUILD_ID, "Bench Raid", nova_time.parse_utc("2030-01-01 20:00"), "benchmark")
+    db.close_all()
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+async def _run(set_rsvp, get_rsvp, writers, writes, clicks, click_interval):
+    latencies = []
+
+    async def writer(i):
+        for j in range(writes):
+            await set_rsvp(EVENT_ID, f"player{i}_{j % 25}", "yes" if j % 2 else "no", None, str(i))
+
+    async def clicker():
+        start = time.perf_counter()
+        for k in range(clicks):
+            due = start + k * click_interval
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await get_rsvp(EVENT_ID, f"player0_{k % 25}")
+            latencies.append(time.perf_counter() - due)
+
+    t0 = time.perf_counter()
+    write_tasks = [asyncio.create_task(writer(i)) for i in range(writers)]
+    click_task = asyncio.create_task(clicker())
+    await asyncio.gather(*write_tasks)
+    elapsed = time.perf_counter() - t0
+    await click_task
+    return writers * writes / elapsed, latencies
+
+async def _before(path, args):
+    async def set_rsvp(*a):
+        _legacy_set_rsvp(path, *a)
+
+    async def get_rsvp(*a):
+        return _legacy_get_rsvp(path, *a)
+
+    return await _run(set_rsvp, get_rsvp, args.writers, args.writes, args.clicks, args.click_interval)
+
+async def _after(path, args):
+    from utils import adb
+    db.DB_PATH = path
+    try:
+        async def set_rsvp(event_id, player_name, response, reminder_minutes=None, discord_id=None):
+            await adb.set_rsvp(GUILD_ID, event_id, _discord_id(player_name), player_name, response, reminder_minutes)
+
+        async def get_rsvp(event_id, player_name):
+            return await adb.get_rsvp(GUILD_ID, event_id, _discord_id(player_name))
+
+        return await _run(set_rsvp, get_rsvp, args.writers, args.writes, args.clicks, args.click_interval)
+    finally:
+        adb.shutdown()
+
+def _report(label, wps, latencies):
+    print(f"{label:<7} {wps:>10.0f} writes/s   "
+          f"button p50 {statistics.median(latencies) * 1000:7.2f} ms   "
+          f"p99 {_percentile(latencies, 99) * 1000:7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=20, help="concurrent RSVP writers")
+    parser.add_argument("--writes", type=int, default=50, help="writes per writer")
+    parser.add_argument("--clicks", type=int, default=200, help="simulated button clicks")
+    parser.add_argument("--click-interval", type=float, default=0.002, help="seconds between clicks")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path = os.path.join(tmp, "before.db")
+        after_path = os.path.join(tmp, "after.db")
+        _seed(before_path)
+        # The legacy schema ran in the default rollback-journal mode.
+        with _legacy_connect(before_path) as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+        _seed(after_path)
+
+        _report("before", *asyncio.run(_before(before_path, args)))
+        _report("after", *asyncio.run(_after(after_path, args)))
+
+if __name__ == "__main__":
+    main()
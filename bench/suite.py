@@ -0,0 +1,301 @@
+"""Synthetic-guild benchmarks for db queries, Best Times, reminders and the dashboard card.
+
+Seeds a throwaway nova.db at guild scale and times the hot paths with stub
+channels, so it runs offline without a Discord token:
+
+    python -m bench.suite [--players 10000] [--events 500] [--rsvps 50000]
+                          [--output bench_results.json] [--baseline old.json]
+
+Results go to ``--output`` as JSON. With ``--baseline`` each benchmark's
+median is compared against that earlier file, and the exit status is 1 if
+any got slower by more than ``--tolerance``.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time as clock
+
+from utils import db, time
+
+TIMEZONES = [
+    "America/New_York", "America/Chicago", "America/Denver", "America/Los_Angeles",
+    "America/Phoenix", "America/Anchorage", "Pacific/Honolulu", "America/Toronto",
+    "America/Mexico_City", "America/Sao_Paulo", "America/Argentina/Buenos_Aires",
+    "America/Bogota", "America/Lima", "America/Santiago", "Europe/London", "Europe/Dublin",
+    "Europe/Lisbon", "Europe/Paris", "Europe/Berlin", "Europe/Madrid", "Europe/Rome",
+    "Europe/Amsterdam", "Europe/Stockholm", "Europe/Warsaw", "Europe/Athens",
+    "Europe/Helsinki", "Europe/Istanbul", "Europe/Moscow", "Africa/Cairo",
+    "Africa/Johannesburg", "Africa/Lagos", "Asia/Dubai", "Asia/Karachi", "Asia/Kolkata",
+    "Asia/Dhaka", "Asia/Bangkok", "Asia/Singapore", "Asia/Manila", "Asia/Shanghai",
+    "Asia/Seoul", "Asia/Tokyo", "Australia/Perth", "Australia/Adelaide",
+    "Australia/Sydney", "Pacific/Auckland", "UTC",
+]
+
+GUILD_ID = 1
+
+class StubGuild:
+    def __init__(self, guild_id: int = GUILD_ID):
+        self.id = guild_id
+
+class StubChannel:
+    """Accepts sends without a gateway; counts what it was given."""
+
+    def __init__(self, channel_id: int = 1):
+        self.id = channel_id
+        self.guild = StubGuild()
+        self.sent = 0
+
+    async def send(self, content, **kwargs):
+        self.sent += 1
+
+class StubOutbox:
+    """Sends straight to the channel, skipping the rate limiter (we time our code, not Discord's budget)."""
+
+    def send(self, channel, content, priority=None, **kwargs):
+        return asyncio.ensure_future(channel.send(content, **kwargs))
+
+class StubBot:
+    def __init__(self):
+        self.channel = StubChannel()
+        self.outbox = StubOutbox()
+        self.guilds = [self.channel.guild]
+
+    def get_channel(self, channel_id):
+        return self.channel
+
+def snowflake(i: int) -> int:
+    """Discord ID of synthetic player ``i``."""
+    return 10**17 + i
+
+def seed(path: str, players: int, events: int, rsvps: int, rng: random.Random):
+    """Fill a fresh database directly (one transaction per table) at the requested scale."""
+    db.DB_PATH = path
+    db.init_db()
+    conn = db.get_connection()
+    now = time.now_epoch()
+
+    conn.executemany(
+        "INSERT INTO players (id, guild_id, discord_id, player_name, timezone, availability_start, availability_end) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(i + 1, GUILD_ID, snowflake(i), f"player{i}", rng.choice(TIMEZONES), f"{rng.randrange(24):02d}:{rng.choice((0, 30)):02d}",
+          f"{rng.randrange(24):02d}:{rng.choice((0, 30)):02d}") for i in range(players)])
+
+    # A third of the events are past (archive), the rest spread over the next 60 days
+    conn.executemany(
+        "INSERT INTO events (guild_id, title, description, datetime_utc) VALUES (?, ?, ?, ?)",
+        [(GUILD_ID, f"Event {i}", "synthetic", now + rng.randrange(-30 * 86400, 60 * 86400)) for i in range(events)])
+
+    per_event = max(1, rsvps // max(1, events))
+    rows = []
+    for event_id in range(1, events + 1):
+        for i in rng.sample(range(players), min(per_event, players)):
+            reminder = rng.choice((None, 60, 120, 240, 1440)) if rng.random() < 0.4 else None
+            rows.append((GUILD_ID, event_id, i + 1, rng.choice(("yes", "yes", "no")), reminder))
+    conn.executemany(
+        "INSERT INTO rsvps (guild_id, event_id, player_id, response, reminder_minutes) VALUES (?, ?, ?, ?, ?)",
+        rows)
+    conn.commit()
+    conn.execute("ANALYZE")
+    db.close_all()
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+    return {
+        "n": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+    }
+
+def time_sync(fn, rounds: int) -> dict:
+    samples = []
+    for i in range(rounds):
+        start = clock.perf_counter()
+        fn(i)
+        samples.append(clock.perf_counter() - start)
+    return summarize(samples)
+
+async def time_async(fn, rounds: int) -> dict:
+    samples = []
+    for i in range(rounds):
+        start = clock.perf_counter()
+        await fn(i)
+        samples.append(clock.perf_counter() - start)
+    return summarize(samples)
+
+def bench_db(args, rng: random.Random) -> dict:
+    now = time.now_epoch()
+    g = GUILD_ID
+    event_ids = [row["id"] for row in db.get_all_events(g)]
+
+    def player(i):
+        return snowflake(rng.randrange(args.players))
+
+    def rsvp(i):
+        k = rng.randrange(args.players)
+        db.set_rsvp(g, rng.choice(event_ids), snowflake(k), f"player{k}", "yes", 120)
+
+    results = {
+        "db.get_event_card": time_sync(lambda i: db.get_event_card(g, rng.choice(event_ids), player(i)), args.rounds),
+        "db.get_events_after": time_sync(lambda i: db.get_events_after(g, now, 0, 5), args.rounds),
+        "db.get_events_between": time_sync(lambda i: db.get_events_between(g, now, now + 7 * 86400), args.rounds),
+        "db.get_reminders_due": time_sync(lambda i: db.get_reminders_due(g, rng.choice(event_ids)), args.rounds),
+        "db.get_player_timezone": time_sync(lambda i: db.get_player_timezone(g, player(i)), args.rounds),
+        "db.get_pending_reminders": time_sync(lambda i: db.get_pending_reminders(g, now), max(1, args.rounds // 20)),
+        "db.get_all_player_availability": time_sync(lambda i: db.get_all_player_availability(g), max(1, args.rounds // 20)),
+        "db.set_rsvp": time_sync(rsvp, args.rounds),
+    }
+    db.close_all()
+    return results
+
+async def bench_best_times(args) -> dict:
+    from utils import avail
+    from cogs import dash
+
+    async def build(i):
+        avail.forget(GUILD_ID)
+        await avail.coverage_for(GUILD_ID).ensure_loaded()
+
+    results = {"besttimes.build_coverage": await time_async(build, max(1, args.rounds // 100))}
+    results["besttimes.format"] = await time_async(lambda i: dash.format_best_times(GUILD_ID), max(1, args.rounds // 50))
+    return results
+
+async def bench_reminders(args) -> dict:
+    from cogs import rmd
+
+    async def load(i):
+        cog = rmd.ReminderCog(StubBot())
+        await cog.start()
+        cog.cog_unload()
+
+    cog = rmd.ReminderCog(StubBot())
+    await cog.start()
+    upcoming = await rmd.adb.get_events_between(GUILD_ID, time.now_epoch(), rmd.FAR_FUTURE)
+    batches = []
+    for event in upcoming:
+        rows = await rmd.adb.get_reminders_due(GUILD_ID, event["id"])
+        if rows:
+            batches.append((event, [dict(r, event_id=event["id"]) for r in rows]))
+
+    async def fire(i):
+        # One deadline's worth of personal reminders: chunk mentions, send, clear
+        event, rows = batches[i % len(batches)]
+        await cog.send_personal_reminders(event, 120, rows)
+
+    results = {
+        "reminders.load_queue": await time_async(load, max(1, args.rounds // 100)),
+        "reminders.refresh_event": await time_async(
+            lambda i: cog.refresh_event(GUILD_ID, upcoming[i % len(upcoming)]["id"]), max(1, args.rounds // 10)),
+    }
+    if batches:
+        results["reminders.fire_personal"] = await time_async(fire, min(len(batches), max(1, args.rounds // 10)))
+    cog.cog_unload()
+    return results
+
+async def bench_dashboard(args, rng: random.Random) -> dict:
+    from cogs import dash
+
+    pager = await dash.EventPager.upcoming(GUILD_ID)
+    event = pager.current
+    views = [dash.DashboardView(StubBot(), event, rng.choice(TIMEZONES), False, snowflake(i), i)
+             for i in range(min(args.players, 64))]
+
+    async def cold(i):
+        dash.card_cache.invalidate((GUILD_ID, event["id"]))
+        await views[i % len(views)].format_event_text()
+
+    async def warm(i):
+        await views[i % len(views)].format_event_text()
+
+    async def page(i):
+        await pager.next()
+
+    return {
+        "dashboard.format_event_text.cold": await time_async(cold, args.rounds),
+        "dashboard.format_event_text.warm": await time_async(warm, args.rounds),
+        "dashboard.pager_next": await time_async(page, args.rounds),
+    }
+
+async def run_async(args, rng: random.Random) -> dict:
+    from utils import adb
+    try:
+        results = {}
+        results.update(await bench_best_times(args))
+        results.update(await bench_reminders(args))
+        results.update(await bench_dashboard(args, rng))
+        return results
+    finally:
+        adb.shutdown()
+
+def compare(report: dict, baseline_path: str, tolerance: float) -> list[str]:
+    with open(baseline_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    if previous.get("scale") != report["scale"]:
+        print(f"\n⚠️ baseline ran at a different scale: {previous.get('scale')}")
+    results, baseline = report["results"], previous["results"]
+    regressions = []
+    print(f"\n{'benchmark':<36} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if not old or not old["p50_ms"]:
+            continue
+        change = stats["p50_ms"] / old["p50_ms"] - 1
+        flag = "  REGRESSION" if change > tolerance else ""
+        print(f"{name:<36} {old['p50_ms']:>8.3f}ms {stats['p50_ms']:>8.3f}ms {change:>+7.0%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--rsvps", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=500, help="iterations for the cheap benchmarks")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown before flagging")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    os.environ.setdefault("REMINDER_CHANNEL_ID", "1")
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_start = clock.perf_counter()
+        seed(os.path.join(tmp, "nova.db"), args.players, args.events, args.rsvps, rng)
+        print(f"seeded {args.players} players, {args.events} events, {args.rsvps} rsvps "
+              f"in {clock.perf_counter() - seed_start:.1f}s")
+
+        results = bench_db(args, rng)
+        results.update(asyncio.run(run_async(args, rng)))
+
+    for name, stats in results.items():
+        print(f"{name:<36} p50 {stats['p50_ms']:9.3f} ms   p95 {stats['p95_ms']:9.3f} ms   (n={stats['n']})")
+
+    report = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "scale": {"players": args.players, "events": args.events, "rsvps": args.rsvps, "rounds": args.rounds},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {args.output}")
+
+    if args.baseline and compare(report, args.baseline, args.tolerance):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
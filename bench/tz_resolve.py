@@ -0,0 +1,58 @@
+"""Timezone resolutions per second: old normalize_timezone vs the prebuilt resolver.
+
+    python -m bench.tz_resolve [--rounds 20000]
+
+Inputs mix aliases, canonical names, sloppy casing and city names, the way
+players actually type them into the modals.
+"""
+import argparse
+import time as clock
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from utils import time
+
+INPUTS = ["est", "central", "Europe/Paris", "europe/paris", "america/new_york",
+          "UTC", "pst", "Asia/Tokyo", "aest", "america/argentina/buenos_aires"]
+
+def _legacy_normalize(tz_input: str) -> str:
+    """normalize_timezone as it was before the resolver (new ZoneInfo lookup every call)."""
+    key = tz_input.strip().lower()
+    canonical = time.ALIAS_MAP.get(key, key)
+    try:
+        ZoneInfo(canonical)
+        return canonical
+    except ZoneInfoNotFoundError:
+        pass
+    if "/" in key:
+        region, city = key.split("/", 1)
+        fixed = f"{region.title()}/{city.replace('_', ' ').title().replace(' ', '_')}"
+        try:
+            ZoneInfo(fixed)
+            return fixed
+        except ZoneInfoNotFoundError:
+            pass
+    raise ValueError(f"Invalid timezone: '{tz_input}'")
+
+def _rate(fn, rounds: int) -> float:
+    start = clock.perf_counter()
+    for i in range(rounds):
+        fn(INPUTS[i % len(INPUTS)])
+    return rounds / (clock.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    build_start = clock.perf_counter()
+    resolver = time.resolver()
+    print(f"resolver build        {(clock.perf_counter() - build_start) * 1000:10.1f} ms")
+
+    print(f"legacy normalize      {_rate(_legacy_normalize, args.rounds):10.0f} /s")
+    print(f"resolver.resolve      {_rate(resolver.resolve, args.rounds):10.0f} /s")
+    print(f"get_zone (cached)     {_rate(time.get_zone, args.rounds):10.0f} /s")
+    print(f"complete (prefix)     {_rate(lambda s: resolver.complete(s[:3]), args.rounds // 10):10.0f} /s")
+    print(f"complete (fuzzy)      {_rate(lambda s: resolver.complete(s + 'x'), args.rounds // 100):10.0f} /s")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,17 @@
 import os
-import logging
 import discord
 from dotenv import load_dotenv
+from utils import adb, cmdsync, logs, metrics, outbox, rsvpbuf, startup
 
 # Load env
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
-EXAMPLE_ROLE_ID = int(os.getenv("EXAMPLE_ROLE_ID", "0")) #you will need to name your own role or keep this one
-LOG_PATH = "logs/bot.log"
-
-# Logging
-os.makedirs("logs", exist_ok=True)
-logging.basicConfig(
-    filename=LOG_PATH,
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s"
-)
-logger = logging.getLogger("nova")
+EXAMPLE_ROLE_ID = int(os.getenv("EXAMPLE_ROLE_ID", "0")) # default R4 role for servers without /novabot_config
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))  # 0 = let Discord pick
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # 0 = metrics off
+
+# Logging (file I/O happens on a background thread, see utils/logs.py)
+logger = logs.setup(os.getenv("LOG_LEVEL", "INFO").upper())
 logger.info("🔵 Bot starting...")
 
 # Intents and bot
@@ -24,15 +19,44 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = discord.Bot(intents=intents)
+# Sharded so one process can serve many servers; every command needs a server to scope its data to
+bot = discord.AutoShardedBot(
+    intents=intents,
+    shard_count=SHARD_COUNT or None,
+    auto_sync_commands=False,  # cmdsync decides when to upload
+    default_command_contexts={discord.InteractionContextType.guild},
+)
 bot.logger = logger
 bot.example_role_id = EXAMPLE_ROLE_ID
+bot.outbox = outbox.Outbox()  # all channel sends/deletes go through here
+
+def collect_outbox_depth():
+    for priority, name in outbox.PRIORITY_NAMES.items():
+        metrics.set_gauge("nova_outbox_depth", bot.outbox.depth(priority), priority=name)
+
+if METRICS_PORT:
+    metrics.enable()
+    metrics.add_collector(collect_outbox_depth)
+
+# Startup phases run once per process, in this order (cogs add theirs when loaded)
+startup.register("database", adb.init_db, required=True)
+
+async def adopt_legacy_data():
+    # Rows from before multi-guild support belong to the one server the bot was in
+    if len(bot.guilds) == 1:
+        moved = await adb.adopt_legacy_rows(bot.guilds[0].id)
+        if moved:
+            logger.info(f"📦 Moved {moved} pre-guild events into {bot.guilds[0].name}")
+
+startup.register("guilds", adopt_legacy_data, required=True)
 
 # Load cogs
 COGS = [
     "cogs.dash",
     "cogs.rmd",
     "cogs.clean",
+    "cogs.roles",
+    "cogs.bulk",
 ]
 
 for cog in COGS:
@@ -42,11 +66,20 @@ for cog in COGS:
     except Exception as e:
         logger.error(f"❌ Failed to load cog {cog}: {e}")
 
+startup.register("commands", lambda: cmdsync.sync(bot))
+if METRICS_PORT:
+    startup.register("metrics", lambda: metrics.serve(METRICS_PORT))
+
 @bot.event
 async def on_ready():
+    # Fires again after every gateway reconnect; startup.run() only does what is left
     logger.info(f"✅ Logged in as {bot.user}")
     print(f"✅ Logged in as {bot.user}")
-    synced = await bot.sync_commands()
-    print(f"✅Synced slash commands")
+    await startup.run()
 
-bot.run(TOKEN)
+try:
+    bot.run(TOKEN)
+finally:
+    adb.shutdown()
+    rsvpbuf.drain()  # after the writer thread, so an interrupted flush cannot land last
+    logs.shutdown()
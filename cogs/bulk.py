@@ -0,0 +1,291 @@
+"""Bulk import and export of players, events and RSVPs (R4 only).
+
+Imports stream the attachment to a temporary file, then read, validate and
+write it BATCH_ROWS at a time: parsing and validation run on a worker thread
+and each batch is one transaction on adb's writer, so memory stays at one
+batch and the event loop is never held for a whole file. A bad row is
+skipped and reported with its line (CSV) or row number (JSON) instead of
+failing the import. Exports page through the table by ID into a temporary
+file, serializing and writing each page on a worker thread, and upload that.
+
+CSV files need a header row; JSON is either an array of objects or one
+object per line (what export writes). Columns are the ones export writes:
+    players   name, discord_id (empty for offline players), timezone, start, end
+    events    title, time_utc (YYYY-MM-DD HH:MM), description, repeat
+"""
+import asyncio
+import csv
+import io
+import json
+import os
+import tempfile
+import aiohttp
+import discord
+from discord.ext import commands
+from utils import adb, auth, err, recur, time
+
+BATCH_ROWS = 1000
+EXPORT_PAGE_ROWS = 1000
+CHUNK_BYTES = 64 * 1024
+MAX_JSON_ROW_BYTES = 64 * 1024
+MAX_REPORTED_ERRORS = 500
+IMPORT_FORMATS = {".csv": "csv", ".json": "json", ".jsonl": "json", ".ndjson": "json"}
+
+PLAYER_COLUMNS = ["name", "discord_id", "timezone", "start", "end"]
+EVENT_COLUMNS = ["id", "title", "time_utc", "description", "repeat"]
+RSVP_COLUMNS = ["event_id", "event_title", "event_time_utc", "name", "discord_id", "response", "reminder_minutes"]
+
+# --- Reading ---
+
+def csv_rows(fp):
+    """``(line reference, row dict)`` per CSV record; header names are case-insensitive."""
+    reader = csv.DictReader(fp)
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+    for row in reader:
+        yield f"line {reader.line_num}", row
+
+def json_rows(fp):
+    """``(row reference, object)`` per element of a JSON array or line of JSON Lines, decoded one at a time."""
+    decoder = json.JSONDecoder()
+    buffer, pos, count, eof = "", 0, 0, False
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                return
+            buffer, pos = fp.read(CHUNK_BYTES), 0
+            eof = not buffer
+            continue
+        try:
+            row, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof or len(buffer) - pos > MAX_JSON_ROW_BYTES:
+                raise ValueError(f"row {count + 1}: invalid JSON")
+            chunk = fp.read(CHUNK_BYTES)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        count += 1
+        yield f"row {count}", row
+        pos = end
+
+def field(row: dict, *names: str) -> str:
+    for name in names:
+        value = row.get(name)
+        if value is not None:
+            return str(value).strip()
+    return ""
+
+class Validator:
+    """Turns raw rows into db.import_* tuples; ValueError names the problem."""
+
+    def __init__(self):
+        self._zones = {}  # an import repeats a handful of timezones; resolve (or reject) each once
+
+    def timezone(self, raw: str) -> str:
+        if raw not in self._zones:
+            try:
+                self._zones[raw] = time.normalize_timezone(raw)
+            except ValueError as e:
+                self._zones[raw] = e
+        result = self._zones[raw]
+        if isinstance(result, ValueError):
+            raise result
+        return result
+
+    def player(self, row: dict) -> tuple:
+        name = field(row, "name", "player_name")
+        if not name:
+            raise ValueError("name is required")
+        if len(name) > 100:
+            raise ValueError("name is over 100 characters")
+        start = field(row, "start", "availability_start")
+        end = field(row, "end", "availability_end")
+        if not start or not end:
+            raise ValueError("start and end are required")
+        time.parse_time_string(start)
+        time.parse_time_string(end)
+        timezone = self.timezone(field(row, "timezone"))
+        discord_id = field(row, "discord_id")
+        if discord_id and not discord_id.isdigit():
+            raise ValueError("discord_id must be a number")
+        return int(discord_id) if discord_id else None, name, timezone, start, end
+
+    def event(self, row: dict) -> tuple:
+        title = field(row, "title")
+        if not title:
+            raise ValueError("title is required")
+        if len(title) > 100:
+            raise ValueError("title is over 100 characters")
+        try:
+            start_utc = time.parse_utc(field(row, "time_utc", "datetime_utc"))
+        except ValueError:
+            raise ValueError("time_utc must be YYYY-MM-DD HH:MM")
+        return title, start_utc, field(row, "description"), recur.parse(field(row, "repeat"), start_utc)
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors = []  # the first MAX_REPORTED_ERRORS
+        self.fatal = None
+
+    def reject(self, ref: str, problem: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"{ref}: {problem}")
+
+def next_batch(rows, validate, report: ImportReport) -> tuple[list, bool]:
+    """Validate up to BATCH_ROWS rows; returns ``(batch, finished)``. Runs on a worker thread."""
+    batch = []
+    try:
+        for ref, row in rows:
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError("not an object")
+                batch.append(validate(row))
+            except ValueError as e:
+                report.reject(ref, str(e))
+            if len(batch) >= BATCH_ROWS:
+                return batch, False
+    except (ValueError, csv.Error) as e:
+        report.fatal = str(e)  # the file itself is broken past this point
+    return batch, True
+
+async def import_file(guild_id: int, kind: str, path: str, fmt: str) -> ImportReport:
+    report = ImportReport()
+    validator = Validator()
+    validate, write = ((validator.player, adb.import_players) if kind == "players"
+                       else (validator.event, adb.import_events))
+    series = False
+    with open(path, newline="", encoding="utf-8-sig") as fp:
+        rows = csv_rows(fp) if fmt == "csv" else json_rows(fp)
+        finished = False
+        while not finished:
+            batch, finished = await asyncio.to_thread(next_batch, rows, validate, report)
+            if batch:
+                await write(guild_id, batch)
+                report.imported += len(batch)
+                series = series or (kind == "events" and any(row[3] for row in batch))
+    if series:
+        now = time.now_epoch()
+        await adb.expand_series(guild_id, now, until_utc=now + recur.HORIZON_SECONDS)
+    return report
+
+async def download(attachment: discord.Attachment, path: str):
+    async with aiohttp.ClientSession() as http:
+        async with http.get(attachment.url) as response:
+            response.raise_for_status()
+            with open(path, "wb") as fp:
+                async for chunk in response.content.iter_chunked(CHUNK_BYTES):
+                    fp.write(chunk)
+
+# --- Writing ---
+
+def player_out(row: dict) -> dict:
+    return {"name": row["player_name"], "discord_id": row["discord_id"], "timezone": row["timezone"],
+            "start": row["availability_start"], "end": row["availability_end"]}
+
+def event_out(row: dict) -> dict:
+    return {"id": row["id"], "title": row["title"], "time_utc": time.format_utc(row["datetime_utc"]),
+            "description": row["description"], "repeat": recur.describe(row)}
+
+def rsvp_out(row: dict) -> dict:
+    return {"event_id": row["event_id"], "event_title": row["title"],
+            "event_time_utc": time.format_utc(row["datetime_utc"]), "name": row["player_name"],
+            "discord_id": row["discord_id"], "response": row["response"],
+            "reminder_minutes": row["reminder_minutes"]}
+
+EXPORTS = {
+    "players": (adb.get_players_page, player_out, PLAYER_COLUMNS),
+    "events": (adb.get_events_page, event_out, EVENT_COLUMNS),
+    "rsvps": (adb.get_rsvps_page, rsvp_out, RSVP_COLUMNS),
+}
+
+def write_page(fp, writer, convert, page: list):
+    """Append one page of rows as CSV (with ``writer``) or JSON Lines. Runs on a worker thread."""
+    for row in page:
+        if writer:
+            writer.writerow(convert(row))
+        else:
+            fp.write(json.dumps(convert(row), ensure_ascii=False) + "\n")
+
+async def export_file(guild_id: int, kind: str, path: str, fmt: str) -> int:
+    """Write every ``kind`` row of the guild to ``path`` one page at a time; returns the row count."""
+    fetch, convert, columns = EXPORTS[kind]
+    count, after_id = 0, 0
+    with open(path, "w", newline="", encoding="utf-8") as fp:
+        writer = csv.DictWriter(fp, fieldnames=columns) if fmt == "csv" else None
+        if writer:
+            writer.writeheader()
+        while True:
+            page = await fetch(guild_id, after_id, EXPORT_PAGE_ROWS)
+            await asyncio.to_thread(write_page, fp, writer, convert, page)
+            count += len(page)
+            if len(page) < EXPORT_PAGE_ROWS:
+                return count
+            after_id = page[-1]["id"]
+
+class BulkCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @discord.slash_command(name="novabot_import", description="Import players or events from a CSV or JSON file.")
+    @discord.option("kind", str, choices=["players", "events"], description="What the file holds")
+    @discord.option("file", discord.Attachment, description="CSV with a header row, or JSON objects")
+    async def novabot_import(self, ctx: discord.ApplicationContext, kind: str, file: discord.Attachment):
+        if not await auth.require_r4(ctx.interaction):
+            return
+        fmt = IMPORT_FORMATS.get(os.path.splitext(file.filename)[1].lower())
+        if fmt is None:
+            await ctx.respond(err.user_error("Attach a .csv, .json or .jsonl file."), ephemeral=True)
+            return
+        await ctx.defer(ephemeral=True)
+        try:
+            started = asyncio.get_running_loop().time()
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "upload")
+                await download(file, path)
+                report = await import_file(ctx.guild_id, kind, path, fmt)
+            seconds = asyncio.get_running_loop().time() - started
+            self.bot.logger.info(f"📥 Imported {report.imported} {kind} into guild {ctx.guild_id} in {seconds:.1f}s "
+                                 f"({report.failed} rows rejected)")
+
+            text = f"📥 Imported **{report.imported}** {kind} in {seconds:.1f}s."
+            if report.failed:
+                text += f"\n⚠️ Skipped {report.failed} invalid rows (see the attached report)."
+            if report.fatal:
+                text += f"\n❌ Stopped early: {report.fatal}"
+            kwargs = {}
+            if report.errors:
+                lines = report.errors + ([f"... and {report.failed - len(report.errors)} more"]
+                                         if report.failed > len(report.errors) else [])
+                kwargs["file"] = discord.File(io.BytesIO("\n".join(lines).encode()), filename="import_errors.txt")
+            await ctx.followup.send(text, ephemeral=True, **kwargs)
+        except Exception as e:
+            err.log_error("bulk.novabot_import", e, include_trace=True)
+            await ctx.followup.send(err.user_error("❌ Import failed."), ephemeral=True)
+
+    @discord.slash_command(name="novabot_export", description="Download this server's players, events or RSVPs.")
+    @discord.option("kind", str, choices=["players", "events", "rsvps"], description="What to export")
+    @discord.option("format", str, choices=["csv", "json"], default="csv", description="JSON is one object per line")
+    async def novabot_export(self, ctx: discord.ApplicationContext, kind: str, format: str):
+        if not await auth.require_r4(ctx.interaction):
+            return
+        await ctx.defer(ephemeral=True)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                filename = f"nova_{kind}.{'csv' if format == 'csv' else 'jsonl'}"
+                path = os.path.join(tmp, filename)
+                count = await export_file(ctx.guild_id, kind, path, format)
+                if os.path.getsize(path) > ctx.guild.filesize_limit:
+                    await ctx.followup.send(err.user_error("❌ The export is too large to upload here."), ephemeral=True)
+                    return
+                await ctx.followup.send(f"📤 Exported **{count}** {kind}.", file=discord.File(path, filename=filename),
+                                        ephemeral=True)
+        except Exception as e:
+            err.log_error("bulk.novabot_export", e, include_trace=True)
+            await ctx.followup.send(err.user_error("❌ Export failed."), ephemeral=True)
+
+def setup(bot):
+    bot.add_cog(BulkCog(bot))
@@ -1,74 +1,89 @@
+import asyncio
 import discord
 from discord.ext import commands, tasks
-from datetime import datetime, timedelta
-from utils import db, err
-import os
+from datetime import timedelta
+from utils import adb, err, outbox, startup, time
 
-LOG_DIR = "logs"
-LOG_RETENTION_DAYS = 5
-REMINDER_RETENTION_MINUTES = 10
-DASHBOARD_CHANNEL_ID =   #Replace with your actual dashboard channel ID
+ARCHIVE_RETENTION_DAYS = 30  # past events stay browsable in /novabot_archive this long
+# Discord refuses to bulk-delete messages older than 14 days; stay clear of the edge
+BULK_DELETE_MAX_AGE = timedelta(days=13, hours=12)
 
 class CleanupCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self._loop_started = False
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        if not self._loop_started:
-            self.cleanup_expired_data.start()
-            self._loop_started = True
+    async def start(self):
+        self.cleanup_expired_data.start()
+
+    def cog_unload(self):
+        self.cleanup_expired_data.cancel()
 
     @tasks.loop(minutes=10)
     async def cleanup_expired_data(self):
-        try:
-            now_dt = datetime.utcnow()
-            now_str = now_dt.strftime("%Y-%m-%d %H:%M")
+        now = time.now_epoch()
+        # One guild at a time, so every query stays inside that guild's index range
+        for guild in self.bot.guilds:
+            try:
+                await self.cleanup_guild(guild.id, now)
+            except Exception as e:
+                err.log_error(f"clean.loop[{guild.id}]", e, include_trace=True)
+
+    async def cleanup_guild(self, guild_id: int, now: int):
+        # 🧹 Expired event and RSVP cleanup (after their archive period)
+        # (reminder deadlines for these events are dropped via adb's "event_deleted" topic)
+        deleted = await adb.delete_expired_events(guild_id, now - ARCHIVE_RETENTION_DAYS * 86400)
+        if deleted:
+            self.bot.logger.info(f"🧹 Cleaned {len(deleted)} expired events + their RSVPs in guild {guild_id}.")
+
+        # 🧼 Purge expired dashboards/announcements from the message registry
+        await self.purge_expired_messages(guild_id, now)
 
-            # 🧹 Expired event and RSVP cleanup
-            deleted = db.delete_expired_events(now_str)
-            if deleted > 0:
-                self.bot.logger.info(f"🧹 Cleaned {deleted} expired events + orphaned RSVPs.")
+    async def purge_expired_messages(self, guild_id: int, now: int):
+        expired = await adb.get_expired_messages(guild_id, now)
+        if not expired:
+            return
 
-            # 🧼 Clean expired dashboard messages
-            channel = self.bot.get_channel(DASHBOARD_CHANNEL_ID)
-            if channel:
-                async for msg in channel.history(limit=50):
-                    if msg.author == self.bot.user and any(keyword in msg.content for keyword in ["NoVa", "RSVP", "Your Time", "UTC:"]):
-                        try:
-                            await msg.delete()
-                            self.bot.logger.info(f"🧹 Deleted stale dashboard: {msg.id}")
-                        except Exception:
-                            pass
+        by_channel = {}
+        for row in expired:
+            by_channel.setdefault(row["channel_id"], []).append(row["message_id"])
 
-            # ⏰ Clean stale reminders (if using per-event jobs)
-            past_cutoff = now_dt - timedelta(minutes=REMINDER_RETENTION_MINUTES)
-            past_events = [
-                e for e in db.get_all_events()
-                if datetime.strptime(e["datetime_utc"], "%Y-%m-%d %H:%M") < past_cutoff
-            ]
-            if hasattr(self.bot, "scheduler"):
-                for evt in past_events:
-                    job_id = f"reminder_{evt['id']}"
-                    jobs = self.bot.scheduler.get_jobs()
-                    if any(job.id == job_id for job in jobs):
-                        self.bot.scheduler.remove_job(job_id)
-                        self.bot.logger.info(f"⏳ Cancelled stale reminder job for event {evt['id']}")
+        oldest_bulk = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+        done = []  # deleted, already gone, or in a channel we can no longer see
+        for channel_id, message_ids in by_channel.items():
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                done += message_ids  # channel gone or not visible; just forget the rows
+                continue
+            messages = [channel.get_partial_message(mid) for mid in message_ids]
+            recent = [m for m in messages if discord.utils.snowflake_time(m.id) > oldest_bulk]
+            old = [m for m in messages if discord.utils.snowflake_time(m.id) <= oldest_bulk]
+            if len(recent) > 1:
+                chunks = [recent[i:i + outbox.BULK_DELETE_LIMIT] for i in range(0, len(recent), outbox.BULK_DELETE_LIMIT)]
+                purges = self.bot.outbox.purge(channel, recent, outbox.CLEANUP)
+            else:
+                chunks, purges, old = [], [], old + recent  # bulk delete needs at least two messages
+            gone = []
+            for chunk, result in zip(chunks, await asyncio.gather(*purges, return_exceptions=True)):
+                if isinstance(result, discord.Forbidden):
+                    old += chunk  # no Manage Messages; the bot can still delete its own messages one by one
+                elif _settled(result):
+                    gone += chunk
+            deletes = await asyncio.gather(*[self.bot.outbox.delete(msg, outbox.CLEANUP) for msg in old],
+                                           return_exceptions=True)
+            gone += [msg for msg, result in zip(old, deletes) if _settled(result)]
+            done += [msg.id for msg in gone]
+            self.bot.logger.info(f"🧹 Purged {len(message_ids)} expired messages in channel {channel_id} "
+                                 f"({len(purges) + len(deletes)} calls, {len(message_ids) - len(gone)} failed)")
 
-            # 🗑️ Delete old log files
-            cutoff = datetime.utcnow() - timedelta(days=LOG_RETENTION_DAYS)
-            if os.path.isdir(LOG_DIR):
-                for fname in os.listdir(LOG_DIR):
-                    path = os.path.join(LOG_DIR, fname)
-                    if os.path.isfile(path):
-                        mtime = datetime.utcfromtimestamp(os.path.getmtime(path))
-                        if mtime < cutoff:
-                            os.remove(path)
-                            self.bot.logger.info(f"🧾 Deleted old log: {fname}")
+        # Rows whose delete failed stay registered, so the next pass retries them.
+        if done:
+            await adb.forget_messages(guild_id, done)
 
-        except Exception as e:
-            err.log_error("clean.loop", e, include_trace=True)
+def _settled(result) -> bool:
+    """Whether a delete result means the message is gone."""
+    return not isinstance(result, Exception) or isinstance(result, discord.NotFound)
 
 def setup(bot):
-    bot.add_cog(CleanupCog(bot))
+    cog = CleanupCog(bot)
+    bot.add_cog(cog)
+    startup.register("cleanup", cog.start)
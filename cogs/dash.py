@@ -1,22 +1,141 @@
+import asyncio
 import discord
 from discord.ext import commands
-from utils import db, err, auth, time
+from utils import adb, auth, avail, err, guilds, metrics, outbox, registry, rsvpbuf, startup, time
+from utils.session import Session, SessionStore
 from modals import time_mod, evt_mod, off_mod, rsvp, crev
 import logging
-from collections import defaultdict
-from datetime import datetime
+from collections import OrderedDict, defaultdict
+
+class EventCardCache:
+    """RSVP aggregates behind format_event_text, keyed by event then viewer (Discord ID).
+
+    Bounded LRU on both levels; an event's entry is dropped whenever adb
+    publishes a write touching it (RSVP, reminder, edit, delete).
+    """
+
+    def __init__(self, max_events: int = 128, max_viewers: int = 256):
+        self.max_events = max_events
+        self.max_viewers = max_viewers
+        self._events = OrderedDict()
+        self._generation = 0
+
+    async def get(self, guild_id: int, event_id: int, viewer: int) -> dict:
+        viewers = self._events.get(event_id)
+        if viewers is not None and viewer in viewers:
+            self._events.move_to_end(event_id)
+            viewers.move_to_end(viewer)
+            return viewers[viewer]
+
+        generation = self._generation
+        card = await adb.get_event_card(guild_id, event_id, viewer)
+        if generation == self._generation:  # skip if invalidated mid-query
+            viewers = self._events.setdefault(event_id, OrderedDict())
+            self._events.move_to_end(event_id)
+            viewers[viewer] = card
+            if len(viewers) > self.max_viewers:
+                viewers.popitem(last=False)
+            if len(self._events) > self.max_events:
+                self._events.popitem(last=False)
+        return card
+
+    def invalidate(self, key: tuple):
+        """adb subscriber; ``key`` is ``(guild_id, event_id)`` (event IDs are unique across guilds)."""
+        guild_id, event_id = key
+        self._generation += 1
+        self._events.pop(event_id, None)
+
+card_cache = EventCardCache()
+sessions = SessionStore()
+
+async def session_for(interaction) -> Session:
+    """The clicking user's session in this guild, created (with their timezone and role) on first use."""
+    key = (interaction.guild_id, interaction.user.id)
+    session = sessions.get(key)
+    if session is None:
+        session = sessions.put(key, Session(interaction.guild_id, interaction.user.id, None, await auth.is_r4(interaction)))
+    if session.user_tz is None:
+        session.user_tz = await adb.get_player_timezone(session.guild_id, session.viewer)
+    return session
+
+PAGE_SIZE = 5
+ARCHIVE_PAGE_SIZE = 10
+FAR_FUTURE = 2**62
+
+async def events_after(guild_id: int, after_utc: int, after_id: int, limit: int) -> list[dict]:
+    """get_events_after, with the recurring occurrences this page could show materialized first.
+
+    No series is expanded past its next ``limit + 1`` slots.
+    """
+    await adb.expand_series(guild_id, after_utc, count=limit + 1)
+    return await adb.get_events_after(guild_id, after_utc, after_id, limit)
+
+class EventPager:
+    """Keyset cursor over one guild's upcoming events, soonest first.
+
+    Only one page (PAGE_SIZE events) is held at a time; stepping off either
+    end fetches the neighbouring page by (datetime_utc, id) and wraps around
+    at the ends of the upcoming range.
+    """
+
+    def __init__(self, guild_id: int, window: list[dict]):
+        self.guild_id = guild_id
+        self.window = window
+        self.index = 0
+
+    @classmethod
+    async def upcoming(cls, guild_id: int) -> "EventPager":
+        return cls(guild_id, await events_after(guild_id, time.now_epoch(), 0, PAGE_SIZE))
+
+    @property
+    def current(self):
+        if not (0 <= self.index < len(self.window)):
+            return None
+        return self.window[self.index]
+
+    async def next(self):
+        if self.index + 1 < len(self.window):
+            self.index += 1
+            return
+        if not self.window:
+            return
+        last = self.window[-1]
+        page = await events_after(self.guild_id, last["datetime_utc"], last["id"], PAGE_SIZE)
+        if not page:
+            page = await events_after(self.guild_id, time.now_epoch(), 0, PAGE_SIZE)
+        self.window, self.index = page, 0
+
+    async def prev(self):
+        if self.index > 0:
+            self.index -= 1
+            return
+        if not self.window:
+            return
+        now = time.now_epoch()
+        first = self.window[0]
+        # A cursor opened on a later event may not have expanded the slots before it
+        await adb.expand_series(self.guild_id, now, until_utc=first["datetime_utc"])
+        page = await adb.get_events_before(self.guild_id, first["datetime_utc"], first["id"], PAGE_SIZE, now)
+        if not page:
+            page = await adb.get_events_before(self.guild_id, FAR_FUTURE, 0, PAGE_SIZE, now)
+        self.window = list(reversed(page))
+        self.index = len(self.window) - 1
+
+NO_EVENTS_TEXT = """```Welcome to the NoVa bot dashboard!\nThere are currently no events scheduled.```"""
 
 class DashboardView(discord.ui.View):
-    def __init__(self, bot: commands.Bot, events: list[dict], index: int, user_tz: str, is_example_role_id: bool, viewer: str):
+    """A /novabot dashboard. It shows one event as its owner sees it; browsing
+    goes through each clicker's own session, so other users never move it."""
+
+    def __init__(self, bot: commands.Bot, event: dict, user_tz: str, is_example_role_id: bool, viewer: int, owner_id: int):
         super().__init__(timeout=300)
         self.bot = bot
-        self.events = events
-        self.index = index if events else -1
+        self.event = event
         self.user_tz = user_tz
         self.is_example_role_id = is_example_role_id
         self.viewer = viewer
+        self.owner_id = owner_id
         self.logger = logging.getLogger("nova")
-        self.user_event_index = {}  # Track per-user current event view
 
         # Always add general buttons
         self.add_item(MyTimeButton())
@@ -30,61 +149,67 @@ class DashboardView(discord.ui.View):
             self.add_item(CreateEventButton())
 
         # Add event-related buttons if events exist
-        if self.events:
+        if self.event:
            self.add_item(PrevEventButton())
            self.add_item(NextEventButton())
            self.add_item(RSVPButton())
-        if self.is_example_role_id:
+        if self.is_example_role_id and self.event:
            self.add_item(ModifyEventButton())
            self.add_item(DeleteEventButton())
 
-
     @property
     def current_event(self):
-        if not (0 <= self.index < len(self.events)):
-            return None
-        return self.events[self.index]
+        return self.event
 
     async def on_timeout(self):
         try:
             for item in self.children:
                 item.disabled = True
             await self.message.edit(view=self)
-            await self.message.delete()
+            self.bot.outbox.delete(self.message, outbox.CLEANUP)
             self.logger.info(f"🔁 DashboardView expired for event {self.current_event['id']}")
         except Exception:
             pass
 
-    def format_event_text(self):
+    async def format_event_text(self):
         if not self.current_event:
-            return """```Welcome to the NoVa bot dashboard!\nThere are currently no events scheduled.```"""
-
-        event = self.current_event
-        utc_time = event["datetime_utc"]
-        local_time = "N/A"
-        try:
-            if self.user_tz:
-                dt = datetime.strptime(utc_time, "%Y-%m-%d %H:%M")
-                local_time = time.utc_to_local(dt, self.user_tz)
-        except Exception as e:
-            err.log_error("dash.timeconvert", e)
-
-        rsvp_count = db.count_rsvps(event["id"])
-        rsvp_status = db.get_rsvp(event["id"], self.viewer)
-        minutes = db.get_reminder_minutes(event["id"], self.viewer)
-
-        status = "❌ You have not RSVP'd."
-        if rsvp_status == "yes" and minutes:
-            hrs = round(minutes / 60, 1)
-            status = f"✅ You are RSVP'd — reminder in **{hrs} hours**."
-        elif rsvp_status == "yes":
-            status = "✅ You are RSVP'd — no reminder set."
-
-        return f"""```markdown
+            return NO_EVENTS_TEXT
+        return await format_event_card(self.current_event, self.user_tz, self.viewer)
+
+async def format_event_card(event: dict, user_tz: str, viewer: int) -> str:
+    """One event as ``viewer`` (a Discord ID) sees it: their local time and RSVP/reminder status."""
+    utc_time = time.format_utc(event["datetime_utc"])
+    local_time = "N/A"
+    try:
+        if user_tz:
+            local_time = time.utc_to_local(time.from_epoch(event["datetime_utc"]), user_tz)
+    except Exception as e:
+        err.log_error("dash.timeconvert", e)
+
+    card = await card_cache.get(event["guild_id"], event["id"], viewer)
+    rsvp_count = card["rsvp_count"]
+    rsvp_status = card["response"]
+    minutes = card["reminder_minutes"]
+    pending = rsvpbuf.lookup(event["guild_id"], event["id"], viewer)
+    if pending is not None:
+        # The viewer's own click, not flushed yet; other players' show up after the flush
+        _, response, minutes = pending
+        rsvp_count += (response == "yes") - (rsvp_status == "yes")
+        rsvp_status = response
+
+    status = "❌ You have not RSVP'd."
+    if rsvp_status == "yes" and minutes:
+        hrs = round(minutes / 60, 1)
+        status = f"✅ You are RSVP'd — reminder in **{hrs} hours**."
+    elif rsvp_status == "yes":
+        status = "✅ You are RSVP'd — no reminder set."
+    repeat_line = "🔁 Recurring event (RSVPs are per occurrence)\n" if event.get("series_id") else ""
+
+    return f"""```markdown
 📅 Event: {event['title']}
 🕒 UTC: {utc_time}
 🕒 Your Time: {local_time}
-📌 Description: {event['description']}
+{repeat_line}📌 Description: {event['description']}
 ✅ RSVPs: {rsvp_count}
 {status}
 ```"""
@@ -95,86 +220,65 @@ class PrevEventButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="◀️ Prev", style=discord.ButtonStyle.secondary)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
         view: DashboardView = self.view
-        user_id = str(interaction.user.id)
-        view.index = (view.index - 1) % len(view.events)
-        view.user_event_index[user_id] = view.index
-        await interaction.response.edit_message(content=view.format_event_text(), view=view)
+        await browse_events(interaction, view.current_event["id"], forward=False, view=view)
+
+BEST_TIME_WINDOW_MINUTES = 120
+
+async def format_best_times(guild_id: int, width: int = BEST_TIME_WINDOW_MINUTES) -> str:
+    coverage = avail.coverage_for(guild_id)
+    await coverage.ensure_loaded()
+    if not len(coverage):
+        return "❌ Not enough player data."
+
+    top = coverage.best_windows(width)
+    max_avg = max(1.0, top[0][1]) if top else 1.0
+
+    output = "🧠 **Best Event Times (UTC):**\n\n"
+    for start, avg in top:
+        end = (start + width) % avail.MINUTES_PER_DAY
+        label = f"{start // 60:02d}:{start % 60:02d}–{end // 60:02d}:{end % 60:02d}"
+        bars = "░" * int((avg / max_avg) * 15)
+        output += f"`{label}` → {bars:<15} {round(avg, 1)} players online (avg)\n"
+
+    slots = await coverage.plan(width)
+    if slots:
+        output += f"\n📅 **Best slots in the next {avail.PLAN_DAYS} days (UTC):**\n"
+        for start, avg in slots:
+            output += f"`{time.format_utc(start)}` → {round(avg, 1)} players online (avg)\n"
+    return output
+
+async def show_best_times(interaction: discord.Interaction):
+    try:
+        await interaction.response.send_message(await format_best_times(interaction.guild_id), ephemeral=True)
+
+    except Exception as e:
+        err.log_error("dash.besttime_button", e, include_trace=True)
+        await interaction.response.send_message(
+            err.user_error("❌ Failed to analyze player data."),
+            ephemeral=True
+        )
 
 class BestTimeButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="📊 View Best Times", style=discord.ButtonStyle.secondary)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
-        try:
-            availability = db.get_all_player_availability()
-            if not availability:
-                return await interaction.response.send_message(
-                    "❌ Not enough player data.", ephemeral=True
-                )
-
-            # Track unique players per hour
-            hour_bins = [set() for _ in range(24)]
-            for player in availability:
-                name = player["player_name"]
-                tz = player["timezone"]
-                start = player["availability_start"]
-                end = player["availability_end"]
-
-                try:
-                    start_utc = time.local_to_utc(start, tz)
-                    end_utc = time.local_to_utc(end, tz)
-                except Exception:
-                    continue
-
-                start_hour = start_utc.hour
-                end_hour = end_utc.hour
-
-                current = start_hour
-                while True:
-                    hour_bins[current].add(name)
-                    current = (current + 1) % 24
-                    if current == end_hour:
-                        break
-
-            # Combine into 2-hour bins using set unions
-            bin_sets = {}
-            for h in range(24):
-                h1, h2 = h, (h + 1) % 24
-                label = f"{h:02d}:00–{(h + 2) % 24:02d}:00"
-                players = hour_bins[h1] | hour_bins[h2]
-                bin_sets[label] = players
-
-            top = sorted(bin_sets.items(), key=lambda kv: len(kv[1]), reverse=True)[:6]
-            max_count = max(1, len(top[0][1])) if top else 1
-
-            output = "🧠 **Best Event Times (UTC):**\n\n"
-            for label, players in top:
-                count = len(players)
-                bars = "░" * int((count / max_count) * 15)
-                output += f"`{label}` → {bars:<15} {count} players\n"
-
-            await interaction.response.send_message(output, ephemeral=True)
-
-        except Exception as e:
-            err.log_error("dash.besttime_button", e, include_trace=True)
-            await interaction.response.send_message(
-                err.user_error("❌ Failed to analyze player data."),
-                ephemeral=True
-            )
+        await show_best_times(interaction)
 
 class DeleteOfflineDropdown(discord.ui.Select):
-    def __init__(self):
-        options = []
-        for player in db.get_all_player_availability():
-            if not player["player_name"].isdigit():
-                options.append(discord.SelectOption(label=player["player_name"]))
+    def __init__(self, players: list[dict]):
+        # A select menu holds at most 25 options
+        options = [discord.SelectOption(label=player["player_name"]) for player in players[:25]]
         if not options:
             options = [discord.SelectOption(label="No offline players", value="none", default=True)]
 
         super().__init__(placeholder="Select offline player to delete", options=options, min_values=1, max_values=1)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
         try:
             if self.values[0] == "none":
@@ -182,88 +286,90 @@ class DeleteOfflineDropdown(discord.ui.Select):
                 return
 
             player_name = self.values[0]
-            db.delete_offline_player(player_name)
+            await adb.delete_offline_player(interaction.guild_id, player_name)
             await interaction.response.send_message(f"🗑️ Deleted offline player **{player_name}**.", ephemeral=True)
         except Exception as e:
             err.log_error("dash.delete_offline_dropdown", e, include_trace=True)
             await interaction.response.send_message("❌ Could not delete player.", ephemeral=True)
 
 class DeleteOfflineView(discord.ui.View):
-    def __init__(self):
+    def __init__(self, players: list[dict]):
         super().__init__(timeout=60)
-        self.add_item(DeleteOfflineDropdown())
+        self.add_item(DeleteOfflineDropdown(players))
+
+async def show_delete_offline(interaction: discord.Interaction):
+    if not await auth.require_r4(interaction):
+        return
+    try:
+        players = await adb.get_offline_players(interaction.guild_id)
+        await interaction.response.send_message("Select a player to delete:", view=DeleteOfflineView(players), ephemeral=True)
+    except Exception as e:
+        err.log_error("dash.delete_offline_button", e)
+        await interaction.response.send_message("❌ Could not load player list.", ephemeral=True)
 
 class DeleteOfflineButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="🗑️ Delete Offline Player", style=discord.ButtonStyle.danger)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
-        if not await auth.require_example_role_id(interaction):
-            return
-        try:
-            await interaction.response.send_message("Select a player to delete:", view=DeleteOfflineView(), ephemeral=True)
-        except Exception as e:
-            err.log_error("dash.delete_offline_button", e)
-            await interaction.response.send_message("❌ Could not load player list.", ephemeral=True)
+        await show_delete_offline(interaction)
 
 class NextEventButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="▶️ Next", style=discord.ButtonStyle.secondary)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
         view: DashboardView = self.view
-        user_id = str(interaction.user.id)
-        view.index = (view.index + 1) % len(view.events)
-        view.user_event_index[user_id] = view.index
-        await interaction.response.edit_message(content=view.format_event_text(), view=view)
+        await browse_events(interaction, view.current_event["id"], forward=True, view=view)
+
+async def toggle_rsvp(interaction: discord.Interaction, event_id: int):
+    try:
+        user = interaction.user
+        pending = rsvpbuf.lookup(interaction.guild_id, event_id, user.id)
+        current = pending[1] if pending else await adb.get_rsvp(interaction.guild_id, event_id, user.id)
+
+        if current == "yes":
+            rsvpbuf.set_rsvp(interaction.guild_id, event_id, user.id, user.display_name, "no", None)
+            await interaction.response.send_message(
+                "❌ RSVP canceled. You won’t get a reminder.",
+                ephemeral=True
+            )
+        else:
+            await interaction.response.send_modal(rsvp.RSVPModal(event_id))
+
+    except Exception as e:
+        err.log_error("dash.rsvp_button", e, include_trace=True)
+        await interaction.response.send_message(
+            err.user_error("Could not process RSVP."),
+            ephemeral=True
+        )
 
 class RSVPButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="✅ RSVP", style=discord.ButtonStyle.success)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
-        try:
-            name = interaction.user.display_name
-            user_id = str(interaction.user.id)
-            view: DashboardView = self.view
-            idx = view.user_event_index.get(user_id, view.index)
-            event_id = view.events[idx]["id"]
-            current = db.get_rsvp(event_id, name)
-
-            if current == "yes":
-                db.set_rsvp(event_id, name, "no", None, str(interaction.user.id))
-                await interaction.response.send_message(
-                    "❌ RSVP canceled. You won’t get a reminder.",
-                    ephemeral=True
-                )
-            else:
-                await interaction.response.send_modal(rsvp.RSVPModal(event_id))
+        await toggle_rsvp(interaction, self.view.current_event["id"])
 
-        except Exception as e:
-            err.log_error("dash.rsvp_button", e, include_trace=True)
-            await interaction.response.send_message(
-                err.user_error("Could not process RSVP."),
-                ephemeral=True
-            )
+async def open_time_modal(interaction: discord.Interaction):
+    try:
+        await interaction.response.send_modal(time_mod.SetTimeModal())
+    except Exception as e:
+        err.log_error("dash.my_time_button", e)
+        await interaction.response.send_message(err.user_error("Could not open time modal."), ephemeral=True)
 
 class MyTimeButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="🕒 Set My Time", style=discord.ButtonStyle.primary)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
-        try:
-            await interaction.response.send_modal(time_mod.SetTimeModal())
-        except Exception as e:
-            err.log_error("dash.my_time_button", e)
-            await interaction.response.send_message(err.user_error("Could not open time modal."), ephemeral=True)
-
-class HelpButton(discord.ui.Button):
-    def __init__(self):
-        super().__init__(label="❓ Help", style=discord.ButtonStyle.secondary)
+        await open_time_modal(interaction)
 
-    async def callback(self, interaction: discord.Interaction):
-        await interaction.response.send_message(
-    """🛠 **NoVa Event Bot Help**
+HELP_TEXT = """🛠 **NoVa Event Bot Help**
 
 Use the buttons below each event:
 
@@ -271,15 +377,25 @@ Use the buttons below each event:
 
 🕒 **Set My Time** — Set your timezone and regular play window so events can be scheduled when most players are active.
 
+⌨️ **/settime** — Same as Set My Time, with timezone autocomplete.
+
 📊 **View Best Times** — Shows the best suggested UTC times based on all players' availability.
 
 ◀️ ▶️ **Prev / Next** — Navigate between upcoming events.
 
+👤 **My RSVP** — On the pinned dashboard: your local time and reminder for the event shown.
+
+🗄️ **/novabot_archive** — Browse past events.
+
+📨 **/novabot_dms** — Get a DM when a new event is created inside your play window.
+
 —
 
 **example_role_id-Only Buttons:**
 
-➕ Create Event — Add a new event using UTC time
+➕ Create Event — Add a new event using UTC time; fill in Repeat (e.g. `weekly mon,thu until 2026-12-31`) for a recurring one
+
+🔁 Recurring events — each occurrence is its own event for RSVPs and reminders; Delete removes one occurrence, and Modify → Repeat changes or ends the series from that occurrence on
 
 📝 Modify — Edit an existing event's time or description
 
@@ -288,50 +404,79 @@ Use the buttons below each event:
 👤 Set Offline Player Time — Manually set time data for players not on Discord
 
 🗑️ Delete Offline Player — Remove an offline player from the system
-""",
-    ephemeral=True
-)
+
+📌 /novabot_pin — Post and pin the shared dashboard in this channel
+
+📥 /novabot_import · 📤 /novabot_export — Bulk add players or events from CSV/JSON, or download players, events and RSVPs
+
+⚙️ /novabot_config — Set this server's R4 role and reminder channel (needs Manage Server)
+"""
+
+async def show_help(interaction: discord.Interaction):
+    await interaction.response.send_message(HELP_TEXT, ephemeral=True)
+
+class HelpButton(discord.ui.Button):
+    def __init__(self):
+        super().__init__(label="❓ Help", style=discord.ButtonStyle.secondary)
+
+    @metrics.callback
+    async def callback(self, interaction: discord.Interaction):
+        await show_help(interaction)
+
+async def open_edit_event(interaction: discord.Interaction, event_id: int):
+    if not await auth.require_r4(interaction):
+        return
+    try:
+        event = await adb.get_event_by_id(interaction.guild_id, event_id)
+        series = await adb.get_event_by_id(interaction.guild_id, event["series_id"]) if event.get("series_id") else None
+        await interaction.response.send_modal(evt_mod.EditEventModal(event, series))
+    except Exception as e:
+        err.log_error("dash.modify_event", e, include_trace=True)
+        await interaction.response.send_message(err.user_error("❌ Could not open edit modal."), ephemeral=True)
 
 class ModifyEventButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="📝 Modify", style=discord.ButtonStyle.primary)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
-        if not await auth.require_example_role_id(interaction):
-            return
-        try:
-            user_id = str(interaction.user.id)
-            view: DashboardView = self.view
-            idx = view.user_event_index.get(user_id, view.index)
-            event_id = view.events[idx]["id"]
-            await interaction.response.send_modal(evt_mod.EditEventModal(event_id))
-        except Exception as e:
-            err.log_error("dash.modify_event", e, include_trace=True)
-            await interaction.response.send_message(err.user_error("❌ Could not open edit modal."), ephemeral=True)
+        await open_edit_event(interaction, self.view.current_event["id"])
+
+async def open_create_event(interaction: discord.Interaction):
+    if not await auth.require_r4(interaction):
+        return
+    suggested = None
+    try:
+        best = await avail.coverage_for(interaction.guild_id).plan(BEST_TIME_WINDOW_MINUTES, top=1)
+        suggested = best[0][0] if best else None
+    except Exception as e:
+        err.log_error("dash.create_event_suggest", e)
+    await interaction.response.send_modal(crev.CreateEventModal(suggested))
 
 class CreateEventButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="➕ Create Event", style=discord.ButtonStyle.success)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
-        if not await auth.require_example_role_id(interaction):
-            return
-        await interaction.response.send_modal(crev.CreateEventModal())
+        await open_create_event(interaction)
 
 class DeleteEventButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="🗑️ Delete", style=discord.ButtonStyle.danger)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
-        if not await auth.require_example_role_id(interaction):
+        if not await auth.require_r4(interaction):
             return
         try:
             view: DashboardView = self.view
             event_id = view.current_event["id"]
-            db.delete_event(event_id)
+            await adb.delete_event(interaction.guild_id, event_id)
 
-            events = db.get_all_events()
-            if not events:
+            session = await session_for(interaction)
+            session.cursor = await EventPager.upcoming(interaction.guild_id)
+            if not session.cursor.current:
                 await interaction.response.edit_message(
                     content="❌ Event deleted. No more events scheduled.",
                     view=None
@@ -340,14 +485,14 @@ class DeleteEventButton(discord.ui.Button):
 
             new_view = DashboardView(
                 bot=view.bot,
-                events=events,
-                index=0,
-                user_tz=view.user_tz,
-                is_example_role_id=view.is_example_role_id,
-                viewer=view.viewer
+                event=session.cursor.current,
+                user_tz=session.user_tz,
+                is_example_role_id=session.is_admin,
+                viewer=session.viewer,
+                owner_id=interaction.user.id
             )
             await interaction.response.edit_message(
-                content=new_view.format_event_text(),
+                content=await new_view.format_event_text(),
                 view=new_view
             )
 
@@ -358,42 +503,473 @@ class DeleteEventButton(discord.ui.Button):
                 ephemeral=True
             )
 
+async def open_offline_modal(interaction: discord.Interaction):
+    if not await auth.require_r4(interaction):
+        return
+    try:
+        await interaction.response.send_modal(off_mod.OfflinePlayerModal())
+    except Exception as e:
+        err.log_error("dash.offline_player_button", e)
+        await interaction.response.send_message(err.user_error("Could not open offline modal."), ephemeral=True)
+
 class OfflinePlayerButton(discord.ui.Button):
     def __init__(self):
         super().__init__(label="👤 Set Offline Player Time", style=discord.ButtonStyle.primary)
 
+    @metrics.callback
+    async def callback(self, interaction: discord.Interaction):
+        await open_offline_modal(interaction)
+
+# --- Pinned panel ---
+
+PANEL_PREFIX = "nova"
+PANEL_REFRESH_SECONDS = 10
+
+def panel_id(action: str, event_id: int = None) -> str:
+    return f"{PANEL_PREFIX}:{action}" if event_id is None else f"{PANEL_PREFIX}:{action}:{event_id}"
+
+def parse_panel_id(custom_id: str) -> tuple:
+    """``"nova:rsvp:42"`` → ``("rsvp", 42)``; ``(None, None)`` for foreign IDs."""
+    parts = custom_id.split(":")
+    if len(parts) < 2 or parts[0] != PANEL_PREFIX:
+        return None, None
+    event_id = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else None
+    return parts[1], event_id
+
+async def panel_event(guild_id: int, event_id: int = None) -> dict:
+    """The event a guild's panel should show: ``event_id`` while it is upcoming, else the next one."""
+    now = time.now_epoch()
+    if event_id is not None:
+        event = await adb.get_event_by_id(guild_id, event_id)
+        if event and event["datetime_utc"] >= now:
+            return event
+    page = await events_after(guild_id, now, 0, 1)
+    return page[0] if page else None
+
+async def format_panel_text(event: dict) -> str:
+    if not event:
+        return "📌 **NoVa Event Dashboard**\nThere are currently no events scheduled."
+    start = event["datetime_utc"]
+    rsvp_count = await adb.count_rsvps(event["guild_id"], event["id"])
+    return (
+        "📌 **NoVa Event Dashboard**\n\n"
+        f"📅 **{event['title']}**\n"
+        f"🕒 `{time.format_utc(start)}` UTC — <t:{start}:F> (<t:{start}:R>)\n"
+        f"📌 {event['description']}\n"
+        f"✅ RSVPs: {rsvp_count}\n\n"
+        "Use ◀️ ▶️ to browse events privately and 👤 My RSVP for your own status and reminder."
+    )
+
+class PanelButton(discord.ui.Button):
+    """Stateless button: the action and event live in its custom_id."""
+
+    def __init__(self, label: str, style: discord.ButtonStyle, action: str, event_id: int = None, row: int = None):
+        super().__init__(label=label, style=style, custom_id=panel_id(action, event_id), row=row)
+
+    async def callback(self, interaction: discord.Interaction):
+        await handle_panel_click(interaction, *parse_panel_id(self.custom_id))
+
+class DashboardPanel(discord.ui.View):
+    """The guild-wide dashboard behind one pinned message.
+
+    Nothing per user or per message is kept: every click is resolved from
+    the custom_id and the clicking user. ``DashboardPanel()`` (no event)
+    holds the event-independent buttons and is registered once with
+    ``bot.add_view``; the event buttons carry the event ID, so their IDs
+    vary and the cog's on_interaction listener routes them instead.
+    """
+
+    def __init__(self, event: dict = None):
+        super().__init__(timeout=None)
+        event_id = event["id"] if event else None
+        if event_id is not None:
+            self.add_item(PanelButton("◀️ Prev", discord.ButtonStyle.secondary, "prev", event_id, row=0))
+            self.add_item(PanelButton("▶️ Next", discord.ButtonStyle.secondary, "next", event_id, row=0))
+            self.add_item(PanelButton("✅ RSVP", discord.ButtonStyle.success, "rsvp", event_id, row=0))
+            self.add_item(PanelButton("👤 My RSVP", discord.ButtonStyle.secondary, "status", event_id, row=0))
+        self.add_item(PanelButton("🕒 Set My Time", discord.ButtonStyle.primary, "mytime", row=1))
+        self.add_item(PanelButton("📊 View Best Times", discord.ButtonStyle.secondary, "besttimes", row=1))
+        self.add_item(PanelButton("❓ Help", discord.ButtonStyle.secondary, "help", row=1))
+        self.add_item(PanelButton("➕ Create Event", discord.ButtonStyle.success, "create", row=2))
+        if event_id is not None:
+            self.add_item(PanelButton("📝 Modify", discord.ButtonStyle.primary, "edit", event_id, row=2))
+            self.add_item(PanelButton("🗑️ Delete", discord.ButtonStyle.danger, "delete", event_id, row=2))
+        self.add_item(PanelButton("👤 Set Offline Player Time", discord.ButtonStyle.primary, "offline", row=3))
+        self.add_item(PanelButton("🗑️ Delete Offline Player", discord.ButtonStyle.danger, "deloffline", row=3))
+
+# Pinned panel message ID → (guild ID, channel ID, shown event ID or None)
+panels = {}
+
+async def show_panel_event(message, event: dict):
+    """Point a panel message at ``event`` (None: no events scheduled)."""
+    view = DashboardPanel(event)
+    await message.edit(content=await format_panel_text(event), view=view)
+    # py-cord stores views passed to edit; this one must not shadow the registered panel
+    view.stop()
+    panels[message.id] = (message.channel.guild.id, message.channel.id, event["id"] if event else None)
+
+async def browse_events(interaction: discord.Interaction, event_id: int, forward: bool, view: DashboardView = None):
+    """Prev/Next: step the clicking user's own cursor, starting from the event they clicked on.
+
+    The owner of a /novabot dashboard (``view``) pages it in place; anyone
+    else, and every click on the pinned panel, gets a private ephemeral card.
+    """
+    session = await session_for(interaction)
+    cursor = session.cursor
+    if cursor is None or not cursor.current or cursor.current["id"] != event_id:
+        event = await adb.get_event_by_id(session.guild_id, event_id)
+        cursor = session.cursor = (EventPager(session.guild_id, [event]) if event
+                                   else await EventPager.upcoming(session.guild_id))
+        if not event:
+            forward = None  # the clicked event is gone; show the first upcoming one instead
+    if forward is not None:
+        await (cursor.next() if forward else cursor.prev())
+    event = cursor.current
+
+    if view is not None and view.owner_id == interaction.user.id:
+        view.event = event
+        await interaction.response.edit_message(content=await view.format_event_text(), view=view)
+        return
+
+    content = await format_event_card(event, session.user_tz, session.viewer) if event else NO_EVENTS_TEXT
+    personal = DashboardPanel(event)
+    if interaction.message is not None and interaction.message.flags.ephemeral:
+        await interaction.response.edit_message(content=content, view=personal)
+    else:
+        await interaction.response.send_message(content, view=personal, ephemeral=True)
+    personal.stop()
+
+async def show_my_rsvp(interaction: discord.Interaction, event_id: int):
+    event = await adb.get_event_by_id(interaction.guild_id, event_id)
+    if not event:
+        await interaction.response.send_message(err.user_error("That event no longer exists."), ephemeral=True)
+        return
+    viewer = interaction.user.id
+    user_tz = await adb.get_player_timezone(interaction.guild_id, viewer)
+    await interaction.response.send_message(await format_event_card(event, user_tz, viewer), ephemeral=True)
+
+async def delete_panel_event(interaction: discord.Interaction, event_id: int):
+    if not await auth.require_r4(interaction):
+        return
+    await adb.delete_event(interaction.guild_id, event_id)
+    if interaction.message is not None and interaction.message.id in panels:
+        await interaction.response.send_message("🗑️ Event deleted.", ephemeral=True)
+        await show_panel_event(interaction.message, await panel_event(interaction.guild_id))
+    else:
+        # A personal (ephemeral) card can only be edited through the interaction;
+        # pinned panels showing the event refresh via the "event_deleted" topic.
+        await interaction.response.edit_message(content="🗑️ Event deleted.", view=None)
+
+PANEL_ACTIONS = {
+    "prev": lambda i, e: browse_events(i, e, forward=False),
+    "next": lambda i, e: browse_events(i, e, forward=True),
+    "rsvp": toggle_rsvp,
+    "status": show_my_rsvp,
+    "edit": open_edit_event,
+    "delete": delete_panel_event,
+    "mytime": lambda i, e: open_time_modal(i),
+    "besttimes": lambda i, e: show_best_times(i),
+    "help": lambda i, e: show_help(i),
+    "create": lambda i, e: open_create_event(i),
+    "offline": lambda i, e: open_offline_modal(i),
+    "deloffline": lambda i, e: show_delete_offline(i),
+}
+
+@metrics.timed("nova_interaction_seconds", "callback", "DashboardPanel")
+async def handle_panel_click(interaction: discord.Interaction, action: str, event_id: int = None):
+    handler = PANEL_ACTIONS.get(action)
+    if handler is None:
+        return
+    try:
+        await handler(interaction, event_id)
+    except Exception as e:
+        err.log_error(f"dash.panel.{action}", e, include_trace=True)
+        if not interaction.response.is_done():
+            await interaction.response.send_message(err.user_error("Something went wrong."), ephemeral=True)
+
+# --- Archive ---
+
+class ArchiveView(discord.ui.View):
+    """Past events, newest first, one keyset page at a time."""
+
+    def __init__(self, guild_id: int, page: list[dict]):
+        super().__init__(timeout=120)
+        self.guild_id = guild_id
+        self.page = page
+        self.add_item(OlderEventsButton(disabled=len(page) < ARCHIVE_PAGE_SIZE))
+
+    @classmethod
+    async def before(cls, guild_id: int, before_utc: int, before_id: int) -> "ArchiveView":
+        return cls(guild_id, await adb.get_events_before(guild_id, before_utc, before_id, ARCHIVE_PAGE_SIZE))
+
+    def format_text(self) -> str:
+        if not self.page:
+            return "🗄️ No past events in the archive."
+        lines = [f"`{time.format_utc(e['datetime_utc'])}` — **{e['title']}**" for e in self.page]
+        return "🗄️ **Past Events (UTC):**\n" + "\n".join(lines)
+
+class OlderEventsButton(discord.ui.Button):
+    def __init__(self, disabled: bool = False):
+        super().__init__(label="⏪ Older", style=discord.ButtonStyle.secondary, disabled=disabled)
+
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
-        if not await auth.require_example_role_id(interaction):
-            return
         try:
-            await interaction.response.send_modal(off_mod.OfflinePlayerModal())
+            view: ArchiveView = self.view
+            oldest = view.page[-1]
+            new_view = await ArchiveView.before(view.guild_id, oldest["datetime_utc"], oldest["id"])
+            await interaction.response.edit_message(content=new_view.format_text(), view=new_view)
         except Exception as e:
-            err.log_error("dash.offline_player_button", e)
-            await interaction.response.send_message(err.user_error("Could not open offline modal."), ephemeral=True)
+            err.log_error("dash.archive_older", e, include_trace=True)
+            await interaction.response.send_message(err.user_error("Could not load older events."), ephemeral=True)
 
 # --- Cog ---
 
+async def timezone_autocomplete(ctx: discord.AutocompleteContext) -> list[str]:
+    return time.resolver().complete(ctx.value or "")
+
 class Dashboard(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._refreshing = set()
+        self._refresh_tasks = set()  # the event loop only keeps weak references to tasks
+        time.resolver()  # build the timezone index now, not on the first autocomplete
+        adb.subscribe(card_cache.invalidate)
+        adb.subscribe(card_cache.invalidate, topic="event_deleted")
+        adb.subscribe(avail.on_player_changed, topic="player")
+        adb.subscribe(self._on_event_changed)
+        adb.subscribe(self._on_event_changed, topic="event_deleted")
+        adb.subscribe(self._on_player_changed, topic="player")
+        adb.subscribe(self._on_bulk_change, topic="bulk")
+
+    def cog_unload(self):
+        adb.unsubscribe(card_cache.invalidate)
+        adb.unsubscribe(card_cache.invalidate, topic="event_deleted")
+        adb.unsubscribe(avail.on_player_changed, topic="player")
+        adb.unsubscribe(self._on_event_changed)
+        adb.unsubscribe(self._on_event_changed, topic="event_deleted")
+        adb.unsubscribe(self._on_player_changed, topic="player")
+        adb.unsubscribe(self._on_bulk_change, topic="bulk")
+
+    def _on_player_changed(self, change: tuple):
+        # Sessions cache the viewer's timezone; refetch it on their next click
+        guild_id, _, discord_id = change[:3]
+        if discord_id is None:
+            return  # offline players have no sessions
+        for session in sessions.values():
+            if session.guild_id == guild_id and session.viewer == discord_id:
+                session.user_tz = None
+
+    def _on_bulk_change(self, key: tuple):
+        guild_id, kind = key
+        if kind == "players":
+            avail.forget(guild_id)
+            for session in sessions.values():
+                if session.guild_id == guild_id:
+                    session.user_tz = None
+        else:
+            # Imported events may come before what a panel shows; refresh every panel in the guild
+            for message_id, (panel_guild, _, _) in list(panels.items()):
+                if panel_guild == guild_id:
+                    self._refresh_soon(message_id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        avail.forget(guild.id)
+        guilds.forget(guild.id)
+        for message_id, (guild_id, _, _) in list(panels.items()):
+            if guild_id == guild.id:
+                panels.pop(message_id, None)
+
+    # --- Pinned panel ---
+
+    async def load_panels(self):
+        """Register the persistent panel view and re-render every pinned panel."""
+        self.bot.add_view(DashboardPanel())
+        for guild in self.bot.guilds:
+            for row in await adb.get_messages_by_kind(guild.id, registry.PANEL):
+                panels[row["message_id"]] = (guild.id, row["channel_id"], None)
+                await self.refresh_panel(row["message_id"])
+        if panels:
+            self.bot.logger.info(f"📌 Restored {len(panels)} pinned dashboard(s)")
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction):
+        # Event buttons have per-event custom_ids that no registered view knows;
+        # anything a view already claimed has interaction.view set.
+        if interaction.type != discord.InteractionType.component or interaction.view is not None:
+            return
+        action, event_id = parse_panel_id(interaction.data.get("custom_id", ""))
+        if action is not None:
+            await handle_panel_click(interaction, action, event_id)
+
+    def _on_event_changed(self, key: tuple):
+        guild_id, event_id = key
+        for message_id, (panel_guild, _, shown) in list(panels.items()):
+            if panel_guild != guild_id or message_id in self._refreshing:
+                continue
+            if shown is None or shown == event_id:
+                self._refresh_soon(message_id)
+
+    def _refresh_soon(self, message_id: int):
+        if message_id in self._refreshing:
+            return
+        self._refreshing.add(message_id)
+        task = asyncio.create_task(self._refresh_later(message_id))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh_later(self, message_id: int):
+        # Coalesce a burst of RSVPs into one edit per panel
+        await asyncio.sleep(PANEL_REFRESH_SECONDS)
+        self._refreshing.discard(message_id)
+        await self.refresh_panel(message_id)
+
+    async def refresh_panel(self, message_id: int):
+        if message_id not in panels:
+            return
+        guild_id, channel_id, shown = panels[message_id]
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            await self.forget_panel(message_id)
+            return
+        try:
+            await show_panel_event(channel.get_partial_message(message_id), await panel_event(guild_id, shown))
+        except discord.NotFound:
+            await self.forget_panel(message_id)
+        except Exception as e:
+            err.log_error("dash.refresh_panel", e)
+
+    async def forget_panel(self, message_id: int):
+        entry = panels.pop(message_id, None)
+        if entry is not None:
+            await adb.forget_messages(entry[0], [message_id])
 
     @discord.slash_command(name="novabot", description="Launch event dashboard.")
     async def novabot(self, ctx: discord.ApplicationContext):
         try:
-            events = db.get_all_events()
-            user_tz = db.get_player_timezone(ctx.user.display_name)
-            is_example_role_id = await auth.is_example_role_id(ctx)
-
-            index = 0 if events else -1  # ← use this properly
-            view = DashboardView(self.bot, events, index, user_tz, is_example_role_id, ctx.user.display_name)
-            view.user_event_index[str(ctx.user.id)] = index
-            message = await ctx.respond(view.format_event_text(), view=view)
+            session = await session_for(ctx)
+            session.cursor = await EventPager.upcoming(ctx.guild_id)
+            view = DashboardView(self.bot, session.cursor.current, session.user_tz, session.is_admin, session.viewer, ctx.user.id)
+            message = await ctx.respond(await view.format_event_text(), view=view)
             view.message = await message.original_response()
+            await registry.track(view.message, registry.DASHBOARD, time.now_epoch() + registry.DASHBOARD_TTL_SECONDS)
 
         except Exception as e:
             err.log_error("dash.novabot", e, include_trace=True)
             await ctx.respond(err.user_error("Failed to load dashboard."), ephemeral=True)
 
+    @discord.slash_command(name="novabot_pin", description="Post and pin the shared event dashboard in this channel.")
+    async def novabot_pin(self, ctx: discord.ApplicationContext):
+        if not await auth.require_r4(ctx.interaction):
+            return
+        # The outbox send can outlast the 3-second interaction deadline
+        await ctx.defer(ephemeral=True)
+        try:
+            # One panel per guild: the new one replaces any earlier one
+            for message_id, (guild_id, channel_id, _) in list(panels.items()):
+                if guild_id == ctx.guild_id:
+                    channel = self.bot.get_channel(channel_id)
+                    if channel is not None:
+                        self.bot.outbox.delete(channel.get_partial_message(message_id), outbox.CLEANUP)
+                    await self.forget_panel(message_id)
+
+            event = await panel_event(ctx.guild_id)
+            view = DashboardPanel(event)
+            message = await self.bot.outbox.send(ctx.channel, await format_panel_text(event), outbox.ANNOUNCEMENT, view=view)
+            view.stop()
+            panels[message.id] = (ctx.guild_id, message.channel.id, event["id"] if event else None)
+            await registry.track(message, registry.PANEL, registry.NEVER)
+            try:
+                await message.pin()
+            except discord.Forbidden:
+                self.bot.logger.warning(f"[Dashboard] No permission to pin in channel {message.channel.id}")
+            await ctx.followup.send("📌 Dashboard posted.", ephemeral=True)
+        except Exception as e:
+            err.log_error("dash.novabot_pin", e, include_trace=True)
+            await ctx.followup.send(err.user_error("Could not post the dashboard."), ephemeral=True)
+
+    @discord.slash_command(name="settime", description="Set your timezone and regular play window.")
+    @discord.option("timezone", str, description="e.g. central, CET, America/Chicago", autocomplete=timezone_autocomplete)
+    @discord.option("start", str, description="Start of your play window (e.g. 17:00 or 5pm)")
+    @discord.option("end", str, description="End of your play window (e.g. 22:00 or 10pm)")
+    async def settime(self, ctx: discord.ApplicationContext, timezone: str, start: str, end: str):
+        try:
+            norm_tz = time.normalize_timezone(timezone)
+            time.parse_time_string(start)
+            time.parse_time_string(end)
+
+            await adb.set_player_time(ctx.guild_id, ctx.user.id, ctx.user.display_name, norm_tz,
+                                      start.strip(), end.strip())
+            await ctx.respond(f"✅ Saved: **{norm_tz}**, {start.strip()}–{end.strip()}.", ephemeral=True)
+        except ValueError as e:
+            await ctx.respond(err.user_error(str(e)), ephemeral=True)
+        except Exception as e:
+            err.log_error("dash.settime", e, include_trace=True)
+            await ctx.respond(err.user_error("❌ Could not save your time."), ephemeral=True)
+
+    @discord.slash_command(name="novabot_dms", description="Get a DM when a new event falls in your play window.")
+    @discord.option("enabled", bool, description="Leave empty to see your current setting", required=False)
+    async def novabot_dms(self, ctx: discord.ApplicationContext, enabled: bool = None):
+        try:
+            if enabled is not None:
+                await adb.set_notify_dm(ctx.guild_id, ctx.user.id, ctx.user.display_name, enabled)
+            else:
+                enabled = await adb.get_notify_dm(ctx.guild_id, ctx.user.id)
+            if not enabled:
+                await ctx.respond("🔕 New-event DMs are **off**.", ephemeral=True)
+                return
+            note = "" if await adb.get_player_timezone(ctx.guild_id, ctx.user.id) else \
+                "\n⚠️ Set your play window with `/settime` first; DMs only go to players available at the event's start."
+            await ctx.respond(f"🔔 New-event DMs are **on**.{note}", ephemeral=True)
+        except Exception as e:
+            err.log_error("dash.novabot_dms", e, include_trace=True)
+            await ctx.respond(err.user_error("❌ Could not update your DM setting."), ephemeral=True)
+
+    @discord.slash_command(name="novabot_besttimes", description="Best UTC start times for an event of a given length.")
+    @discord.option("hours", float, description="Event length in hours", min_value=0.25, max_value=12, default=2)
+    async def novabot_besttimes(self, ctx: discord.ApplicationContext, hours: float):
+        try:
+            await ctx.respond(await format_best_times(ctx.guild_id, int(hours * 60)), ephemeral=True)
+        except Exception as e:
+            err.log_error("dash.novabot_besttimes", e, include_trace=True)
+            await ctx.respond(err.user_error("❌ Failed to analyze player data."), ephemeral=True)
+
+    @discord.slash_command(name="novabot_archive", description="Browse past events.")
+    async def novabot_archive(self, ctx: discord.ApplicationContext):
+        try:
+            view = await ArchiveView.before(ctx.guild_id, time.now_epoch(), 0)
+            await ctx.respond(view.format_text(), view=view, ephemeral=True)
+        except Exception as e:
+            err.log_error("dash.novabot_archive", e, include_trace=True)
+            await ctx.respond(err.user_error("Failed to load the archive."), ephemeral=True)
+
+    @discord.slash_command(name="novabot_config", description="Set this server's R4 role and reminder channel.")
+    @discord.default_permissions(manage_guild=True)
+    @discord.option("r4_role", discord.Role, description="Role allowed to manage events", required=False)
+    @discord.option("reminder_channel", discord.TextChannel, description="Channel for reminders and announcements", required=False)
+    async def novabot_config(self, ctx: discord.ApplicationContext, r4_role: discord.Role = None,
+                             reminder_channel: discord.TextChannel = None):
+        try:
+            if r4_role or reminder_channel:
+                await guilds.update(ctx.guild_id, r4_role.id if r4_role else None,
+                                    reminder_channel.id if reminder_channel else None)
+            if r4_role:
+                await auth.index_guild(ctx.guild)
+            settings = await guilds.config(ctx.guild_id)
+            role = ctx.guild.get_role(settings["admin_role_id"])
+            channel = await guilds.reminder_channel(self.bot, ctx.guild_id)
+            await ctx.respond(
+                "⚙️ **NoVa settings for this server**\n"
+                f"R4 role: {role.mention if role else 'not set'}\n"
+                f"Reminder channel: {channel.mention if channel else 'not set'}",
+                ephemeral=True
+            )
+        except Exception as e:
+            err.log_error("dash.novabot_config", e, include_trace=True)
+            await ctx.respond(err.user_error("Could not update the settings."), ephemeral=True)
 
 def setup(bot):
-    bot.add_cog(Dashboard(bot))
+    cog = Dashboard(bot)
+    bot.add_cog(cog)
+    startup.register("dashboard", cog.load_panels)
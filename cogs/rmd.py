@@ -1,80 +1,207 @@
-from datetime import datetime
+import asyncio
 import discord
-from discord.ext import commands
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-from utils import db, err, time
-import os
+from discord.ext import commands, tasks
+from utils import adb, err, guilds, outbox, recur, startup, time
+from utils.deadline import DeadlineQueue
 import logging
 
-scheduler = AsyncIOScheduler()
+# Minutes before start → channel message for the group reminders
+GROUP_REMINDERS = {
+    60: "🕐 1 hour until **{title}**.",
+    30: "@everyone ⚔️ **{title}** starts in 30 minutes!",
+    15: "🧊 15 minutes until **{title}**. Prep up.",
+    0: "@everyone 🚨 **{title}** starts NOW!",
+}
+# On startup, still deliver reminders that came due this recently while offline
+STARTUP_GRACE_SECONDS = 3 * 60
+# An import publishes once per batch; wait this long so a whole import reloads the guild once
+BULK_RELOAD_SECONDS = 5
+FAR_FUTURE = 2**62
+MESSAGE_LIMIT = 2000
+
+def chunk_mentions(prefix: str, mentions: list[str], suffix: str, limit: int = MESSAGE_LIMIT) -> list[str]:
+    """Pack mentions into as few ``"<prefix><m1>, <m2> <suffix>"`` messages as fit under ``limit``."""
+    budget = limit - len(prefix) - len(suffix) - 1
+    messages, current = [], ""
+    for mention in mentions:
+        candidate = f"{current}, {mention}" if current else mention
+        if current and len(candidate) > budget:
+            messages.append(f"{prefix}{current} {suffix}")
+            candidate = mention
+        current = candidate
+    if current:
+        messages.append(f"{prefix}{current} {suffix}")
+    return messages
 
 class ReminderCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger("nova")
+        self.queue = DeadlineQueue()
+        self._refreshes = set()  # the event loop only keeps weak references to tasks
+        self._reloading = set()  # guild IDs with a bulk reload scheduled
 
-    def start(self):
-        self.bot.scheduler = scheduler  # Expose for cleanup
-        scheduler.add_job(self.run_reminders, IntervalTrigger(seconds=120))
-        scheduler.start()
+    async def start(self):
+        """Load every guild's upcoming reminders once, then keep the queue current from DB writes."""
+        events = 0
+        for guild in self.bot.guilds:
+            events += await self.load_guild(guild.id)
 
-    async def run_reminders(self):
-        now = datetime.utcnow()
-        self.logger.debug(f"[ReminderTick] Scheduler ran at {now.isoformat()}")
+        adb.subscribe(self._on_event_changed)
+        adb.subscribe(self._on_event_deleted, topic="event_deleted")
+        adb.subscribe(self._on_bulk_change, topic="bulk")
+        self.queue.start()
+        self.expand_recurring.start()
+        self.logger.info(f"⏰ Reminder queue loaded: {len(self.queue)} deadlines for {events} events "
+                         f"in {len(self.bot.guilds)} guilds")
 
-        try:
-            events = db.get_all_events()
-            for event in events:
-                event_id = event["id"]
-                title = event["title"]
-                utc_dt = datetime.strptime(event["datetime_utc"], "%Y-%m-%d %H:%M")
-                mins_until = int((utc_dt - now).total_seconds() / 60)
-
-                self.logger.debug(f"[Reminder] Checking event {event_id} → {title} (starts in {mins_until} mins)")
-
-                channel_id = int(os.getenv("REMINDER_CHANNEL_ID", 0))
-                channel = self.bot.get_channel(channel_id)
-                if not channel:
-                    self.logger.warning(f"[Reminder] Channel ID {channel_id} not found.")
-                    continue
-
-                # --- Static group reminders ---
-                if 59 <= mins_until <= 61:
-                    await channel.send(f"🕐 1 hour until **{title}**.")
-                elif 29 <= mins_until <=31:
-                    await channel.send(f"@everyone ⚔️ **{title}** starts in 30 minutes!")
-                elif 14 <= mins_until <= 16:
-                    await channel.send(f"🧊 15 minutes until **{title}**. Prep up.")
-                elif 1 <= mins_until <= 3:
-                    await channel.send(f"@everyone 🚨 **{title}** starts NOW!")
-
-                # --- Personal RSVP reminders ---
-                rsvps = db.get_reminders_due(event_id)
-                for rsvp in rsvps:
-                    reminder_minutes = rsvp["reminder_minutes"]
-                    discord_id = rsvp.get("discord_id")
-                    player_name = rsvp["player_name"]
-
-                    self.logger.debug(f"[ReminderCheck] {player_name} → reminder: {reminder_minutes} | now: {mins_until}")
-
-                    if abs(reminder_minutes - mins_until) <= 1:
-                        if discord_id:
-                            mention = f"<@{discord_id}>"
-                        else:
-                            mention = player_name
-
-                        hours = round(reminder_minutes / 60, 1)
-                        await channel.send(f"⏰ {mention} — *the* event starts in {hours} hours!")
-                        db.clear_reminder(event_id, player_name)
-                        self.logger.info(f"[ReminderSent] Sent to {player_name} for event {event_id} ({title})")
+    async def load_guild(self, guild_id: int) -> int:
+        """Schedule one guild's upcoming reminders; returns how many events it has."""
+        now = time.now_epoch()
+        await adb.expand_series(guild_id, now - STARTUP_GRACE_SECONDS, until_utc=now + recur.HORIZON_SECONDS)
+        events = await adb.get_events_between(guild_id, now - STARTUP_GRACE_SECONDS, FAR_FUTURE)
+        reminders = await adb.get_pending_reminders(guild_id, now - STARTUP_GRACE_SECONDS)
+        by_event = {}
+        for rsvp in reminders:
+            by_event.setdefault(rsvp["event_id"], []).append(rsvp)
+        for event in events:
+            self.schedule_event(event, by_event.get(event["id"], []), not_before=now - STARTUP_GRACE_SECONDS)
+        return len(events)
 
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        try:
+            await self.load_guild(guild.id)
         except Exception as e:
-            err.log_error("rmd.run_reminders", e, include_trace=True)
+            err.log_error("rmd.on_guild_join", e, include_trace=True)
 
     @commands.Cog.listener()
-    async def on_ready(self):
-        self.start()
+    async def on_guild_remove(self, guild: discord.Guild):
+        try:
+            for event in await adb.get_events_between(guild.id, 0, FAR_FUTURE):
+                self.queue.cancel_group(event["id"])
+        except Exception as e:
+            err.log_error("rmd.on_guild_remove", e, include_trace=True)
+
+    def cog_unload(self):
+        adb.unsubscribe(self._on_event_changed)
+        adb.unsubscribe(self._on_event_deleted, topic="event_deleted")
+        adb.unsubscribe(self._on_bulk_change, topic="bulk")
+        self.queue.stop()
+        self.expand_recurring.cancel()
+
+    @tasks.loop(minutes=30)
+    async def expand_recurring(self):
+        """Keep recurring events' next HORIZON_SECONDS of occurrences in the table.
+
+        New occurrences are published like any created event, so refresh_event
+        schedules their reminders; nothing past the horizon is materialized.
+        """
+        now = time.now_epoch()
+        for guild in self.bot.guilds:
+            try:
+                created = await adb.expand_series(guild.id, now, until_utc=now + recur.HORIZON_SECONDS)
+                if created:
+                    self.logger.info(f"🔁 Added {len(created)} recurring event occurrences in guild {guild.id}")
+            except Exception as e:
+                err.log_error(f"rmd.expand[{guild.id}]", e, include_trace=True)
+
+    def _on_event_changed(self, key: tuple):
+        self._spawn(self.refresh_event(*key))
+
+    def _on_bulk_change(self, key: tuple):
+        guild_id, kind = key
+        if kind == "events" and guild_id not in self._reloading:
+            self._reloading.add(guild_id)
+            self._spawn(self._reload_later(guild_id))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _reload_later(self, guild_id: int):
+        await asyncio.sleep(BULK_RELOAD_SECONDS)
+        self._reloading.discard(guild_id)
+        try:
+            events = await self.load_guild(guild_id)
+            self.logger.info(f"⏰ Reloaded reminders for {events} events in guild {guild_id} after an import")
+        except Exception as e:
+            err.log_error("rmd.reload_guild", e, include_trace=True)
+
+    def _on_event_deleted(self, key: tuple):
+        guild_id, event_id = key
+        dropped = self.queue.cancel_group(event_id)
+        if dropped:
+            self.logger.info(f"⏳ Dropped {dropped} reminder deadlines for deleted event {event_id}")
+
+    async def refresh_event(self, guild_id: int, event_id: int):
+        """Recompute one event's deadlines after it or one of its RSVPs changed."""
+        try:
+            event = await adb.get_event_by_id(guild_id, event_id)
+            if not event or event["repeat_rule"]:
+                self.queue.cancel_group(event_id)  # a series only reminds through its occurrences
+                return
+            rsvps = await adb.get_reminders_due(guild_id, event_id)
+            self.schedule_event(event, [dict(r, event_id=event_id) for r in rsvps])
+        except Exception as e:
+            err.log_error("rmd.refresh_event", e, include_trace=True)
+
+    def schedule_event(self, event: dict, rsvps: list[dict], not_before: int = None):
+        event_id = event["id"]
+        start = event["datetime_utc"]
+        if not_before is None:
+            not_before = time.now_epoch() + 1
+        self.queue.cancel_group(event_id)
+
+        for minutes, template in GROUP_REMINDERS.items():
+            fire_at = start - minutes * 60
+            if fire_at >= not_before:
+                self.queue.schedule(
+                    (event_id, "group", minutes), fire_at,
+                    lambda e=event, t=template: self.send_group_reminder(e, t),
+                    group=event_id
+                )
+
+        # One deadline per distinct reminder time, shared by everyone who picked it
+        windows = {}
+        for rsvp in rsvps:
+            windows.setdefault(rsvp["reminder_minutes"], []).append(rsvp)
+        for minutes, batch in windows.items():
+            fire_at = start - minutes * 60
+            if fire_at >= not_before:
+                self.queue.schedule(
+                    (event_id, "personal", minutes), fire_at,
+                    lambda e=event, m=minutes, b=batch: self.send_personal_reminders(e, m, b),
+                    group=event_id
+                )
+
+    async def _channel(self, guild_id: int):
+        channel = await guilds.reminder_channel(self.bot, guild_id)
+        if not channel:
+            self.logger.warning(f"[Reminder] No reminder channel found for guild {guild_id}.")
+        return channel
+
+    async def send_group_reminder(self, event: dict, template: str):
+        channel = await self._channel(event["guild_id"])
+        if channel:
+            await self.bot.outbox.send(channel, template.format(title=event["title"]), outbox.REMINDER)
+            self.logger.info(f"[ReminderSent] Group reminder for event {event['id']} ({event['title']})")
+
+    async def send_personal_reminders(self, event: dict, minutes: int, rsvps: list[dict]):
+        """Deliver every personal reminder for one event/fire time in as few messages as possible."""
+        channel = await self._channel(event["guild_id"])
+        if not channel:
+            return
+        mentions = [f"<@{r['discord_id']}>" if r.get("discord_id") else r["player_name"] for r in rsvps]
+        hours = round(minutes / 60, 1)
+        messages = chunk_mentions("⏰ ", mentions, f"— **{event['title']}** starts in {hours} hours!")
+        await asyncio.gather(*(self.bot.outbox.send(channel, content, outbox.REMINDER) for content in messages))
+
+        await adb.clear_reminders(event["guild_id"], event["id"], [r["player_id"] for r in rsvps])
+        self.logger.info(f"[ReminderSent] {len(rsvps)} personal reminders in {len(messages)} messages for event {event['id']} ({event['title']})")
 
 def setup(bot):
-    bot.add_cog(ReminderCog(bot))
+    cog = ReminderCog(bot)
+    bot.add_cog(cog)
+    startup.register("reminders", cog.start)
@@ -0,0 +1,49 @@
+import discord
+from discord.ext import commands
+from utils import auth, err, startup
+
+class RoleIndexCog(commands.Cog):
+    """Keeps auth's R4 holder index in step with the gateway."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def start(self):
+        holders = 0
+        for guild in self.bot.guilds:
+            holders += await auth.index_guild(guild)
+        self.bot.logger.info(f"🛡️ R4 index built: {holders} holders in {len(self.bot.guilds)} guilds")
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            auth.member_changed(after)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        auth.member_changed(member)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        # Raw so members missing from the cache are dropped too
+        auth.member_left(payload.guild_id, payload.user.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        auth.role_deleted(role)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        try:
+            await auth.index_guild(guild)
+        except Exception as e:
+            err.log_error("roles.on_guild_join", e, include_trace=True)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        auth.forget_guild(guild.id)
+
+def setup(bot):
+    cog = RoleIndexCog(bot)
+    bot.add_cog(cog)
+    startup.register("roles", cog.start)
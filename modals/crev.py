@@ -1,10 +1,9 @@
 import discord
-from utils import db, err
-from datetime import datetime
-import os
+from utils import adb, err, fanout, guilds, metrics, outbox, recur, registry, time
 
 class CreateEventModal(discord.ui.Modal):
-    def __init__(self):
+    def __init__(self, suggested_utc: int = None):
+        """``suggested_utc`` (epoch seconds) pre-fills the time with the optimizer's best slot."""
         super().__init__(title="📝 Create New Event")
 
         self.title_input = discord.ui.InputText(
@@ -14,18 +13,27 @@ class CreateEventModal(discord.ui.Modal):
         )
         self.time_input = discord.ui.InputText(
             label="UTC Time (YYYY-MM-DD HH:MM)",
-            placeholder="e.g. 2025-05-20 01:00"
+            placeholder="e.g. 2025-05-20 01:00",
+            value=time.format_utc(suggested_utc) if suggested_utc else None
         )
         self.desc_input = discord.ui.InputText(
             label="Optional Description",
             style=discord.InputTextStyle.long,
             required=False
         )
+        self.repeat_input = discord.ui.InputText(
+            label="Repeat (optional, UTC)",
+            placeholder="e.g. daily · every 3 days · weekly mon,thu · until 2025-08-31",
+            required=False,
+            max_length=100
+        )
 
         self.add_item(self.title_input)
         self.add_item(self.time_input)
         self.add_item(self.desc_input)
+        self.add_item(self.repeat_input)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
         try:
             print("🔔 CreateEventModal.callback triggered")
@@ -39,11 +47,17 @@ class CreateEventModal(discord.ui.Modal):
                 raise ValueError("Title too long.")
 
             try:
-                datetime.strptime(time_str, "%Y-%m-%d %H:%M")
+                start_utc = time.parse_utc(time_str)
             except ValueError:
                 raise ValueError("Invalid datetime format.")
 
-            db.create_event(title, time_str, desc)
+            repeat = recur.parse(self.repeat_input.value or "", start_utc)
+
+            await adb.create_event(interaction.guild_id, title, start_utc, desc, repeat)
+            if repeat:
+                # Occurrences only get rows inside the reminder horizon; the dashboard expands the rest on demand
+                now = time.now_epoch()
+                await adb.expand_series(interaction.guild_id, now, until_utc=now + recur.HORIZON_SECONDS)
 
             await interaction.response.send_message(
                 "✅ Event created successfully.",
@@ -51,12 +65,18 @@ class CreateEventModal(discord.ui.Modal):
             )
 
             # 🔔 Notify the main channel
-            channel_id = int(os.getenv("REMINDER_CHANNEL_ID", 0))
-            channel = interaction.client.get_channel(channel_id)
+            repeating = f", repeating {recur.describe(repeat)}" if repeat else ""
+            channel = await guilds.reminder_channel(interaction.client, interaction.guild_id)
             if channel:
-                await channel.send(
-                    f"📅 **New Event Created!**\n**{title}** scheduled for `{time_str}` UTC.\nUse `/novabot` to RSVP."
+                sent = interaction.client.outbox.send(
+                    channel,
+                    f"📅 **New Event Created!**\n**{title}** scheduled for `{time_str}` UTC{repeating}.\nUse `/novabot` to RSVP.",
+                    outbox.ANNOUNCEMENT
                 )
+                registry.track_when_sent(sent, registry.ANNOUNCEMENT, start_utc + registry.ANNOUNCEMENT_GRACE_SECONDS)
+
+            # 📨 DM opted-in players who are usually online then; runs in the background
+            fanout.start(interaction.client, interaction.guild, title, start_utc)
 
         except Exception as e:
             err.log_error("create_event.callback", e, include_trace=True)
@@ -65,7 +85,8 @@ class CreateEventModal(discord.ui.Modal):
                     "❌ Could not create event.\n"
                     "- Title and time are required.\n"
                     "- Time format must be `YYYY-MM-DD HH:MM`\n"
-                    "- Title must be under 100 characters."
+                    "- Title must be under 100 characters.\n"
+                    "- Repeat looks like `daily`, `every 3 days` or `weekly mon,thu`, optionally `until YYYY-MM-DD`."
                 ),
                 ephemeral=True
             )
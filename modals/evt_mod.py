@@ -1,14 +1,13 @@
 import discord
-from utils import db, err
-from datetime import datetime
-import os
+from utils import adb, err, guilds, metrics, outbox, recur, registry, time
 
 class EditEventModal(discord.ui.Modal):
-    def __init__(self, event_id: int):
+    def __init__(self, event: dict, series: dict = None):
+        """``series`` is the recurring event ``event`` is an occurrence of, if any."""
         super().__init__(title="✏️ Edit Event")
-        self.event_id = event_id
-
-        event = db.get_event_by_id(event_id)
+        self.event_id = event["id"]
+        self.occurrence_utc = event.get("occurrence_utc")
+        self.series = series
 
         self.title_display = discord.ui.InputText(
             label="(Title, do not attempt to modify)",
@@ -21,7 +20,7 @@ class EditEventModal(discord.ui.Modal):
         self.time_input = discord.ui.InputText(
             label="UTC Time (YYYY-MM-DD HH:MM)",
             placeholder="e.g. 2025-05-21 23:00",
-            value=event["datetime_utc"]
+            value=time.format_utc(event["datetime_utc"])
         )
 
         self.desc_input = discord.ui.InputText(
@@ -35,6 +34,18 @@ class EditEventModal(discord.ui.Modal):
         self.add_item(self.time_input)
         self.add_item(self.desc_input)
 
+        if series:
+            self.repeat_text = recur.describe(series)
+            self.repeat_input = discord.ui.InputText(
+                label="Repeat (series, after this one; empty ends it)",
+                placeholder="e.g. daily · every 3 days · weekly mon,thu · until 2025-08-31",
+                value=self.repeat_text,
+                required=False,
+                max_length=100
+            )
+            self.add_item(self.repeat_input)
+
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
         try:
             print("🔔 EditEventModal.callback triggered")
@@ -46,39 +57,55 @@ class EditEventModal(discord.ui.Modal):
                 raise ValueError("Time is required.")
 
             try:
-                utc_dt = datetime.strptime(time_str, "%Y-%m-%d %H:%M")
+                start_utc = time.parse_utc(time_str)
             except ValueError:
                 raise ValueError("Time format must be YYYY-MM-DD HH:MM")
 
-            if utc_dt < datetime.utcnow():
+            if start_utc < time.now_epoch():
                 raise ValueError("Time must be in the future.")
 
-            time_clean = utc_dt.strftime("%Y-%m-%d %H:%M")
+            time_clean = time.format_utc(start_utc)
 
-            event = db.get_event_by_id(self.event_id)
+            repeat_changed = False
+            if self.series:
+                repeat = recur.parse(self.repeat_input.value or "", self.series["datetime_utc"])
+                repeat_changed = recur.describe(repeat) != self.repeat_text
+
+            event = await adb.get_event_by_id(interaction.guild_id, self.event_id)
             title = event["title"]
             old_time = event["datetime_utc"]
 
             print(f"📌 Updating event {self.event_id}: {title} @ {time_clean}")
-            db.update_event(self.event_id, title, time_clean, desc)
+            await adb.update_event(interaction.guild_id, self.event_id, title, start_utc, desc)
+
+            note = ""
+            if repeat_changed:
+                dropped = await adb.update_series(interaction.guild_id, self.series["id"], repeat, self.occurrence_utc)
+                now = time.now_epoch()
+                await adb.expand_series(interaction.guild_id, now, until_utc=now + recur.HORIZON_SECONDS)
+                note = f"\n🔁 Series now repeats {recur.describe(repeat)}." if repeat else "\n🔁 Series ends with this event."
+                if dropped:
+                    note += f" Removed {len(dropped)} later occurrences that no longer fit."
 
-            await interaction.response.send_message("✅ Event updated.", ephemeral=True)
+            await interaction.response.send_message(f"✅ Event updated.{note}", ephemeral=True)
 
             # 🔔 If time changed, notify RSVP'd users
-            if old_time != time_clean:
-                rsvps = db.get_reminders_due(self.event_id)
+            if old_time != start_utc:
+                rsvps = await adb.get_reminders_due(interaction.guild_id, self.event_id)
                 if rsvps:
                     mentions = [f"<@{rsvp['discord_id']}>" for rsvp in rsvps if rsvp ['discord_id']]
                     mention_block = ", ".join(mentions)
 
-                    channel_id = int(os.getenv("REMINDER_CHANNEL_ID", 0))
-                    channel = interaction.client.get_channel(channel_id)
+                    channel = await guilds.reminder_channel(interaction.client, interaction.guild_id)
                     if channel:
-                        await channel.send(
+                        sent = interaction.client.outbox.send(
+                            channel,
                             f"🔔 **Event Updated**: **{title}**\n"
                             f"🕒 New Time: `{time_clean}` UTC\n"
-                            f"{mention_block}"
+                            f"{mention_block}",
+                            outbox.ANNOUNCEMENT
                         )
+                        registry.track_when_sent(sent, registry.ANNOUNCEMENT, start_utc + registry.ANNOUNCEMENT_GRACE_SECONDS)
 
         except Exception as e:
             err.log_error("evt_mod.callback", e, include_trace=True)
@@ -86,7 +113,8 @@ class EditEventModal(discord.ui.Modal):
                 err.user_error(
                     "❌ Event Not Saved.\n"
                     "- Time must be in UTC format: `YYYY-MM-DD HH:MM`\n"
-                    "- Time must be in the future."
+                    "- Time must be in the future.\n"
+                    "- Repeat looks like `daily`, `every 3 days` or `weekly mon,thu`, optionally `until YYYY-MM-DD`."
                 ),
                 ephemeral=True
             )
@@ -1,5 +1,5 @@
 import discord
-from utils import db, err, time
+from utils import adb, err, metrics, time
 import os
 
 class OfflinePlayerModal(discord.ui.Modal):
@@ -26,6 +26,7 @@ class OfflinePlayerModal(discord.ui.Modal):
         self.add_item(self.start_input)
         self.add_item(self.end_input)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
         try:
             print("🔔 OfflinePlayerModal.callback triggered")
@@ -44,7 +45,7 @@ class OfflinePlayerModal(discord.ui.Modal):
             time.parse_time_string(start)
             time.parse_time_string(end)
 
-            db.set_player_time(name, norm_tz, start, end)
+            await adb.set_player_time(interaction.guild_id, None, name, norm_tz, start, end)
             print("✅ set_player_time() call completed")
 
             await interaction.response.send_message(
@@ -1,5 +1,5 @@
 import discord
-from utils import db, err
+from utils import err, metrics, rsvpbuf
 import logging
 
 class RSVPModal(discord.ui.Modal):
@@ -16,12 +16,12 @@ class RSVPModal(discord.ui.Modal):
 
         self.add_item(self.reminder_input)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
         try:
             name = interaction.user.display_name
-            user_id = str(interaction.user.id)
             reminder_raw = self.reminder_input.value.strip()
-            self.logger.debug(f"[RSVPModal] Raw input from {name}: '{reminder_raw}'")
+            self.logger.debug("[RSVPModal] Raw input from %s: '%s'", name, reminder_raw)
 
             reminder_minutes = None
             hours = None
@@ -32,7 +32,7 @@ class RSVPModal(discord.ui.Modal):
                     if not (1 <= hours <= 168):
                         raise ValueError("Out of bounds")
                     reminder_minutes = int(hours * 60)
-                    self.logger.debug(f"[RSVPModal] Reminder: {reminder_minutes} minutes")
+                    self.logger.debug("[RSVPModal] Reminder: %s minutes", reminder_minutes)
                 except ValueError:
                     await interaction.response.send_message(
                         "❌ Invalid reminder time. Use a number between 1 and 168.",
@@ -40,7 +40,7 @@ class RSVPModal(discord.ui.Modal):
                     )
                     return
 
-            db.set_rsvp(self.event_id, name, "yes", reminder_minutes, user_id)
+            rsvpbuf.set_rsvp(interaction.guild_id, self.event_id, interaction.user.id, name, "yes", reminder_minutes)
             self.logger.info(f"[RSVPModal] RSVP saved for {name}: {reminder_minutes} min")
 
             await interaction.response.send_message(
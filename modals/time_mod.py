@@ -1,5 +1,5 @@
 import discord
-from utils import db, err, time
+from utils import adb, err, metrics, time
 
 class SetTimeModal(discord.ui.Modal):
     def __init__(self):
@@ -22,6 +22,7 @@ class SetTimeModal(discord.ui.Modal):
         self.add_item(self.start_input)
         self.add_item(self.end_input)
 
+    @metrics.callback
     async def callback(self, interaction: discord.Interaction):
         try:
             print("✅ SetTimeModal.callback fired")
@@ -35,7 +36,7 @@ class SetTimeModal(discord.ui.Modal):
             time.parse_time_string(start)
             time.parse_time_string(end)
 
-            db.set_player_time(name, norm_tz, start, end)
+            await adb.set_player_time(interaction.guild_id, interaction.user.id, name, norm_tz, start, end)
 
             await interaction.response.send_message(
                 "✅ Your time preferences have been saved.",
@@ -0,0 +1,164 @@
+"""Awaitable versions of every utils.db function.
+
+Reads run on a small reader pool and all writes on a single writer thread.
+Each thread keeps its own long-lived connection (see db.get_connection), so
+with WAL enabled readers never wait on the writer and nothing touches the
+disk from the event loop.
+"""
+import asyncio
+import functools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from utils import db, err, metrics
+
+READER_POOL_SIZE = 4
+
+_writer = None
+_readers = None
+_subscribers = defaultdict(list)
+
+def _writer_pool() -> ThreadPoolExecutor:
+    global _writer
+    if _writer is None:
+        _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nova-db-writer")
+    return _writer
+
+def _reader_pool() -> ThreadPoolExecutor:
+    global _readers
+    if _readers is None:
+        _readers = ThreadPoolExecutor(max_workers=READER_POOL_SIZE, thread_name_prefix="nova-db-reader")
+    return _readers
+
+def _on(pool, fn):
+    run = metrics.timed("nova_db_query_seconds", "query", fn.__name__)(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool(), functools.partial(run, *args, **kwargs))
+    return wrapper
+
+def _read(fn):
+    return _on(_reader_pool, fn)
+
+def _write(fn, touches=None, topic="event", many=False):
+    """Writer-thread wrapper; ``touches(args, result)`` names what to publish on ``topic``.
+
+    With ``many`` it returns a list of keys, each published separately.
+    """
+    run = _on(_writer_pool, fn)
+    if touches is None:
+        return run
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        result = await run(*args, **kwargs)
+        keys = touches(args, result)
+        for key in (keys if many else [keys]):
+            _publish(topic, key)
+        return result
+    return wrapper
+
+def _event_arg(args, result):
+    return args[0], args[1]
+
+def _event_result(args, result):
+    return args[0], result
+
+def _event_results(args, result):
+    return [(args[0], event_id) for event_id in result]
+
+def _result_keys(args, result):
+    return result
+
+def _player_saved(args, result):
+    guild_id, discord_id, _name, *window = args
+    return (guild_id, result, discord_id, *window)
+
+def _player_deleted(args, result):
+    return args[0], result, None
+
+def _players_imported(args, result):
+    return args[0], "players"
+
+def _events_imported(args, result):
+    return args[0], "events"
+
+def subscribe(callback, topic: str = "event"):
+    """Call ``callback(key)`` on the event loop after every write on ``topic``.
+
+    Topics: "event" (key is ``(guild_id, event_id)``), "event_deleted" (the
+    same key, for an event that no longer exists) and "player" (key is
+    ``(guild_id, player_id, discord_id, timezone, start, end)``, or
+    ``(guild_id, player_id, None)`` when an offline player is deleted).
+    "bulk" (key is ``(guild_id, "events" | "players")``) is published once per
+    imported batch instead of once per row: reload that part of the guild.
+    """
+    _subscribers[topic].append(callback)
+
+def unsubscribe(callback, topic: str = "event"):
+    if callback in _subscribers[topic]:
+        _subscribers[topic].remove(callback)
+
+def _publish(topic: str, key):
+    for callback in list(_subscribers[topic]):
+        try:
+            callback(key)
+        except Exception as e:
+            err.log_error("adb.publish", e, include_trace=True)
+
+def shutdown():
+    """Finish queued work, stop the pools and close their connections."""
+    global _writer, _readers
+    for pool in (_writer, _readers):
+        if pool is not None:
+            pool.shutdown(wait=True)
+    _writer = _readers = None
+    db.close_all()
+
+# --- Reads ---
+get_all_events = _read(db.get_all_events)
+count_rsvps = _read(db.count_rsvps)
+get_player_timezone = _read(db.get_player_timezone)
+get_event_by_id = _read(db.get_event_by_id)
+get_events_between = _read(db.get_events_between)
+get_event_card = _read(db.get_event_card)
+get_events_after = _read(db.get_events_after)
+get_events_before = _read(db.get_events_before)
+get_expired_messages = _read(db.get_expired_messages)
+get_messages_by_kind = _read(db.get_messages_by_kind)
+get_rsvp = _read(db.get_rsvp)
+get_reminders_due = _read(db.get_reminders_due)
+get_pending_reminders = _read(db.get_pending_reminders)
+get_all_player_availability = _read(db.get_all_player_availability)
+get_offline_players = _read(db.get_offline_players)
+get_reminder_minutes = _read(db.get_reminder_minutes)
+get_guild_config = _read(db.get_guild_config)
+get_players_page = _read(db.get_players_page)
+get_events_page = _read(db.get_events_page)
+get_rsvps_page = _read(db.get_rsvps_page)
+get_notify_dm = _read(db.get_notify_dm)
+get_dm_subscribers = _read(db.get_dm_subscribers)
+
+# --- Writes ---
+init_db = _write(db.init_db)
+update_event = _write(db.update_event, touches=_event_arg)
+set_player_time = _write(db.set_player_time, touches=_player_saved, topic="player")
+set_rsvp = _write(db.set_rsvp, touches=_event_arg)
+set_rsvps = _write(db.set_rsvps, touches=_result_keys, many=True)
+set_reminder = _write(db.set_reminder, touches=_event_arg)
+clear_reminder = _write(db.clear_reminder, touches=_event_arg)
+clear_reminders = _write(db.clear_reminders, touches=_event_arg)
+create_event = _write(db.create_event, touches=_event_result)
+expand_series = _write(db.expand_series, touches=_event_results, many=True)
+update_series = _write(db.update_series, touches=_event_results, topic="event_deleted", many=True)
+delete_event = _write(db.delete_event, touches=_event_arg, topic="event_deleted")
+delete_expired_events = _write(db.delete_expired_events, touches=_event_results, topic="event_deleted", many=True)
+track_message = _write(db.track_message)
+forget_messages = _write(db.forget_messages)
+delete_offline_player = _write(db.delete_offline_player, touches=_player_deleted, topic="player")
+set_guild_config = _write(db.set_guild_config)
+set_notify_dm = _write(db.set_notify_dm)
+import_players = _write(db.import_players, touches=_players_imported, topic="bulk")
+import_events = _write(db.import_events, touches=_events_imported, topic="bulk")
+adopt_legacy_rows = _write(db.adopt_legacy_rows)
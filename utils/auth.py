@@ -1,18 +1,57 @@
-import os
 import discord
-from utils import err
+from utils import err, guilds
 
-EXAMPLE_ROLE_ID = int(os.getenv("EXAMPLE_ROLE_ID", 0))
+# guild_id → (R4 role ID, IDs of the members holding it). Built per guild by
+# index_guild and kept current by the gateway listeners in cogs/roles.py, so
+# a permission check is a set lookup with no REST call.
+_holders = {}
+
+async def index_guild(guild: discord.Guild):
+    """(Re)build a guild's R4 holder set from its cached member list."""
+    role_id = (await guilds.config(guild.id))["admin_role_id"]
+    if not guild.chunked:
+        await guild.chunk()
+    role = guild.get_role(role_id)
+    _holders[guild.id] = (role_id, {member.id for member in role.members} if role else set())
+    return len(_holders[guild.id][1])
+
+def forget_guild(guild_id: int):
+    _holders.pop(guild_id, None)
+
+def member_changed(member: discord.Member):
+    """Gateway hook for member updates/joins: re-check the one role that matters."""
+    entry = _holders.get(member.guild.id)
+    if entry is None:
+        return
+    role_id, holders = entry
+    if member.get_role(role_id) is not None:
+        holders.add(member.id)
+    else:
+        holders.discard(member.id)
+
+def member_left(guild_id: int, user_id: int):
+    entry = _holders.get(guild_id)
+    if entry is not None:
+        entry[1].discard(user_id)
+
+def role_deleted(role: discord.Role):
+    entry = _holders.get(role.guild.id)
+    if entry is not None and entry[0] == role.id:
+        entry[1].clear()
 
 async def is_r4(interaction: discord.Interaction) -> bool:
-    """Check if user has R4 role. Falls back to fetch if roles missing."""
+    """Check if user has the guild's R4 role (O(1) once the guild is indexed)."""
     try:
-        user = interaction.user
-        # If roles are missing (not cached), fetch fresh
-        if not hasattr(user, "roles"):
-            user = await interaction.guild.fetch_member(user.id)
+        entry = _holders.get(interaction.guild_id)
+        if entry is not None:
+            return interaction.user.id in entry[1]
 
-        return any(role.id == EXAMPLE_ROLE_ID for role in user.roles)
+        # Not indexed yet (startup still running): the interaction's member payload carries its roles
+        user = interaction.user
+        if not isinstance(user, discord.Member):
+            return False
+        role_id = (await guilds.config(interaction.guild_id))["admin_role_id"]
+        return user.get_role(role_id) is not None
 
     except Exception as e:
         err.log_error("auth.is_r4", e)
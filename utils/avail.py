@@ -0,0 +1,263 @@
+"""Player availability coverage for the "View Best Times" button.
+
+``coverage_for(guild_id).counts[m]`` is how many of the guild's players are
+online at UTC minute ``m`` of the day. It is built once per guild from the
+players table and then kept current by adb's "player" notifications
+(set_player_time / delete_offline_player, routed by ``on_player_changed``), so
+answering Best Times is a couple of O(1440) array passes instead of a full
+table read plus per-player timezone conversions on every click.
+
+The histogram anchors every window to today's UTC offset. For scheduling
+on specific dates, ``plan`` rebuilds coverage over the next N days with
+each date's own offsets (so DST changes land on the right day) and ranks
+start times by expected attendance.
+"""
+import asyncio
+import datetime
+import logging
+import numpy as np
+from utils import adb, err, time
+
+MINUTES_PER_DAY = 24 * 60
+PLAN_DAYS = 7
+PLAN_STEP_MINUTES = 30
+
+def utc_window(tz: str, start: str, end: str) -> tuple[int, int]:
+    """A player's local play window as UTC minute-of-day offsets (end exclusive)."""
+    start_utc = time.local_to_utc(start, tz)
+    end_utc = time.local_to_utc(end, tz)
+    return start_utc.hour * 60 + start_utc.minute, end_utc.hour * 60 + end_utc.minute
+
+def covers(tz: str, start: str, end: str, when: int) -> bool:
+    """Whether a local play window includes epoch second ``when``, using that date's offset."""
+    local = time.from_epoch(when).astimezone(time.get_zone(tz))
+    start_hour, start_minute = time.parse_time_string(start)
+    end_hour, end_minute = time.parse_time_string(end)
+    first = start_hour * 60 + start_minute
+    length = (end_hour * 60 + end_minute - first) % MINUTES_PER_DAY or MINUTES_PER_DAY
+    return (local.hour * 60 + local.minute - first) % MINUTES_PER_DAY < length
+
+def _local_window(tz: str, start: str, end: str) -> tuple[tuple[int, int], tuple[str, int, int]]:
+    """A player's UTC window (as ``utc_window``) and local ``(zone key, start minute, end minute)``."""
+    window = utc_window(tz, start, end)
+    start_h, start_m = time.parse_time_string(start)
+    end_h, end_m = time.parse_time_string(end)
+    return window, (time.get_zone(tz).key, start_h * 60 + start_m, end_h * 60 + end_m)
+
+def _build(players: list) -> tuple[np.ndarray, dict, dict]:
+    """Coverage state ``(counts, windows, local)`` for a table read of players; runs on a worker thread."""
+    windows, local = {}, {}
+    for p in players:
+        try:
+            windows[p["id"]], local[p["id"]] = _local_window(p["timezone"], p["availability_start"],
+                                                             p["availability_end"])
+        except Exception as e:
+            err.log_error("avail.window", e)
+    if not windows:
+        return np.zeros(MINUTES_PER_DAY, dtype=np.int32), windows, local
+    starts, ends = np.array(list(windows.values()), dtype=np.int64).T
+    diff = np.bincount(starts, minlength=MINUTES_PER_DAY + 1) - np.bincount(ends, minlength=MINUTES_PER_DAY + 1)
+    # A window wrapping past midnight (start >= end) comes out as -1 over [end, start); +1 fixes it
+    counts = np.cumsum(diff[:MINUTES_PER_DAY]) + np.count_nonzero(starts >= ends)
+    return counts.astype(np.int32), windows, local
+
+class Coverage:
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.logger = logging.getLogger("nova")
+        self.counts = np.zeros(MINUTES_PER_DAY, dtype=np.int32)
+        self._windows = {}
+        self._local = {}
+        self._groups = None
+        self._loaded = False
+        self._loading = None
+        self._pending = []
+
+    def __len__(self):
+        return len(self._windows)
+
+    async def ensure_loaded(self):
+        """Build the histogram from the players table once per process."""
+        if self._loaded:
+            return
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._load())
+        await asyncio.shield(self._loading)
+
+    async def _load(self):
+        try:
+            players = await adb.get_all_player_availability(self.guild_id)
+            # Timezone conversion for every player is slow enough to stall the loop on a big guild
+            self.counts, self._windows, self._local = await asyncio.to_thread(_build, players)
+            self._groups = None
+            # Writes that landed while the table was being read; replaying is idempotent.
+            for change in self._pending:
+                self._apply_change(change)
+            self._pending.clear()
+            self._loaded = True
+            self.logger.info(f"📊 Availability coverage built for {len(self._windows)} players in guild {self.guild_id}")
+        finally:
+            self._loading = None
+
+    def on_player_changed(self, change: tuple):
+        """Apply ``(player_id, tz, start, end)``, or ``(player_id,)`` for a delete."""
+        if self._loaded:
+            self._apply_change(change)
+        elif self._loading is not None:
+            self._pending.append(change)
+
+    def _apply_change(self, change: tuple):
+        player_id, *window = change
+        if window:
+            self._set(player_id, *window)
+        else:
+            self._remove(player_id)
+
+    def _set(self, player_id: int, tz: str, start: str, end: str):
+        self._remove(player_id)
+        try:
+            window, local = _local_window(tz, start, end)
+        except Exception as e:
+            err.log_error("avail.window", e)
+            return
+        self._windows[player_id] = window
+        self._local[player_id] = local
+        self._groups = None
+        self._add(window, 1)
+
+    def _remove(self, player_id: int):
+        if self._local.pop(player_id, None) is not None:
+            self._groups = None
+        window = self._windows.pop(player_id, None)
+        if window is not None:
+            self._add(window, -1)
+
+    def _add(self, window: tuple[int, int], delta: int):
+        start, end = window
+        if start < end:
+            self.counts[start:end] += delta
+        else:
+            # Wraps past midnight UTC (start == end means all day)
+            self.counts[start:] += delta
+            self.counts[:end] += delta
+
+    def window_averages(self, width: int) -> np.ndarray:
+        """Average players online over [m, m + width) for every start minute m (circular)."""
+        width = max(1, min(int(width), MINUTES_PER_DAY))
+        ring = np.concatenate((self.counts, self.counts[:width - 1]))
+        sums = np.concatenate(([0], np.cumsum(ring, dtype=np.int64)))
+        return (sums[width:width + MINUTES_PER_DAY] - sums[:MINUTES_PER_DAY]) / width
+
+    def best_windows(self, width: int, step: int = 60, top: int = 6) -> list[tuple[int, float]]:
+        """Top ``(start_minute, avg_players)`` windows of ``width`` minutes, starts on ``step`` boundaries."""
+        averages = self.window_averages(width)[::max(1, step)]
+        order = np.argsort(-averages, kind="stable")[:top]
+        return [(int(i) * step, float(averages[i])) for i in order]
+
+    def _tz_groups(self) -> dict:
+        """Local windows grouped by timezone as (starts, ends) minute arrays; cached until a change."""
+        if self._groups is None:
+            grouped = {}
+            for tz, start, end in self._local.values():
+                grouped.setdefault(tz, ([], []))
+                grouped[tz][0].append(start)
+                grouped[tz][1].append(end)
+            self._groups = {
+                tz: (np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64))
+                for tz, (starts, ends) in grouped.items()
+            }
+        return self._groups
+
+    async def plan(self, duration: int, days: int = PLAN_DAYS, top: int = 5) -> list[tuple[int, float]]:
+        """Best ``(start_epoch, avg_players)`` slots over the next ``days``; runs off the event loop."""
+        await self.ensure_loaded()
+        return await asyncio.to_thread(plan_slots, self._tz_groups(), duration, days, top, time.now_epoch())
+
+def _hourly_offsets(tz: str, first_day: datetime.date, days: int) -> np.ndarray:
+    """UTC offset in minutes for each local (date, hour) wall time, shape (days, 24)."""
+    zone = time.get_zone(tz)
+    offsets = np.empty((days, 24), dtype=np.int64)
+    for d in range(days):
+        day = first_day + datetime.timedelta(days=d)
+        for h in range(24):
+            local = datetime.datetime(day.year, day.month, day.day, h, tzinfo=zone)
+            offsets[d, h] = local.utcoffset() // datetime.timedelta(minutes=1)
+    return offsets
+
+def timeline_coverage(groups: dict, first_day: datetime.date, days: int) -> np.ndarray:
+    """Players online per UTC minute from ``first_day`` 00:00 UTC, across ``days`` local dates.
+
+    Each player's window is placed on every local date using that date's
+    own offset for the window's start hour.
+    """
+    length = days * MINUTES_PER_DAY
+    # Local dates one day either side so offsets up to ±24h still land in range
+    local_days = days + 2
+    local_first = first_day - datetime.timedelta(days=1)
+    day_base = (np.arange(local_days, dtype=np.int64) - 1)[:, None] * MINUTES_PER_DAY
+
+    all_starts, all_ends = [], []
+    for tz, (starts, ends) in groups.items():
+        offsets = _hourly_offsets(tz, local_first, local_days)
+        lengths = (ends - starts) % MINUTES_PER_DAY
+        lengths[lengths == 0] = MINUTES_PER_DAY
+        utc_starts = day_base + starts[None, :] - offsets[:, starts // 60]
+        all_starts.append(utc_starts.ravel())
+        all_ends.append((utc_starts + lengths[None, :]).ravel())
+    if not all_starts:
+        return np.zeros(length, dtype=np.int64)
+
+    starts = np.clip(np.concatenate(all_starts), 0, length)
+    ends = np.clip(np.concatenate(all_ends), 0, length)
+    diff = np.bincount(starts, minlength=length + 1) - np.bincount(ends, minlength=length + 1)
+    return np.cumsum(diff[:length])
+
+def plan_slots(groups: dict, duration: int, days: int, top: int, now: int,
+               step: int = PLAN_STEP_MINUTES) -> list[tuple[int, float]]:
+    """Rank event start times in the next ``days`` by average players online for ``duration`` minutes.
+
+    Candidates start on ``step``-minute UTC boundaries after ``now``; picks
+    are kept at least ``duration`` apart so the list is not one peak repeated.
+    """
+    duration = max(1, int(duration))
+    first_day = datetime.datetime.fromtimestamp(now, datetime.timezone.utc).date()
+    origin = int(datetime.datetime(first_day.year, first_day.month, first_day.day,
+                                   tzinfo=datetime.timezone.utc).timestamp())
+    horizon = days + 1 + duration // MINUTES_PER_DAY
+    online = timeline_coverage(groups, first_day, horizon)
+
+    sums = np.concatenate(([0], np.cumsum(online, dtype=np.int64)))
+    first = -(-((now - origin) // 60) // step) * step
+    last = days * MINUTES_PER_DAY + first
+    candidates = np.arange(first, min(last, len(online) - duration + 1), step)
+    if not len(candidates):
+        return []
+    averages = (sums[candidates + duration] - sums[candidates]) / duration
+
+    picked = []
+    for i in np.argsort(-averages, kind="stable"):
+        start = int(candidates[i])
+        if averages[i] <= 0 or len(picked) >= top:
+            break
+        if all(abs(start - p) >= duration for p, _ in picked):
+            picked.append((start, float(averages[i])))
+    return [(origin + start * 60, avg) for start, avg in picked]
+
+_coverages = {}  # guild_id → Coverage, built on first use
+
+def coverage_for(guild_id: int) -> Coverage:
+    coverage = _coverages.get(guild_id)
+    if coverage is None:
+        coverage = _coverages[guild_id] = Coverage(guild_id)
+    return coverage
+
+def on_player_changed(change: tuple):
+    """adb "player" subscriber: hands the change to that guild's coverage, if built."""
+    guild_id, player_id, _discord_id, *window = change
+    coverage = _coverages.get(guild_id)
+    if coverage is not None:
+        coverage.on_player_changed((player_id, *window))
+
+def forget(guild_id: int):
+    """Drop a guild's coverage (the bot left it, or its players were imported); rebuilt on next use."""
+    _coverages.pop(guild_id, None)
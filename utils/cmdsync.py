@@ -0,0 +1,58 @@
+"""Slash command sync gated on a hash of the command signatures.
+
+Uploading the command tree is slow and rate limited, so it only happens
+when the hash of the pending commands' payloads differs from the one saved
+after the last successful sync. Otherwise the already-registered commands
+are fetched once (a single read) so py-cord can route interactions to them.
+All NoVa commands are global; guild-scoped commands would need the same
+treatment per guild.
+"""
+import hashlib
+import json
+import logging
+import os
+
+HASH_PATH = os.path.join("db", "commands.sha256")
+
+logger = logging.getLogger("nova")
+
+def command_hash(bot) -> str:
+    payload = sorted((cmd.to_dict() for cmd in bot.pending_application_commands), key=lambda c: c["name"])
+    blob = json.dumps({"application": bot.application_id, "commands": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def _saved_hash(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _save_hash(path: str, digest: str):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(digest)
+    os.replace(tmp, path)
+
+async def _bind_registered(bot) -> bool:
+    """Attach the IDs of already-registered commands; False if any pending command is missing."""
+    registered = await bot.http.get_global_commands(bot.application_id)
+    ids = {(c["name"], c.get("type", 1)): int(c["id"]) for c in registered}
+    for cmd in bot.pending_application_commands:
+        cmd_id = ids.get((cmd.name, cmd.type))
+        if cmd_id is None:
+            return False
+        cmd.id = cmd_id
+        bot._application_commands[cmd_id] = cmd  # what sync_commands does after an upload
+    return True
+
+async def sync(bot, path: str = HASH_PATH) -> bool:
+    """Sync slash commands if their signatures changed; returns whether an upload happened."""
+    digest = command_hash(bot)
+    if digest == _saved_hash(path) and await _bind_registered(bot):
+        logger.info(f"⏭️ Slash commands unchanged ({digest[:12]}); skipped sync")
+        return False
+    await bot.sync_commands()
+    _save_hash(path, digest)
+    logger.info(f"✅ Synced {len(bot.pending_application_commands)} slash commands ({digest[:12]})")
+    return True
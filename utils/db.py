@@ -1,174 +1,551 @@
+import itertools
 import sqlite3
+import threading
 import os
+from utils import migrate, recur
 
 DB_PATH = "db/nova.db"
 os.makedirs("db", exist_ok=True)
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+# sqlite3 keeps a per-connection cache of prepared statements, so connections
+# are long-lived (one per thread) instead of being reopened on every call.
+STATEMENT_CACHE_SIZE = 128
+BUSY_TIMEOUT_MS = 5000
+
+_local = threading.local()
+_all_connections = []
+_all_lock = threading.Lock()
+
+def _open_connection() -> sqlite3.Connection:
+    # Each connection is only ever used by the thread that opened it;
+    # check_same_thread is relaxed so close_all() can run from any thread.
+    conn = sqlite3.connect(DB_PATH, cached_statements=STATEMENT_CACHE_SIZE,
+                           timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    return conn
+
+def get_connection() -> sqlite3.Connection:
+    """Return this thread's connection, opening it on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _open_connection()
+        _local.conn = conn
+        with _all_lock:
+            _all_connections.append(conn)
     return conn
 
+def close_all():
+    """Close every connection opened by get_connection()."""
+    with _all_lock:
+        for conn in _all_connections:
+            conn.close()
+        _all_connections.clear()
+    _local.__dict__.pop("conn", None)
+
 def init_db():
+    """Create or upgrade the schema to the latest migration."""
+    return migrate.run(get_connection())
+
+def get_all_events(guild_id: int):
     with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.executescript("""
-        CREATE TABLE IF NOT EXISTS events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            description TEXT,
-            datetime_utc TEXT NOT NULL,
-            creator TEXT
-        );
-
-        CREATE TABLE IF NOT EXISTS rsvps (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            event_id INTEGER NOT NULL,
-            player_name TEXT NOT NULL,
-            discord_id TEXT,
-            response TEXT CHECK(response IN ('yes', 'no')),
-            reminder_minutes INTEGER DEFAULT NULL,
-            UNIQUE(event_id, player_name),
-            FOREIGN KEY (event_id) REFERENCES events(id)
-        );
-
-        CREATE TABLE IF NOT EXISTS players (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            player_name TEXT NOT NULL UNIQUE,
-            timezone TEXT NOT NULL,
-            availability_start TEXT,
-            availability_end TEXT
-        );
-        """)
-        conn.commit()
-
-def get_all_events():
-    with get_connection() as conn:
-        cursor = conn.execute("SELECT * FROM events ORDER BY datetime_utc DESC")
+        cursor = conn.execute(
+            "SELECT * FROM events WHERE guild_id = ? AND repeat_rule IS NULL ORDER BY datetime_utc DESC", (guild_id,))
         return [dict(row) for row in cursor.fetchall()]
 
-def count_rsvps(event_id: int) -> int:
+def count_rsvps(guild_id: int, event_id: int) -> int:
     with get_connection() as conn:
         cursor = conn.execute(
-            "SELECT COUNT(*) FROM rsvps WHERE event_id = ? AND response = 'yes'", (event_id,))
+            "SELECT COUNT(*) FROM rsvps WHERE guild_id = ? AND event_id = ? AND response = 'yes'",
+            (guild_id, event_id))
         return cursor.fetchone()[0]
 
-def get_player_timezone(player_name: str) -> str:
+def _player_id(conn, guild_id: int, discord_id: int, player_name: str) -> int:
+    """The player's row ID, created on first use; call inside a write transaction.
+
+    Discord users are found by snowflake only (keeping their display name
+    current). ``discord_id`` None means an offline player, found by name
+    among unlinked rows. A Discord user never takes over an unlinked row,
+    whatever their display name: those are offline players, and legacy rows
+    were already linked by the v5 migration.
+    """
+    if discord_id is not None:
+        row = conn.execute("SELECT id, player_name FROM players WHERE guild_id = ? AND discord_id = ?",
+                           (guild_id, discord_id)).fetchone()
+        if row:
+            if row["player_name"] != player_name:
+                conn.execute("UPDATE players SET player_name = ? WHERE id = ?", (player_name, row["id"]))
+            return row["id"]
+    else:
+        row = conn.execute("SELECT id FROM players WHERE guild_id = ? AND player_name = ? AND discord_id IS NULL",
+                           (guild_id, player_name)).fetchone()
+        if row:
+            return row["id"]
+    cursor = conn.execute("INSERT INTO players (guild_id, discord_id, player_name) VALUES (?, ?, ?)",
+                          (guild_id, discord_id, player_name))
+    return cursor.lastrowid
+
+def get_player_timezone(guild_id: int, discord_id: int) -> str:
     with get_connection() as conn:
         cursor = conn.execute(
-            "SELECT timezone FROM players WHERE player_name = ?", (player_name,))
+            "SELECT timezone FROM players WHERE guild_id = ? AND discord_id = ?", (guild_id, discord_id))
         row = cursor.fetchone()
-        return row["timezone"] if row else ""
+        return (row["timezone"] or "") if row else ""
 
-def get_event_by_id(event_id: int) -> dict:
+def get_event_by_id(guild_id: int, event_id: int) -> dict:
     with get_connection() as conn:
-        cursor = conn.execute("SELECT * FROM events WHERE id = ?", (event_id,))
+        cursor = conn.execute("SELECT * FROM events WHERE id = ? AND guild_id = ?", (event_id, guild_id))
         row = cursor.fetchone()
         return dict(row) if row else {}
 
-def update_event(event_id: int, title: str, time_str: str, desc: str):
+def get_events_between(guild_id: int, start_utc: int, end_utc: int) -> list[dict]:
+    """Events starting in [start_utc, end_utc), soonest first (index range scan)."""
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT * FROM events
+            WHERE guild_id = ? AND datetime_utc >= ? AND datetime_utc < ? AND repeat_rule IS NULL
+            ORDER BY datetime_utc
+        """, (guild_id, start_utc, end_utc))
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_events_after(guild_id: int, after_utc: int, after_id: int, limit: int) -> list[dict]:
+    """Keyset page: the next ``limit`` events after (after_utc, after_id), soonest first."""
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT * FROM events
+            WHERE guild_id = ? AND (datetime_utc, id) > (?, ?) AND repeat_rule IS NULL
+            ORDER BY datetime_utc, id
+            LIMIT ?
+        """, (guild_id, after_utc, after_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_events_before(guild_id: int, before_utc: int, before_id: int, limit: int, not_before_utc: int = 0) -> list[dict]:
+    """Keyset page backwards: up to ``limit`` events before (before_utc, before_id), latest first."""
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT * FROM events
+            WHERE guild_id = ? AND (datetime_utc, id) < (?, ?) AND datetime_utc >= ? AND repeat_rule IS NULL
+            ORDER BY datetime_utc DESC, id DESC
+            LIMIT ?
+        """, (guild_id, before_utc, before_id, not_before_utc, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_event_card(guild_id: int, event_id: int, discord_id: int) -> dict:
+    """RSVP count plus the viewer's own response and reminder, in one round trip."""
     with get_connection() as conn:
-        conn.execute("""UPDATE events SET title = ?, datetime_utc = ?, description = ? WHERE id = ?""",
-                     (title, time_str, desc, event_id))
+        cursor = conn.execute("""
+            SELECT
+              (SELECT COUNT(*) FROM rsvps WHERE guild_id = ? AND event_id = ? AND response = 'yes') AS rsvp_count,
+              r.response,
+              r.reminder_minutes
+            FROM (SELECT 1)
+            LEFT JOIN players p ON p.guild_id = ? AND p.discord_id = ?
+            LEFT JOIN rsvps r ON r.event_id = ? AND r.player_id = p.id
+        """, (guild_id, event_id, guild_id, discord_id, event_id))
+        return dict(cursor.fetchone())
+
+def update_event(guild_id: int, event_id: int, title: str, start_utc: int, desc: str):
+    with get_connection() as conn:
+        conn.execute("""UPDATE events SET title = ?, datetime_utc = ?, description = ? WHERE id = ? AND guild_id = ?""",
+                     (title, start_utc, desc, event_id, guild_id))
         conn.commit()
 
-def set_player_time(player_name: str, timezone: str, start: str, end: str):
+def set_player_time(guild_id: int, discord_id: int, player_name: str, timezone: str, start: str, end: str) -> int:
+    """Save a play window; ``discord_id`` None for an offline player. Returns the player ID."""
     with get_connection() as conn:
+        player_id = _player_id(conn, guild_id, discord_id, player_name)
         conn.execute("""
-            INSERT INTO players (player_name, timezone, availability_start, availability_end)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(player_name) DO UPDATE SET
-              timezone=excluded.timezone,
-              availability_start=excluded.availability_start,
-              availability_end=excluded.availability_end
-        """, (player_name, timezone, start, end))
+            UPDATE players SET timezone = ?, availability_start = ?, availability_end = ?
+            WHERE id = ?
+        """, (timezone, start, end, player_id))
         conn.commit()
+        return player_id
 
-def get_rsvp(event_id: int, player_name: str) -> str:
+def get_rsvp(guild_id: int, event_id: int, discord_id: int) -> str:
     with get_connection() as conn:
-        cursor = conn.execute(
-            "SELECT response FROM rsvps WHERE event_id = ? AND player_name = ?",
-            (event_id, player_name))
+        cursor = conn.execute("""
+            SELECT r.response FROM players p
+            JOIN rsvps r ON r.event_id = ? AND r.player_id = p.id
+            WHERE p.guild_id = ? AND p.discord_id = ?
+        """, (event_id, guild_id, discord_id))
         row = cursor.fetchone()
         return row["response"] if row else ""
 
-def set_rsvp(event_id: int, player_name: str, response: str, reminder_minutes: int = None, discord_id: str = None):
+def set_rsvp(guild_id: int, event_id: int, discord_id: int, player_name: str, response: str, reminder_minutes: int = None):
     with get_connection() as conn:
+        player_id = _player_id(conn, guild_id, discord_id, player_name)
         conn.execute("""
-            INSERT INTO rsvps (event_id, player_name, discord_id, response, reminder_minutes)
+            INSERT INTO rsvps (guild_id, event_id, player_id, response, reminder_minutes)
             VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(event_id, player_name) DO UPDATE SET
+            ON CONFLICT(event_id, player_id) DO UPDATE SET
               response = excluded.response,
-              reminder_minutes = excluded.reminder_minutes,
-              discord_id = excluded.discord_id
-        """, (event_id, player_name, discord_id, response, reminder_minutes))
+              reminder_minutes = excluded.reminder_minutes
+        """, (guild_id, event_id, player_id, response, reminder_minutes))
         conn.commit()
 
-def set_reminder(event_id: int, player_name: str, minutes: int):
+def set_rsvps(rows: list[tuple]) -> list[tuple]:
+    """Upsert many ``(guild_id, event_id, discord_id, player_name, response, reminder_minutes)`` rows
+    in one transaction; returns the distinct ``(guild_id, event_id)`` pairs written."""
+    with get_connection() as conn:
+        params = [(guild_id, event_id, _player_id(conn, guild_id, discord_id, name), response, minutes)
+                  for guild_id, event_id, discord_id, name, response, minutes in rows]
+        conn.executemany("""
+            INSERT INTO rsvps (guild_id, event_id, player_id, response, reminder_minutes)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(event_id, player_id) DO UPDATE SET
+              response = excluded.response,
+              reminder_minutes = excluded.reminder_minutes
+        """, params)
+        conn.commit()
+        return sorted({(guild_id, event_id) for guild_id, event_id, *_ in rows})
+
+def set_reminder(guild_id: int, event_id: int, player_id: int, minutes: int):
     with get_connection() as conn:
         conn.execute("""
             UPDATE rsvps SET reminder_minutes = ?
-            WHERE event_id = ? AND player_name = ?
-        """, (minutes, event_id, player_name))
+            WHERE event_id = ? AND player_id = ? AND guild_id = ?
+        """, (minutes, event_id, player_id, guild_id))
         conn.commit()
 
-def get_reminders_due(event_id: int):
+def get_reminders_due(guild_id: int, event_id: int):
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT r.player_id, p.player_name, p.discord_id, r.reminder_minutes
+            FROM rsvps r
+            JOIN players p ON p.id = r.player_id
+            WHERE r.guild_id = ? AND r.event_id = ? AND r.response = 'yes' AND r.reminder_minutes IS NOT NULL
+        """, (guild_id, event_id))
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_pending_reminders(guild_id: int, after_utc: int):
+    """Personal reminders for every event in the guild starting at or after ``after_utc``."""
     with get_connection() as conn:
         cursor = conn.execute("""
-            SELECT player_name, discord_id, reminder_minutes FROM rsvps
-            WHERE event_id = ? AND response = 'yes' AND reminder_minutes IS NOT NULL
-        """, (event_id,))
+            SELECT r.event_id, r.player_id, p.player_name, p.discord_id, r.reminder_minutes
+            FROM events e
+            JOIN rsvps r ON r.guild_id = e.guild_id AND r.event_id = e.id
+            JOIN players p ON p.id = r.player_id
+            WHERE e.guild_id = ? AND e.datetime_utc >= ?
+              AND r.response = 'yes' AND r.reminder_minutes IS NOT NULL
+        """, (guild_id, after_utc))
         return [dict(row) for row in cursor.fetchall()]
 
-def clear_reminder(event_id: int, player_name: str):
+def clear_reminder(guild_id: int, event_id: int, player_id: int):
     with get_connection() as conn:
         conn.execute("""
             UPDATE rsvps SET reminder_minutes = NULL
-            WHERE event_id = ? AND player_name = ?
-        """, (event_id, player_name))
+            WHERE event_id = ? AND player_id = ? AND guild_id = ?
+        """, (event_id, player_id, guild_id))
         conn.commit()
 
-def create_event(title: str, utc_time: str, desc: str):
+def clear_reminders(guild_id: int, event_id: int, player_ids: list[int]):
+    """Clear several players' reminders for one event in a single transaction."""
     with get_connection() as conn:
-        conn.execute("""
-            INSERT INTO events (title, datetime_utc, description, creator)
-            VALUES (?, ?, ?, 'admin')
-        """, (title, utc_time, desc))
+        conn.executemany("""
+            UPDATE rsvps SET reminder_minutes = NULL
+            WHERE event_id = ? AND player_id = ? AND guild_id = ?
+        """, [(event_id, player_id, guild_id) for player_id in player_ids])
         conn.commit()
 
-def get_all_player_availability():
+def create_event(guild_id: int, title: str, start_utc: int, desc: str, repeat: dict = None) -> int:
+    """Create an event, or with ``repeat`` (a recur.parse rule) a series starting at ``start_utc``."""
+    repeat = repeat or {}
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            INSERT INTO events (guild_id, title, datetime_utc, description, creator,
+                                repeat_rule, repeat_every, repeat_days, repeat_until)
+            VALUES (?, ?, ?, ?, 'admin', ?, ?, ?, ?)
+        """, (guild_id, title, start_utc, desc, repeat.get("repeat_rule"), repeat.get("repeat_every"),
+              repeat.get("repeat_days"), repeat.get("repeat_until")))
+        conn.commit()
+        return cursor.lastrowid
+
+def expand_series(guild_id: int, after_utc: int, until_utc: int = None, count: int = None) -> list[int]:
+    """Give the guild's series occurrences from ``after_utc`` rows of their own; returns the new IDs.
+
+    Covers [after_utc, until_utc) or each series' next ``count`` occurrences;
+    slots that already have a row, or were deleted, are left alone.
+    """
+    assert until_utc is not None or count is not None, "an open-ended expansion never stops"
+    created = []
     with get_connection() as conn:
         cursor = conn.execute("""
-            SELECT player_name, timezone, availability_start, availability_end FROM players
-            WHERE timezone IS NOT NULL AND availability_start IS NOT NULL AND availability_end IS NOT NULL
-        """)
+            SELECT * FROM events
+            WHERE guild_id = ? AND repeat_rule IS NOT NULL AND (repeat_until IS NULL OR repeat_until > ?)
+        """, (guild_id, after_utc))
+        series = [dict(row) for row in cursor.fetchall()]
+        for s in series:
+            skipped = {row[0] for row in conn.execute(
+                "SELECT occurrence_utc FROM event_skips WHERE series_id = ? AND occurrence_utc >= ?",
+                (s["id"], after_utc))}
+            slots = (t for t in recur.occurrences(s, after_utc, until_utc) if t not in skipped)
+            slots = list(itertools.islice(slots, count))
+            if not slots:
+                continue
+            existing = {row[0] for row in conn.execute(
+                "SELECT occurrence_utc FROM events WHERE series_id = ? AND occurrence_utc BETWEEN ? AND ?",
+                (s["id"], slots[0], slots[-1]))}
+            for t in slots:
+                if t not in existing:
+                    cursor = conn.execute("""
+                        INSERT INTO events (guild_id, title, datetime_utc, description, creator, series_id, occurrence_utc)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (guild_id, s["title"], t, s["description"], s["creator"], s["id"], t))
+                    created.append(cursor.lastrowid)
+        if created:
+            conn.commit()
+        return created
+
+def update_series(guild_id: int, series_id: int, repeat: dict, after_utc: int) -> list[int]:
+    """Change a series' rule for its occurrences after ``after_utc``; None ends it there.
+
+    Existing occurrences past that point that the new rule no longer produces
+    are deleted with their RSVPs; returns their IDs.
+    """
+    with get_connection() as conn:
+        if repeat is None:
+            conn.execute("""
+                UPDATE events SET repeat_until = MIN(COALESCE(repeat_until, ?), ?)
+                WHERE id = ? AND guild_id = ? AND repeat_rule IS NOT NULL
+            """, (after_utc + 1, after_utc + 1, series_id, guild_id))
+        else:
+            conn.execute("""
+                UPDATE events SET repeat_rule = ?, repeat_every = ?, repeat_days = ?, repeat_until = ?
+                WHERE id = ? AND guild_id = ? AND repeat_rule IS NOT NULL
+            """, (repeat["repeat_rule"], repeat["repeat_every"], repeat["repeat_days"], repeat["repeat_until"],
+                  series_id, guild_id))
+        row = conn.execute("SELECT * FROM events WHERE id = ? AND guild_id = ? AND repeat_rule IS NOT NULL",
+                           (series_id, guild_id)).fetchone()
+        series = dict(row) if row else None
+        later = conn.execute("SELECT id, occurrence_utc FROM events WHERE series_id = ? AND occurrence_utc > ?",
+                             (series_id, after_utc)).fetchall()
+        keep = set(recur.occurrences(series, after_utc + 1, max(row[1] for row in later) + 1)) if series and later else set()
+        dropped = [row[0] for row in later if row[1] not in keep]
+        conn.executemany("DELETE FROM events WHERE id = ?", [(event_id,) for event_id in dropped])
+        conn.executemany("DELETE FROM rsvps WHERE guild_id = ? AND event_id = ?",
+                         [(guild_id, event_id) for event_id in dropped])
+        conn.commit()
+        return dropped
+
+def get_all_player_availability(guild_id: int):
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT id, discord_id, player_name, timezone, availability_start, availability_end FROM players
+            WHERE guild_id = ? AND timezone IS NOT NULL
+              AND availability_start IS NOT NULL AND availability_end IS NOT NULL
+        """, (guild_id,))
         return [dict(row) for row in cursor.fetchall()]
 
-def get_reminder_minutes(event_id: int, player_name: str):
+def get_reminder_minutes(guild_id: int, event_id: int, player_id: int):
     with get_connection() as conn:
         cursor = conn.execute("""
             SELECT reminder_minutes FROM rsvps
-            WHERE event_id = ? AND player_name = ?
-        """, (event_id, player_name))
+            WHERE event_id = ? AND player_id = ? AND guild_id = ?
+        """, (event_id, player_id, guild_id))
         row = cursor.fetchone()
         return row["reminder_minutes"] if row and row["reminder_minutes"] else None
 
-def delete_event(event_id: int):
+def delete_event(guild_id: int, event_id: int):
     with get_connection() as conn:
-        conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
-        conn.execute("DELETE FROM rsvps WHERE event_id = ?", (event_id,))
+        row = conn.execute("DELETE FROM events WHERE id = ? AND guild_id = ? RETURNING series_id, occurrence_utc",
+                           (event_id, guild_id)).fetchone()
+        if row and row["series_id"] is not None:
+            # Keep expansion from recreating a deleted occurrence
+            conn.execute("INSERT OR IGNORE INTO event_skips (series_id, occurrence_utc) VALUES (?, ?)",
+                         (row["series_id"], row["occurrence_utc"]))
+        conn.execute("DELETE FROM rsvps WHERE guild_id = ? AND event_id = ?", (guild_id, event_id))
         conn.commit()
 
-def delete_expired_events(now_str: str) -> int:
+def delete_expired_events(guild_id: int, cutoff_utc: int) -> list[int]:
+    """Delete the guild's events that started before ``cutoff_utc``, and series that ended by then; returns their IDs."""
     with get_connection() as conn:
-        cursor = conn.execute("DELETE FROM events WHERE datetime_utc < ?", (now_str,))
-        deleted = cursor.rowcount
-        conn.execute("DELETE FROM rsvps WHERE event_id NOT IN (SELECT id FROM events)")
+        cursor = conn.execute(
+            "DELETE FROM events WHERE guild_id = ? AND datetime_utc < ? AND repeat_rule IS NULL RETURNING id",
+            (guild_id, cutoff_utc))
+        deleted = [row[0] for row in cursor.fetchall()]
+        # Expansion never looks back this far, so older skips are dead weight
+        conn.execute("""
+            DELETE FROM event_skips WHERE occurrence_utc < ?
+              AND series_id IN (SELECT id FROM events WHERE guild_id = ? AND repeat_rule IS NOT NULL)
+        """, (cutoff_utc, guild_id))
+        cursor = conn.execute(
+            "DELETE FROM events WHERE guild_id = ? AND repeat_rule IS NOT NULL AND repeat_until < ? RETURNING id",
+            (guild_id, cutoff_utc))
+        deleted += [row[0] for row in cursor.fetchall()]
+        conn.executemany("DELETE FROM rsvps WHERE guild_id = ? AND event_id = ?",
+                         [(guild_id, event_id) for event_id in deleted])
         conn.commit()
         return deleted
 
-def delete_offline_player(player_name: str):
+def track_message(guild_id: int, message_id: int, channel_id: int, kind: str, expires_utc: int):
+    """Remember a bot-sent message so cleanup can purge it once it expires."""
+    with get_connection() as conn:
+        # A merged outbox send can be tracked twice; keep the later expiry.
+        conn.execute("""
+            INSERT INTO bot_messages (guild_id, message_id, channel_id, kind, expires_utc)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(message_id) DO UPDATE SET expires_utc = MAX(expires_utc, excluded.expires_utc)
+        """, (guild_id, message_id, channel_id, kind, expires_utc))
+        conn.commit()
+
+def get_expired_messages(guild_id: int, now_utc: int, limit: int = 1000) -> list[dict]:
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT message_id, channel_id, kind FROM bot_messages
+            WHERE guild_id = ? AND expires_utc <= ?
+            ORDER BY expires_utc
+            LIMIT ?
+        """, (guild_id, now_utc, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_messages_by_kind(guild_id: int, kind: str) -> list[dict]:
+    with get_connection() as conn:
+        cursor = conn.execute(
+            "SELECT message_id, channel_id, kind FROM bot_messages WHERE guild_id = ? AND kind = ?",
+            (guild_id, kind))
+        return [dict(row) for row in cursor.fetchall()]
+
+def forget_messages(guild_id: int, message_ids: list[int]):
+    with get_connection() as conn:
+        conn.executemany("DELETE FROM bot_messages WHERE guild_id = ? AND message_id = ?",
+                         [(guild_id, i) for i in message_ids])
+        conn.commit()
+
+def set_notify_dm(guild_id: int, discord_id: int, player_name: str, enabled: bool):
+    with get_connection() as conn:
+        player_id = _player_id(conn, guild_id, discord_id, player_name)
+        conn.execute("UPDATE players SET notify_dm = ? WHERE id = ?", (int(enabled), player_id))
+        conn.commit()
+
+def get_notify_dm(guild_id: int, discord_id: int) -> bool:
+    with get_connection() as conn:
+        cursor = conn.execute("SELECT notify_dm FROM players WHERE guild_id = ? AND discord_id = ?",
+                              (guild_id, discord_id))
+        row = cursor.fetchone()
+        return bool(row and row["notify_dm"])
+
+def get_dm_subscribers(guild_id: int) -> list[dict]:
+    """Opted-in Discord players with a saved play window."""
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT discord_id, timezone, availability_start, availability_end FROM players
+            WHERE guild_id = ? AND notify_dm = 1 AND discord_id IS NOT NULL
+              AND timezone IS NOT NULL AND timezone != ''
+              AND availability_start IS NOT NULL AND availability_end IS NOT NULL
+        """, (guild_id,))
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_offline_players(guild_id: int) -> list[dict]:
+    """Players added by name for people not on Discord."""
     with get_connection() as conn:
-        conn.execute("DELETE FROM players WHERE player_name = ?", (player_name,))
+        cursor = conn.execute("""
+            SELECT id, player_name FROM players
+            WHERE guild_id = ? AND discord_id IS NULL
+            ORDER BY player_name
+        """, (guild_id,))
+        return [dict(row) for row in cursor.fetchall()]
+
+def delete_offline_player(guild_id: int, player_name: str) -> int:
+    """Delete an offline player and their RSVPs; returns the player ID (None if there was none)."""
+    with get_connection() as conn:
+        row = conn.execute(
+            "DELETE FROM players WHERE guild_id = ? AND player_name = ? AND discord_id IS NULL RETURNING id",
+            (guild_id, player_name)).fetchone()
+        if row:
+            conn.execute("DELETE FROM rsvps WHERE player_id = ?", (row["id"],))
         conn.commit()
+        return row["id"] if row else None
 
+def import_players(guild_id: int, rows: list[tuple]):
+    """Save ``(discord_id or None, player_name, timezone, start, end)`` rows in one transaction."""
+    with get_connection() as conn:
+        for discord_id, player_name, timezone, start, end in rows:
+            player_id = _player_id(conn, guild_id, discord_id, player_name)
+            conn.execute("""
+                UPDATE players SET timezone = ?, availability_start = ?, availability_end = ?
+                WHERE id = ?
+            """, (timezone, start, end, player_id))
+        conn.commit()
+
+def import_events(guild_id: int, rows: list[tuple]):
+    """Create ``(title, start_utc, description, repeat or None)`` events in one transaction."""
+    with get_connection() as conn:
+        for title, start_utc, desc, repeat in rows:
+            repeat = repeat or {}
+            conn.execute("""
+                INSERT INTO events (guild_id, title, datetime_utc, description, creator,
+                                    repeat_rule, repeat_every, repeat_days, repeat_until)
+                VALUES (?, ?, ?, ?, 'import', ?, ?, ?, ?)
+            """, (guild_id, title, start_utc, desc, repeat.get("repeat_rule"), repeat.get("repeat_every"),
+                  repeat.get("repeat_days"), repeat.get("repeat_until")))
+        conn.commit()
+
+def get_players_page(guild_id: int, after_id: int, limit: int) -> list[dict]:
+    """Keyset page of the guild's players by ID, for export."""
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT id, discord_id, player_name, timezone, availability_start, availability_end FROM players
+            WHERE guild_id = ? AND id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (guild_id, after_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_events_page(guild_id: int, after_id: int, limit: int) -> list[dict]:
+    """Keyset page of one-off events and recurring series by ID (occurrences are left out), for export."""
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT * FROM events
+            WHERE guild_id = ? AND id > ? AND series_id IS NULL
+            ORDER BY id
+            LIMIT ?
+        """, (guild_id, after_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_rsvps_page(guild_id: int, after_id: int, limit: int) -> list[dict]:
+    """Keyset page of RSVPs by ID with their event and player, for export."""
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT r.id, r.event_id, e.title, e.datetime_utc, p.player_name, p.discord_id,
+                   r.response, r.reminder_minutes
+            FROM rsvps r
+            JOIN events e ON e.id = r.event_id
+            JOIN players p ON p.id = r.player_id
+            WHERE r.guild_id = ? AND r.id > ?
+            ORDER BY r.id
+            LIMIT ?
+        """, (guild_id, after_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_guild_config(guild_id: int) -> dict:
+    with get_connection() as conn:
+        cursor = conn.execute("SELECT * FROM guild_config WHERE guild_id = ?", (guild_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else {}
+
+def set_guild_config(guild_id: int, admin_role_id: int = None, reminder_channel_id: int = None):
+    """Upsert a guild's settings; None leaves a setting unchanged."""
+    with get_connection() as conn:
+        conn.execute("""
+            INSERT INTO guild_config (guild_id, admin_role_id, reminder_channel_id)
+            VALUES (?, ?, ?)
+            ON CONFLICT(guild_id) DO UPDATE SET
+              admin_role_id = COALESCE(excluded.admin_role_id, admin_role_id),
+              reminder_channel_id = COALESCE(excluded.reminder_channel_id, reminder_channel_id)
+        """, (guild_id, admin_role_id, reminder_channel_id))
+        conn.commit()
+
+def adopt_legacy_rows(guild_id: int) -> int:
+    """Move rows written before guilds existed (guild_id 0) into ``guild_id``; returns events moved."""
+    with get_connection() as conn:
+        moved = conn.execute("UPDATE events SET guild_id = ? WHERE guild_id = 0", (guild_id,)).rowcount
+        conn.execute("UPDATE rsvps SET guild_id = ? WHERE guild_id = 0", (guild_id,))
+        conn.execute("UPDATE bot_messages SET guild_id = ? WHERE guild_id = 0", (guild_id,))
+        # A player who already re-registered in the guild keeps the newer row
+        conn.execute("UPDATE OR IGNORE players SET guild_id = ? WHERE guild_id = 0", (guild_id,))
+        conn.execute("DELETE FROM rsvps WHERE player_id IN (SELECT id FROM players WHERE guild_id = 0)")
+        conn.execute("DELETE FROM players WHERE guild_id = 0")
+        conn.commit()
+        return moved
@@ -0,0 +1,135 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict
+from utils import err, metrics
+
+# Upper bound on a single sleep so wall-clock jumps (NTP, suspend) are noticed.
+MAX_SLEEP_SECONDS = 60
+
+class DeadlineQueue:
+    """Fire callbacks at absolute UTC epoch times.
+
+    Entries sit in a min-heap ordered by fire time; a dict keyed by entry key
+    makes cancel/replace O(1) by marking the heap node stale instead of
+    removing it. A single task sleeps until the earliest live deadline and
+    starts each due callback as its own task, so a slow callback never holds
+    back the deadlines after it.
+    Every entry also belongs to a group (the event ID for reminders) so all
+    of an event's deadlines can be listed or dropped at once.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("nova")
+        self._heap = []
+        self._entries = {}
+        self._groups = defaultdict(set)
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._task = None
+        self._running = set()  # fired callbacks; the event loop only keeps weak references to tasks
+
+    def __len__(self):
+        return len(self._entries)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def schedule(self, key, fire_at: float, callback, group=None):
+        """Run ``await callback()`` at ``fire_at``; replaces any entry with the same key."""
+        self.cancel(key)
+        seq = next(self._seq)
+        self._entries[key] = (fire_at, seq, callback, group)
+        self._groups[group].add(key)
+        heapq.heappush(self._heap, (fire_at, seq, key))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+        if self._heap[0][1] == seq:
+            self._wake.set()
+
+    def get(self, key):
+        """Fire time of a live entry, or None."""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def keys(self, group) -> set:
+        return set(self._groups.get(group, ()))
+
+    def reschedule(self, key, fire_at: float) -> bool:
+        """Move a live entry to ``fire_at``, keeping its callback and group."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        _, _, callback, group = entry
+        self.schedule(key, fire_at, callback, group)
+        return True
+
+    def cancel(self, key) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._discard_from_group(entry[3], key)
+        return True
+
+    def cancel_group(self, group) -> int:
+        keys = self._groups.pop(group, set())
+        for key in keys:
+            self._entries.pop(key, None)
+        return len(keys)
+
+    def _compact(self):
+        """Drop stale heap nodes left behind by cancel/replace."""
+        self._heap = [(fire_at, seq, key) for key, (fire_at, seq, _, _) in self._entries.items()]
+        heapq.heapify(self._heap)
+
+    def _discard_from_group(self, group, key):
+        keys = self._groups.get(group)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._groups[group]
+
+    def _pop_due(self, now: float) -> list:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, seq, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != seq:
+                continue  # cancelled or replaced
+            del self._entries[key]
+            self._discard_from_group(entry[3], key)
+            due.append((key, fire_at, entry[2]))
+        return due
+
+    async def _fire(self, key, callback):
+        try:
+            await callback()
+        except Exception as e:
+            err.log_error(f"deadline.{key}", e, include_trace=True)
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            for key, fire_at, callback in self._pop_due(time.time()):
+                late = time.time() - fire_at
+                metrics.set_gauge("nova_deadline_lag_seconds", late)
+                self.logger.debug("[Deadline] Firing %s (%.1fs late)", key, late)
+                task = asyncio.create_task(self._fire(key, callback))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            timeout = MAX_SLEEP_SECONDS
+            if self._heap:
+                timeout = min(timeout, max(0.0, self._heap[0][0] - time.time()))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
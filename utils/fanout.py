@@ -0,0 +1,142 @@
+"""Direct-message fan-out announcing a new event.
+
+Players opt in with /novabot_dms. When an event is created, every opted-in
+player whose play window covers its start time gets a DM. This does not go
+through the outbox: the outbox paces per channel and every DM is its own
+channel, so 2,000 recipients would be 2,000 lanes all sending at once.
+Instead each fan-out is a queue drained by CONCURRENCY workers, and all
+fan-outs share one RATE_PER_SECOND pace, leaving most of Discord's global
+rate limit to interactions and reminders.
+
+py-cord waits out most 429s itself; one it gives up on (or a 5xx) is
+retried here with exponential backoff, at least Retry-After. Closed DMs
+(403) and unknown users (404) fail without a retry. Progress is logged
+every PROGRESS_EVERY recipients with a summary at the end, and with
+metrics on ``nova_fanout_dms_total{result}`` counts sent and failed DMs.
+"""
+import asyncio
+import logging
+import random
+import discord
+from utils import adb, avail, err, metrics
+
+CONCURRENCY = 8
+RATE_PER_SECOND = 10
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 2
+PROGRESS_EVERY = 250
+
+logger = logging.getLogger("nova")
+
+_jobs = set()  # running fan-outs; the event loop only keeps weak references to tasks
+_next_slot = 0.0
+
+def start(bot, guild: discord.Guild, title: str, start_utc: int) -> asyncio.Task:
+    """Begin DMing the guild's available subscribers about a new event; returns at once.
+
+    The task's result is the job's counts (total, sent, failed, retried).
+    """
+    task = asyncio.create_task(_fan_out(bot, guild.id, guild.name, title, start_utc))
+    _jobs.add(task)
+    task.add_done_callback(_jobs.discard)
+    return task
+
+async def _fan_out(bot, guild_id: int, guild_name: str, title: str, start_utc: int) -> dict:
+    try:
+        subscribers = await adb.get_dm_subscribers(guild_id)
+        recipients = [s["discord_id"] for s in subscribers if _available(s, start_utc)]
+        if not recipients:
+            return {"total": 0, "sent": 0, "failed": 0, "retried": 0}
+        content = (
+            f"📅 **New event in {guild_name}: {title}**\n"
+            f"🕒 <t:{start_utc}:F> (<t:{start_utc}:R>), inside your usual play window.\n"
+            "RSVP with `/novabot` in the server. Turn these DMs off with `/novabot_dms`."
+        )
+        return await _Job(bot, guild_id, content, recipients).run()
+    except Exception as e:
+        err.log_error("fanout", e, include_trace=True)
+
+def _available(subscriber: dict, start_utc: int) -> bool:
+    try:
+        return avail.covers(subscriber["timezone"], subscriber["availability_start"],
+                            subscriber["availability_end"], start_utc)
+    except ValueError:
+        return False  # unparseable saved window
+
+async def _pace():
+    """Wait for the next send slot shared by every fan-out."""
+    global _next_slot
+    now = asyncio.get_running_loop().time()
+    slot = max(now, _next_slot)
+    _next_slot = slot + 1 / RATE_PER_SECOND
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
+def _backoff(e: discord.HTTPException, attempt: int) -> float:
+    try:
+        retry_after = float(e.response.headers["Retry-After"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        retry_after = 0
+    return max(retry_after, BACKOFF_SECONDS * 2 ** attempt) * random.uniform(1, 1.25)
+
+class _Job:
+    def __init__(self, bot, guild_id: int, content: str, recipients: list[int]):
+        self.bot = bot
+        self.guild_id = guild_id
+        self.content = content
+        self.total = len(recipients)
+        self.sent = self.failed = self.retried = 0
+        self.queue = asyncio.Queue()
+        for discord_id in recipients:
+            self.queue.put_nowait(discord_id)
+
+    async def run(self) -> dict:
+        logger.info(f"📨 DMing {self.total} players about a new event in guild {self.guild_id}")
+        workers = [asyncio.create_task(self._worker()) for _ in range(min(CONCURRENCY, self.total))]
+        try:
+            await self.queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        logger.info(f"📨 Event DMs for guild {self.guild_id} done: {self.sent} sent, "
+                    f"{self.failed} failed, {self.retried} retries")
+        return {"total": self.total, "sent": self.sent, "failed": self.failed, "retried": self.retried}
+
+    async def _worker(self):
+        while True:
+            discord_id = await self.queue.get()
+            try:
+                self._record(await self._deliver(discord_id))
+            except Exception as e:
+                err.log_error("fanout.deliver", e)
+                self._record(False)
+            finally:
+                self.queue.task_done()
+
+    async def _deliver(self, discord_id: int) -> bool:
+        for attempt in range(MAX_ATTEMPTS):
+            await _pace()
+            try:
+                user = self.bot.get_user(discord_id) or await self.bot.fetch_user(discord_id)
+                await user.send(self.content)
+                return True
+            except (discord.Forbidden, discord.NotFound):
+                return False  # DMs closed or account gone; retrying won't help
+            except discord.HTTPException as e:
+                if (e.status != 429 and e.status < 500) or attempt == MAX_ATTEMPTS - 1:
+                    logger.debug("[fanout] DM to %s failed: %s", discord_id, e.status)
+                    return False
+                self.retried += 1
+                await asyncio.sleep(_backoff(e, attempt))
+        return False
+
+    def _record(self, ok: bool):
+        if ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+        metrics.inc("nova_fanout_dms_total", result="sent" if ok else "failed")
+        done = self.sent + self.failed
+        if done % PROGRESS_EVERY == 0 and done < self.total:
+            logger.info(f"📨 Event DMs for guild {self.guild_id}: {done}/{self.total} ({self.failed} failed)")
@@ -0,0 +1,37 @@
+"""Per-guild settings: the R4 role and the reminder/announcement channel.
+
+Rows live in the guild_config table and are cached for the life of the
+process, since every permission check and reminder reads them. A guild
+with no row (or an unset column) falls back to EXAMPLE_ROLE_ID and
+REMINDER_CHANNEL_ID from the environment, so single-guild setups keep
+working unchanged.
+"""
+import os
+from utils import adb
+
+_cache = {}  # guild_id → {"admin_role_id": int, "reminder_channel_id": int}
+
+async def config(guild_id: int) -> dict:
+    settings = _cache.get(guild_id)
+    if settings is None:
+        row = await adb.get_guild_config(guild_id)
+        settings = _cache[guild_id] = {
+            "admin_role_id": row.get("admin_role_id") or int(os.getenv("EXAMPLE_ROLE_ID", 0)),
+            "reminder_channel_id": row.get("reminder_channel_id") or int(os.getenv("REMINDER_CHANNEL_ID", 0)),
+        }
+    return settings
+
+async def update(guild_id: int, admin_role_id: int = None, reminder_channel_id: int = None):
+    """Store new settings for a guild; None leaves a setting as it was."""
+    await adb.set_guild_config(guild_id, admin_role_id, reminder_channel_id)
+    _cache.pop(guild_id, None)
+
+def forget(guild_id: int):
+    _cache.pop(guild_id, None)
+
+async def reminder_channel(bot, guild_id: int):
+    """The guild's reminder channel, or None if unset or not a channel of that guild."""
+    channel = bot.get_channel((await config(guild_id))["reminder_channel_id"])
+    if channel is None or getattr(channel, "guild", None) is None or channel.guild.id != guild_id:
+        return None
+    return channel
@@ -0,0 +1,105 @@
+"""Logging pipeline: callers enqueue, a background thread writes.
+
+Every logger call on the event loop only puts the record on an in-process
+queue; a ``QueueListener`` thread formats it and does the file I/O.
+``logs/bot.log`` rolls over once it passes ``LOG_MAX_BYTES`` or is a day
+old, rolled files are gzipped on that same thread, and only the newest
+``LOG_BACKUPS`` are kept.
+"""
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import time
+
+LOG_DIR = "logs"
+LOG_PATH = os.path.join(LOG_DIR, "bot.log")
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_ROTATE_SECONDS = 24 * 60 * 60
+LOG_BACKUPS = 10
+
+_listener = None
+
+class CompressingRotatingHandler(logging.handlers.RotatingFileHandler):
+    """Size- and age-based rotation into ``<file>.<UTC stamp>.gz`` archives."""
+
+    def __init__(self, filename: str, max_bytes: int = LOG_MAX_BYTES,
+                 interval: int = LOG_ROTATE_SECONDS, backups: int = LOG_BACKUPS):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+        self.interval = interval
+        # A log left over from the last run ages from its last write, not from now
+        started = os.path.getmtime(filename) if os.path.exists(filename) else time.time()
+        self.rollover_at = started + interval
+
+    def shouldRollover(self, record) -> bool:
+        if time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            self._compress(self._archive_name())
+            self._prune()
+        self.rollover_at = time.time() + self.interval
+        if not self.delay:
+            self.stream = self._open()
+
+    def _archive_name(self) -> str:
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+        target, n = f"{self.baseFilename}.{stamp}.gz", 1
+        while os.path.exists(target):
+            target, n = f"{self.baseFilename}.{stamp}-{n}.gz", n + 1
+        return target
+
+    def _compress(self, target: str):
+        with open(self.baseFilename, "rb") as src, gzip.open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(self.baseFilename)
+
+    def _prune(self):
+        folder, base = os.path.split(self.baseFilename)
+        archives = [
+            os.path.join(folder, name) for name in os.listdir(folder or ".")
+            if name.startswith(base + ".") and name.endswith(".gz")
+        ]
+        archives.sort(key=os.path.getmtime)
+        for path in archives[:max(0, len(archives) - self.backupCount)]:
+            os.remove(path)
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # The queue never leaves this process, so skip the pickling-oriented
+        # formatting in QueueHandler.prepare and let the listener thread do it.
+        return record
+
+def setup(level="INFO", path: str = LOG_PATH) -> logging.Logger:
+    """Route all logging through the background listener; returns the "nova" logger."""
+    global _listener
+    if _listener is not None:
+        return logging.getLogger("nova")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    handler = CompressingRotatingHandler(path)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_LocalQueueHandler(records))
+    return logging.getLogger("nova")
+
+def shutdown():
+    """Flush queued records to disk and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    logging.shutdown()
@@ -0,0 +1,156 @@
+"""Latency histograms, gauges and counters, served in Prometheus text format.
+
+Off unless ``enable()`` is called (bot.py does so when METRICS_PORT is
+set); until then every ``timed`` wrapper costs one flag check per call.
+When on, ``serve`` exposes everything at ``http://127.0.0.1:<port>/metrics``.
+
+Metrics:
+    nova_interaction_seconds{callback}   button/modal callback latency
+    nova_db_query_seconds{query}         utils.db function time on its pool thread
+    nova_deadline_lag_seconds            how late the last reminder deadline fired
+    nova_outbox_depth{priority}          queued outbound jobs (collected at scrape time)
+    nova_fanout_dms_total{result}        new-event DMs sent / failed since start
+"""
+import asyncio
+import bisect
+import functools
+import logging
+import threading
+import time
+from utils import err
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HELP = {
+    "nova_interaction_seconds": "Button and modal callback latency.",
+    "nova_db_query_seconds": "Time spent in utils.db functions on the DB threads.",
+    "nova_deadline_lag_seconds": "Seconds between a reminder deadline and when it fired.",
+    "nova_outbox_depth": "Outbound jobs waiting in the outbox, per priority.",
+    "nova_fanout_dms_total": "New-event DMs sent and failed since start.",
+}
+
+enabled = False
+_histograms = {}
+_gauges = {}
+_counters = {}
+_collectors = []
+_lock = threading.Lock()  # DB timings arrive from the pool threads
+_server = None
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+def enable():
+    global enabled
+    enabled = True
+
+def observe(metric: str, label: str, value: str, seconds: float):
+    with _lock:
+        histogram = _histograms.get((metric, label, value))
+        if histogram is None:
+            histogram = _histograms[(metric, label, value)] = _Histogram()
+        histogram.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        histogram.sum += seconds
+        histogram.count += 1
+
+def set_gauge(metric: str, value: float, **labels):
+    if enabled:
+        _gauges[(metric, tuple(sorted(labels.items())))] = value
+
+def inc(metric: str, amount: float = 1, **labels):
+    """Add ``amount`` to a counter (name it ``*_total``)."""
+    if enabled:
+        key = (metric, tuple(sorted(labels.items())))
+        with _lock:
+            _counters[key] = _counters.get(key, 0) + amount
+
+def add_collector(fn):
+    """Run ``fn()`` before each scrape, typically to refresh gauges."""
+    _collectors.append(fn)
+
+def timed(metric: str, label: str, value: str):
+    """Record each call's duration in ``metric{label="value"}``; works on sync and async functions."""
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                if not enabled:
+                    return await fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    observe(metric, label, value, time.perf_counter() - start)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    observe(metric, label, value, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def callback(fn):
+    """``timed`` for a UI callback, labelled with its class name (``RSVPButton``, ``SetTimeModal``...)."""
+    owner = fn.__qualname__.rsplit(".", 1)[0]
+    return timed("nova_interaction_seconds", "callback", owner)(fn)
+
+def render() -> str:
+    for collect in list(_collectors):
+        try:
+            collect()
+        except Exception as e:
+            err.log_error("metrics.collect", e)
+
+    lines, seen = [], set()
+    def header(metric: str, kind: str):
+        if metric not in seen:
+            seen.add(metric)
+            lines.append(f"# HELP {metric} {HELP.get(metric, metric)}")
+            lines.append(f"# TYPE {metric} {kind}")
+
+    with _lock:
+        histograms = sorted((key, list(h.counts), h.sum, h.count) for key, h in _histograms.items())
+    for (metric, label, value), counts, total, count in histograms:
+        header(metric, "histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(f'{metric}_bucket{{{label}="{value}",le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{label}="{value}",le="+Inf"}} {count}')
+        lines.append(f'{metric}_sum{{{label}="{value}"}} {total:.6f}')
+        lines.append(f'{metric}_count{{{label}="{value}"}} {count}')
+
+    with _lock:
+        counters = sorted(_counters.items())
+    for kind, samples in (("gauge", sorted(_gauges.items())), ("counter", counters)):
+        for (metric, labels), value in samples:
+            header(metric, kind)
+            tags = ",".join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{metric}{{{tags}}} {value}" if tags else f"{metric} {value}")
+    return "\n".join(lines) + "\n"
+
+async def serve(port: int, host: str = "127.0.0.1"):
+    """Start the /metrics endpoint on the running loop (once per process)."""
+    global _server
+    if _server is not None:
+        return
+    from aiohttp import web  # installed with py-cord; only needed when metrics are on
+
+    async def handle(request):
+        return web.Response(text=render(), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    _server = web.AppRunner(app, access_log=None)
+    await _server.setup()
+    await web.TCPSite(_server, host, port).start()
+    logging.getLogger("nova").info(f"📈 Metrics at http://{host}:{port}/metrics")
@@ -0,0 +1,251 @@
+"""Versioned schema migrations, tracked with SQLite's PRAGMA user_version.
+
+Each migration is a SQL script applied inside its own transaction together
+with the version bump, so a failed upgrade leaves the database untouched.
+Append new migrations to the end of MIGRATIONS; never edit shipped ones.
+"""
+import logging
+import sqlite3
+
+logger = logging.getLogger("nova")
+
+# 1: the original schema (a no-op on databases created before migrations existed)
+V1_BASELINE = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    datetime_utc TEXT NOT NULL,
+    creator TEXT
+);
+
+CREATE TABLE IF NOT EXISTS rsvps (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    player_name TEXT NOT NULL,
+    discord_id TEXT,
+    response TEXT CHECK(response IN ('yes', 'no')),
+    reminder_minutes INTEGER DEFAULT NULL,
+    UNIQUE(event_id, player_name),
+    FOREIGN KEY (event_id) REFERENCES events(id)
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_name TEXT NOT NULL UNIQUE,
+    timezone TEXT NOT NULL,
+    availability_start TEXT,
+    availability_end TEXT
+);
+"""
+
+# 2: events.datetime_utc becomes integer UTC epoch seconds, plus lookup indexes.
+# Rows whose text timestamp cannot be parsed are dropped along with their RSVPs.
+V2_EPOCH_AND_INDEXES = """
+CREATE TABLE events_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    datetime_utc INTEGER NOT NULL,
+    creator TEXT
+);
+
+INSERT INTO events_new (id, title, description, datetime_utc, creator)
+SELECT id, title, description, CAST(strftime('%s', datetime_utc) AS INTEGER), creator
+FROM events
+WHERE strftime('%s', datetime_utc) IS NOT NULL;
+
+DROP TABLE events;
+ALTER TABLE events_new RENAME TO events;
+DELETE FROM rsvps WHERE event_id NOT IN (SELECT id FROM events);
+
+CREATE INDEX idx_events_datetime ON events(datetime_utc);
+CREATE INDEX idx_rsvps_event_response ON rsvps(event_id, response);
+CREATE INDEX idx_rsvps_discord ON rsvps(discord_id);
+"""
+
+# 3: registry of bot-sent dashboard/announcement messages and when to purge them
+V3_MESSAGE_REGISTRY = """
+CREATE TABLE bot_messages (
+    message_id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    expires_utc INTEGER NOT NULL
+);
+
+CREATE INDEX idx_bot_messages_expires ON bot_messages(expires_utc);
+"""
+
+# 4: multi-guild. Every table is partitioned by guild_id (0 = rows from before
+# guilds existed; startup hands them to the bot's guild when it is in only one),
+# players become unique per guild, and per-guild settings live in guild_config.
+V4_GUILDS = """
+ALTER TABLE events ADD COLUMN guild_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE rsvps ADD COLUMN guild_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE bot_messages ADD COLUMN guild_id INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE players_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    player_name TEXT NOT NULL,
+    timezone TEXT NOT NULL,
+    availability_start TEXT,
+    availability_end TEXT,
+    UNIQUE(guild_id, player_name)
+);
+INSERT INTO players_new (id, player_name, timezone, availability_start, availability_end)
+SELECT id, player_name, timezone, availability_start, availability_end FROM players;
+DROP TABLE players;
+ALTER TABLE players_new RENAME TO players;
+
+CREATE TABLE guild_config (
+    guild_id INTEGER PRIMARY KEY,
+    admin_role_id INTEGER,
+    reminder_channel_id INTEGER
+);
+
+DROP INDEX idx_events_datetime;
+CREATE INDEX idx_events_guild_datetime ON events(guild_id, datetime_utc, id);
+DROP INDEX idx_rsvps_event_response;
+CREATE INDEX idx_rsvps_guild_event_response ON rsvps(guild_id, event_id, response);
+DROP INDEX idx_bot_messages_expires;
+CREATE INDEX idx_bot_messages_guild_expires ON bot_messages(guild_id, expires_utc);
+CREATE INDEX idx_bot_messages_guild_kind ON bot_messages(guild_id, kind);
+"""
+
+# 5: players are identified by Discord ID (NULL for offline players, who stay
+# unique by name) and RSVPs point at them by integer player_id. A players row
+# takes the Discord ID last RSVP'd under its name; Discord users who only ever
+# RSVP'd get a row with no timezone yet. When several old names map to one
+# player, the most recent RSVP per event wins.
+V5_PLAYER_IDS = """
+CREATE TABLE players_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    discord_id INTEGER,
+    player_name TEXT NOT NULL,
+    timezone TEXT,
+    availability_start TEXT,
+    availability_end TEXT
+);
+
+INSERT INTO players_new (id, guild_id, discord_id, player_name, timezone, availability_start, availability_end)
+SELECT p.id, p.guild_id,
+       (SELECT CAST(r.discord_id AS INTEGER) FROM rsvps r
+        WHERE r.guild_id = p.guild_id AND r.player_name = p.player_name AND r.discord_id <> ''
+        ORDER BY r.id DESC LIMIT 1),
+       p.player_name, p.timezone, p.availability_start, p.availability_end
+FROM players p;
+
+DELETE FROM players_new
+WHERE discord_id IS NOT NULL
+  AND id NOT IN (SELECT MAX(id) FROM players_new WHERE discord_id IS NOT NULL GROUP BY guild_id, discord_id);
+
+INSERT INTO players_new (guild_id, discord_id, player_name)
+SELECT r.guild_id, CAST(r.discord_id AS INTEGER), r.player_name
+FROM rsvps r
+WHERE r.id IN (SELECT MAX(id) FROM rsvps WHERE discord_id <> '' GROUP BY guild_id, CAST(discord_id AS INTEGER))
+  AND NOT EXISTS (SELECT 1 FROM players_new p
+                  WHERE p.guild_id = r.guild_id AND p.discord_id = CAST(r.discord_id AS INTEGER));
+
+INSERT INTO players_new (guild_id, player_name)
+SELECT DISTINCT r.guild_id, r.player_name
+FROM rsvps r
+WHERE (r.discord_id IS NULL OR r.discord_id = '')
+  AND NOT EXISTS (SELECT 1 FROM players_new p
+                  WHERE p.guild_id = r.guild_id AND p.player_name = r.player_name AND p.discord_id IS NULL);
+
+CREATE TABLE rsvps_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    event_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    response TEXT CHECK(response IN ('yes', 'no')),
+    reminder_minutes INTEGER DEFAULT NULL,
+    UNIQUE(event_id, player_id),
+    FOREIGN KEY (event_id) REFERENCES events(id),
+    FOREIGN KEY (player_id) REFERENCES players(id)
+);
+
+INSERT OR IGNORE INTO rsvps_new (id, guild_id, event_id, player_id, response, reminder_minutes)
+SELECT id, guild_id, event_id, player_id, response, reminder_minutes FROM (
+    SELECT r.id, r.guild_id, r.event_id, r.response, r.reminder_minutes,
+           COALESCE(
+               (SELECT p.id FROM players_new p
+                WHERE p.guild_id = r.guild_id AND p.discord_id = CAST(r.discord_id AS INTEGER)
+                  AND r.discord_id <> ''),
+               (SELECT p.id FROM players_new p
+                WHERE p.guild_id = r.guild_id AND p.player_name = r.player_name AND p.discord_id IS NULL)
+           ) AS player_id
+    FROM rsvps r
+)
+WHERE player_id IS NOT NULL
+ORDER BY id DESC;
+
+DROP TABLE rsvps;
+DROP TABLE players;
+ALTER TABLE players_new RENAME TO players;
+ALTER TABLE rsvps_new RENAME TO rsvps;
+
+CREATE UNIQUE INDEX idx_players_guild_discord ON players(guild_id, discord_id);
+CREATE UNIQUE INDEX idx_players_guild_offline_name ON players(guild_id, player_name) WHERE discord_id IS NULL;
+CREATE INDEX idx_rsvps_guild_event_response ON rsvps(guild_id, event_id, response);
+CREATE INDEX idx_rsvps_player ON rsvps(player_id);
+"""
+
+# v6: players opt in to new-event DMs; the partial index holds only those who did
+V6_EVENT_DMS = """
+ALTER TABLE players ADD COLUMN notify_dm INTEGER NOT NULL DEFAULT 0;
+CREATE INDEX idx_players_guild_notify ON players(guild_id) WHERE notify_dm = 1;
+"""
+
+# v7: recurring events. A series row carries the repeat_* rule; its occurrences
+# become ordinary rows (series_id, occurrence_utc = the slot they fill) only
+# once something looks at their time window. Deleted occurrences leave a skip.
+V7_RECURRING = """
+ALTER TABLE events ADD COLUMN repeat_rule TEXT;
+ALTER TABLE events ADD COLUMN repeat_every INTEGER;
+ALTER TABLE events ADD COLUMN repeat_days INTEGER;
+ALTER TABLE events ADD COLUMN repeat_until INTEGER;
+ALTER TABLE events ADD COLUMN series_id INTEGER;
+ALTER TABLE events ADD COLUMN occurrence_utc INTEGER;
+
+CREATE INDEX idx_events_guild_series ON events(guild_id) WHERE repeat_rule IS NOT NULL;
+CREATE UNIQUE INDEX idx_events_series_occurrence ON events(series_id, occurrence_utc) WHERE series_id IS NOT NULL;
+
+CREATE TABLE event_skips (
+    series_id INTEGER NOT NULL,
+    occurrence_utc INTEGER NOT NULL,
+    PRIMARY KEY (series_id, occurrence_utc)
+) WITHOUT ROWID;
+"""
+
+MIGRATIONS = [
+    (1, V1_BASELINE),
+    (2, V2_EPOCH_AND_INDEXES),
+    (3, V3_MESSAGE_REGISTRY),
+    (4, V4_GUILDS),
+    (5, V5_PLAYER_IDS),
+    (6, V6_EVENT_DMS),
+    (7, V7_RECURRING),
+]
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def run(conn: sqlite3.Connection) -> int:
+    """Apply every pending migration in order and return the resulting version."""
+    version = current_version(conn)
+    for target, script in MIGRATIONS:
+        if target <= version:
+            continue
+        try:
+            conn.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {target};\nCOMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"❌ Migration to schema v{target} failed; database left at v{version}")
+            raise
+        logger.info(f"🗃️ Migrated database schema v{version} → v{target}")
+        version = target
+    return version
@@ -0,0 +1,192 @@
+"""Shared outbound queue for channel sends and deletes.
+
+Every cog and modal hands its channel traffic to ``bot.outbox`` instead of
+calling ``channel.send`` / ``msg.delete`` inline. Jobs are dispatched by
+priority class (reminders, then announcements, then cleanup), each channel
+route has its own token bucket so we stay under Discord's per-channel limit
+instead of tripping 429s, and consecutive plain sends to the same channel
+are merged into one message while they wait.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from utils import err
+
+REMINDER = 0
+ANNOUNCEMENT = 1
+CLEANUP = 2
+PRIORITY_NAMES = {REMINDER: "reminder", ANNOUNCEMENT: "announcement", CLEANUP: "cleanup"}
+
+MESSAGE_LIMIT = 2000
+BULK_DELETE_LIMIT = 100
+# Discord allows about 5 message operations per 5 seconds on a channel route
+CHANNEL_BUDGET = 5
+CHANNEL_WINDOW_SECONDS = 5.0
+WAIT_SAMPLES = 256
+SLOW_WAIT_SECONDS = 10.0
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, now: float):
+        self.tokens = float(CHANNEL_BUDGET)
+        self.updated = now
+
+    def ready_in(self, now: float) -> float:
+        self.tokens = min(CHANNEL_BUDGET, self.tokens + (now - self.updated) * CHANNEL_BUDGET / CHANNEL_WINDOW_SECONDS)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * CHANNEL_WINDOW_SECONDS / CHANNEL_BUDGET
+
+class _Job:
+    __slots__ = ("kind", "target", "content", "kwargs", "futures", "enqueued")
+
+    def __init__(self, kind, target, content=None, kwargs=None):
+        self.kind = kind
+        self.target = target
+        self.content = content
+        self.kwargs = kwargs or {}
+        self.futures = []
+        self.enqueued = time.monotonic()
+
+class Outbox:
+    def __init__(self):
+        self.logger = logging.getLogger("nova")
+        # One lane per (route, channel) and priority; lanes are served round-robin
+        self._lanes = {p: OrderedDict() for p in PRIORITY_NAMES}
+        self._buckets = {}
+        self._inflight = set()
+        self._running = set()  # the event loop only keeps weak references to tasks
+        self._waits = {p: deque(maxlen=WAIT_SAMPLES) for p in PRIORITY_NAMES}
+        self._wake = None
+        self._task = None
+
+    # --- Public API ---
+
+    def send(self, channel, content: str, priority: int = ANNOUNCEMENT, **kwargs) -> asyncio.Future:
+        """Queue ``channel.send``; await the result for the sent Message."""
+        key = ("send", channel.id)
+        lane = self._lanes[priority].get(key)
+        if lane and not kwargs:
+            last = lane[-1]
+            if not last.kwargs and len(last.content) + 1 + len(content) <= MESSAGE_LIMIT:
+                last.content = f"{last.content}\n{content}"
+                return self._attach(last)
+        return self._enqueue(priority, key, _Job("send", channel, content, kwargs))
+
+    def delete(self, message, priority: int = CLEANUP) -> asyncio.Future:
+        """Queue ``message.delete()``."""
+        return self._enqueue(priority, ("delete", message.channel.id), _Job("delete", message))
+
+    def purge(self, channel, messages: list, priority: int = CLEANUP) -> list[asyncio.Future]:
+        """Queue bulk deletes (``channel.delete_messages``), up to 100 messages per call.
+
+        Discord only bulk-deletes messages younger than 14 days; callers
+        send older ones through ``delete`` instead.
+        """
+        key = ("delete", channel.id)
+        return [
+            self._enqueue(priority, key, _Job("purge", channel, messages[i:i + BULK_DELETE_LIMIT]))
+            for i in range(0, len(messages), BULK_DELETE_LIMIT)
+        ]
+
+    def depth(self, priority: int = None) -> int:
+        """Number of queued (not yet dispatched) jobs, optionally for one priority."""
+        priorities = PRIORITY_NAMES if priority is None else [priority]
+        return sum(len(lane) for p in priorities for lane in self._lanes[p].values())
+
+    def wait_stats(self) -> dict:
+        """Recent queue wait times in seconds, per priority class."""
+        stats = {}
+        for priority, name in PRIORITY_NAMES.items():
+            samples = self._waits[priority]
+            stats[name] = {
+                "depth": self.depth(priority),
+                "avg": sum(samples) / len(samples) if samples else 0.0,
+                "max": max(samples, default=0.0),
+            }
+        return stats
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # --- Internals ---
+
+    def _attach(self, job: _Job) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        # Fire-and-forget callers never await; errors are logged by the worker instead.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        job.futures.append(future)
+        return future
+
+    def _enqueue(self, priority: int, key, job: _Job) -> asyncio.Future:
+        future = self._attach(job)
+        self._lanes[priority].setdefault(key, deque()).append(job)
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        self._wake.set()
+        return future
+
+    def _dispatch_ready(self):
+        """Start every job whose route has budget; return seconds until the next one could."""
+        now = time.monotonic()
+        soonest = None
+        for priority, lanes in self._lanes.items():
+            for key in list(lanes):
+                if key in self._inflight:
+                    continue
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = _Bucket(now)
+                wait = bucket.ready_in(now)
+                if wait > 0:
+                    soonest = wait if soonest is None else min(soonest, wait)
+                    continue
+                lane = lanes.pop(key)
+                job = lane.popleft()
+                if lane:
+                    lanes[key] = lane  # re-append so other channels get a turn
+                bucket.tokens -= 1
+                self._inflight.add(key)
+                task = asyncio.create_task(self._perform(priority, key, job, now))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+        return soonest
+
+    async def _perform(self, priority: int, key, job: _Job, started: float):
+        waited = started - job.enqueued
+        self._waits[priority].append(waited)
+        if waited > SLOW_WAIT_SECONDS:
+            self.logger.warning(f"[Outbox] {PRIORITY_NAMES[priority]} {job.kind} waited {waited:.1f}s (depth {self.depth()})")
+        try:
+            if job.kind == "send":
+                result = await job.target.send(job.content, **job.kwargs)
+            elif job.kind == "purge":
+                result = await job.target.delete_messages(job.content)
+            else:
+                result = await job.target.delete()
+            for future in job.futures:
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            err.log_error(f"outbox.{job.kind}", e)
+            for future in job.futures:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._inflight.discard(key)
+            self._wake.set()
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            delay = self._dispatch_ready()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,120 @@
+"""Recurring event rules and their lazy expansion.
+
+A series is one ``events`` row whose ``repeat_*`` columns hold the rule;
+its ``datetime_utc`` is the first occurrence and it never shows up as an
+event itself. ``occurrences`` walks the rule from any point without
+touching earlier slots and yields for as long as the caller keeps asking,
+so an endless series costs only the slots actually consumed.
+
+Rules are in UTC like every other event time:
+    daily                  every day at the series' time
+    every 3 days           every third day
+    weekly                 every week on the first event's weekday
+    weekly mon,thu         every week on Monday and Thursday
+    every 2 weeks tue      every other Tuesday
+Any of them may end with ``until YYYY-MM-DD`` (inclusive).
+"""
+import datetime
+import re
+
+DAY = 86400
+WEEK = 7 * DAY
+MAX_EVERY = 365
+# How far ahead the reminder engine keeps occurrences materialized
+HORIZON_SECONDS = 2 * DAY
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_UNTIL = re.compile(r"\buntil\s+(\d{4}-\d{2}-\d{2})\s*$")
+_EVERY = re.compile(r"^every\s+(\d+)\s+(day|week)s?\b")
+
+def parse(raw: str, start_utc: int) -> dict:
+    """A rule typed by an R4 as ``repeat_*`` column values, or None for no repeat."""
+    text = " ".join(raw.lower().replace(",", " ").split())
+    until = None
+    match = _UNTIL.search(text)
+    if match:
+        try:
+            end_date = datetime.datetime.strptime(match.group(1), "%Y-%m-%d")
+        except ValueError:
+            raise ValueError("Repeat end date must be YYYY-MM-DD.")
+        until = int(end_date.replace(tzinfo=datetime.timezone.utc).timestamp()) + DAY
+        if until <= start_utc:
+            raise ValueError("Repeat end date is before the first event.")
+        text = text[:match.start()].strip()
+    if text in ("", "none", "never", "no"):
+        if until is not None:
+            raise ValueError("`until` needs a repeat rule before it.")
+        return None
+
+    every = 1
+    match = _EVERY.match(text)
+    if match:
+        every = int(match.group(1))
+        rule = "daily" if match.group(2) == "day" else "weekly"
+        rest = text[match.end():].split()
+    else:
+        text = re.sub(r"^every day\b", "daily", re.sub(r"^every week\b", "weekly", text))
+        rule, *rest = text.split()
+        if rule not in ("daily", "weekly"):
+            raise ValueError("Repeat must be like `daily`, `every 3 days`, `weekly mon,thu` or `every 2 weeks`.")
+    if not 1 <= every <= MAX_EVERY:
+        raise ValueError(f"Repeat interval must be between 1 and {MAX_EVERY}.")
+
+    days = 0
+    if rule == "weekly":
+        for token in rest:
+            if token[:3] not in WEEKDAYS:
+                raise ValueError(f"Unknown weekday `{token}`.")
+            days |= 1 << WEEKDAYS.index(token[:3])
+        if not days:
+            days = 1 << _weekday(start_utc)
+    elif rest:
+        raise ValueError("Weekdays only apply to weekly repeats.")
+    return {"repeat_rule": rule, "repeat_every": every, "repeat_days": days, "repeat_until": until}
+
+def describe(rule: dict) -> str:
+    """The rule back in the form ``parse`` reads (empty for no rule)."""
+    if not rule or not rule.get("repeat_rule"):
+        return ""
+    every = rule["repeat_every"]
+    if rule["repeat_rule"] == "daily":
+        text = "daily" if every == 1 else f"every {every} days"
+    else:
+        days = ",".join(day for i, day in enumerate(WEEKDAYS) if rule["repeat_days"] & (1 << i))
+        text = ("weekly" if every == 1 else f"every {every} weeks") + f" {days}"
+    if rule.get("repeat_until"):
+        last_day = datetime.datetime.fromtimestamp(rule["repeat_until"] - DAY, datetime.timezone.utc)
+        text += f" until {last_day:%Y-%m-%d}"
+    return text
+
+def _weekday(ts: int) -> int:
+    return (ts // DAY + 3) % 7  # 1970-01-01 was a Thursday
+
+def occurrences(series: dict, after_utc: int, until_utc: int = None):
+    """Start times of ``series`` in [after_utc, until_utc), in order; endless if neither bound ends it."""
+    anchor = series["datetime_utc"]
+    stop = min(t for t in (until_utc, series.get("repeat_until"), 2**62) if t is not None)
+    after_utc = max(after_utc, anchor)
+    if series["repeat_rule"] == "daily":
+        step = series["repeat_every"] * DAY
+        t = anchor + -(-(after_utc - anchor) // step) * step
+        while t < stop:
+            yield t
+            t += step
+        return
+
+    days = [d for d in range(7) if series["repeat_days"] & (1 << d)]
+    if not days:
+        return
+    week0 = anchor - _weekday(anchor) * DAY  # the anchor's Monday, at the series' time of day
+    period = series["repeat_every"] * WEEK
+    base = week0 + (after_utc - week0) // period * period
+    while True:
+        for d in days:
+            t = base + d * DAY
+            if t < after_utc:
+                continue
+            if t >= stop:
+                return
+            yield t
+        base += period
@@ -0,0 +1,37 @@
+"""Bot-sent messages that CleanupCog purges once they expire.
+
+Dashboards and announcements are recorded here when they are sent, so
+cleanup can bulk-delete exactly those messages instead of scanning
+channel history for them. Pinned panels are recorded too (never expiring)
+so the dashboard cog can find them again after a restart.
+"""
+import asyncio
+from utils import adb, err
+
+DASHBOARD = "dashboard"
+ANNOUNCEMENT = "announcement"
+PANEL = "panel"
+
+# Dashboards die with their view (300s timeout); announcements an hour after the event starts.
+# The pinned panel never expires; it is forgotten when replaced.
+DASHBOARD_TTL_SECONDS = 6 * 60
+ANNOUNCEMENT_GRACE_SECONDS = 60 * 60
+NEVER = 2**62
+
+_tracking = set()  # the event loop only keeps weak references to tasks
+
+async def track(message, kind: str, expires_utc: int):
+    try:
+        guild_id = message.guild.id if message.guild else 0
+        await adb.track_message(guild_id, message.id, message.channel.id, kind, expires_utc)
+    except Exception as e:
+        err.log_error("registry.track", e)
+
+def track_when_sent(future: asyncio.Future, kind: str, expires_utc: int):
+    """Record the message once a queued outbox send goes out."""
+    def done(f):
+        if not f.cancelled() and f.exception() is None:
+            task = asyncio.create_task(track(f.result(), kind, expires_utc))
+            _tracking.add(task)
+            task.add_done_callback(_tracking.discard)
+    future.add_done_callback(done)
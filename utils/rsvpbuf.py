@@ -0,0 +1,86 @@
+"""Write-behind buffer for RSVP clicks.
+
+A burst of RSVPs (everyone answering a new-event announcement) would
+otherwise be one upsert and one commit per click, queued on the single
+writer thread. Clicks land here instead and are answered at once; every
+FLUSH_SECONDS the pending rows are written with one executemany in one
+transaction. A later click by the same player on the same event replaces
+their earlier pending one.
+
+Reads that must reflect a click go through ``lookup`` (pending and
+in-flight rows) before the database. After each flush adb publishes the
+touched events, so caches and reminder deadlines refresh as for any other
+write. ``drain`` writes whatever is left at shutdown.
+"""
+import asyncio
+import logging
+from utils import adb, db, err
+
+FLUSH_SECONDS = 0.25
+RETRY_SECONDS = 5
+
+logger = logging.getLogger("nova")
+
+# (guild_id, event_id, discord_id) → (player_name, response, reminder_minutes)
+_pending = {}
+_inflight = {}  # the batch being written right now
+_flusher = None
+
+def set_rsvp(guild_id: int, event_id: int, discord_id: int, player_name: str, response: str,
+             reminder_minutes: int = None):
+    """Queue an RSVP; it reaches the database within FLUSH_SECONDS."""
+    global _flusher
+    _pending[(guild_id, event_id, discord_id)] = (player_name, response, reminder_minutes)
+    if _flusher is None or _flusher.done():
+        _flusher = asyncio.create_task(_run())
+
+def lookup(guild_id: int, event_id: int, discord_id: int):
+    """The not-yet-committed ``(player_name, response, reminder_minutes)`` for a player, or None."""
+    key = (guild_id, event_id, discord_id)
+    return _pending.get(key) or _inflight.get(key)
+
+async def _run():
+    delay = FLUSH_SECONDS
+    while _pending:
+        await asyncio.sleep(delay)
+        delay = FLUSH_SECONDS if await _flush() else RETRY_SECONDS
+
+async def _flush() -> bool:
+    global _inflight
+    batch = dict(_pending)
+    _pending.clear()
+    _inflight = batch
+    try:
+        await adb.set_rsvps(_rows(batch))
+    except BaseException as e:
+        # Failed, or cancelled at shutdown before the writer ran it: requeue so
+        # the next flush (or drain) writes it. A click made during the flush is newer.
+        for key, value in batch.items():
+            _pending.setdefault(key, value)
+        _inflight = {}
+        if not isinstance(e, Exception):
+            raise
+        err.log_error("rsvpbuf.flush", e, include_trace=True)
+        return False
+    _inflight = {}
+    logger.debug("[rsvpbuf] Flushed %s RSVPs", len(batch))
+    return True
+
+def _rows(batch: dict) -> list[tuple]:
+    return [(guild_id, event_id, discord_id, *value) for (guild_id, event_id, discord_id), value in batch.items()]
+
+def drain():
+    """Write pending RSVPs synchronously; for shutdown, after adb's writer has stopped."""
+    # An interrupted flush may or may not have committed; rewriting it is harmless
+    batch = {**_inflight, **_pending}
+    if not batch:
+        return
+    try:
+        db.set_rsvps(_rows(batch))
+        logger.info(f"💾 Flushed {len(batch)} buffered RSVPs on shutdown")
+        _pending.clear()
+        _inflight.clear()
+    except Exception as e:
+        err.log_error("rsvpbuf.drain", e, include_trace=True)
+    finally:
+        db.close_all()
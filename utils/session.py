@@ -0,0 +1,68 @@
+"""Per-user dashboard sessions with LRU and TTL eviction.
+
+Keyed by ``(guild_id, user_id)``: a player's name, timezone and role are
+per guild. Sessions sit in an OrderedDict in last-use order,
+so lookup and refresh are O(1) and the stalest session is always at the
+front: each access drops expired sessions from the head, and the store
+never holds more than ``max_sessions`` however many users click.
+"""
+import time
+from collections import OrderedDict
+
+SESSION_TTL_SECONDS = 15 * 60
+MAX_SESSIONS = 1000
+
+class Session:
+    """What a dashboard needs about one user between clicks."""
+    __slots__ = ("guild_id", "viewer", "user_tz", "is_admin", "cursor", "touched")
+
+    def __init__(self, guild_id: int, viewer: int, user_tz: str, is_admin: bool):
+        self.guild_id = guild_id
+        self.viewer = viewer
+        self.user_tz = user_tz
+        self.is_admin = is_admin
+        self.cursor = None  # the user's EventPager, created on first browse
+        self.touched = 0.0
+
+class SessionStore:
+    def __init__(self, max_sessions: int = MAX_SESSIONS, ttl: float = SESSION_TTL_SECONDS, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._clock = clock
+        self._sessions = OrderedDict()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, key: tuple) -> Session:
+        """The user's live session (refreshing its TTL), or None."""
+        now = self._clock()
+        self._expire(now)
+        session = self._sessions.get(key)
+        if session is not None:
+            session.touched = now
+            self._sessions.move_to_end(key)
+        return session
+
+    def put(self, key: tuple, session: Session) -> Session:
+        now = self._clock()
+        self._expire(now)
+        session.touched = now
+        self._sessions[key] = session
+        self._sessions.move_to_end(key)
+        if len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return session
+
+    def pop(self, key: tuple):
+        return self._sessions.pop(key, None)
+
+    def values(self):
+        return list(self._sessions.values())
+
+    def _expire(self, now: float):
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.touched < self.ttl:
+                break
+            self._sessions.popitem(last=False)
@@ -0,0 +1,59 @@
+"""One-time startup work, run once per process.
+
+on_ready fires again after every gateway reconnect, so cogs register their
+initialization here instead of doing it in their own on_ready listeners.
+bot.py calls ``run()`` from on_ready: a phase that succeeded never runs
+again, and one that failed is retried on the next on_ready. A failed
+required phase (database setup and the legacy data move) also stops the
+phases after it, which would otherwise run against a half-initialized
+bot; optional ones are skipped over.
+"""
+import asyncio
+import logging
+import time
+from utils import err
+
+logger = logging.getLogger("nova")
+
+_phases = {}  # name → coroutine function, run in registration order
+_required = set()
+_done = set()
+_lock = None
+
+def register(name: str, fn, required: bool = False):
+    """Run ``await fn()`` once at startup (again if re-registered, e.g. by a cog reload).
+
+    ``required`` phases must succeed before any later phase runs.
+    """
+    _phases[name] = fn
+    _done.discard(name)
+    if required:
+        _required.add(name)
+    else:
+        _required.discard(name)
+
+async def run():
+    global _lock
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        pending = [(name, fn) for name, fn in _phases.items() if name not in _done]
+        if not pending:
+            logger.info("🔄 Reconnected; startup already complete")
+            return
+
+        total = time.perf_counter()
+        for name, fn in pending:
+            start = time.perf_counter()
+            try:
+                await fn()
+            except Exception as e:
+                err.log_error(f"startup.{name}", e, include_trace=True)
+                if name in _required:
+                    raise RuntimeError(f"Required startup phase {name} failed; "
+                                       "later phases wait for the next on_ready") from e
+                continue
+            _done.add(name)
+            logger.info(f"⏱️ Startup phase {name}: {(time.perf_counter() - start) * 1000:.0f} ms")
+        logger.info(f"✅ Startup finished in {(time.perf_counter() - total) * 1000:.0f} ms "
+                    f"({len(_done)}/{len(_phases)} phases done)")
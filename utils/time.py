@@ -1,5 +1,8 @@
+import bisect
 import datetime
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import difflib
+import functools
+from zoneinfo import ZoneInfo, available_timezones
 
 ALIAS_MAP = {
     # US timezones
@@ -75,30 +78,112 @@ ALIAS_MAP = {
     "egypt": "Africa/Cairo",
 }
 
+UTC_FORMAT = "%Y-%m-%d %H:%M"
+
+def parse_utc(raw: str) -> int:
+    """Parse a 'YYYY-MM-DD HH:MM' UTC string into epoch seconds."""
+    dt = datetime.datetime.strptime(raw.strip(), UTC_FORMAT)
+    return int(dt.replace(tzinfo=datetime.timezone.utc).timestamp())
+
+def from_epoch(ts: int) -> datetime.datetime:
+    """Epoch seconds to an aware UTC datetime."""
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc)
+
+def format_utc(ts: int) -> str:
+    """Epoch seconds to the 'YYYY-MM-DD HH:MM' UTC display format."""
+    return from_epoch(ts).strftime(UTC_FORMAT)
+
+def now_epoch() -> int:
+    return int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+
+class TimezoneResolver:
+    """Index of ALIAS_MAP plus every IANA zone name, built once per process.
+
+    Exact lookups (case-, space- and underscore-insensitive) are one dict hit;
+    autocomplete does a bisect prefix scan over the sorted keys and the city
+    part of each zone, falling back to fuzzy matching. Resolved ZoneInfo
+    objects sit in a bounded LRU cache.
+    """
+
+    def __init__(self, aliases: dict = ALIAS_MAP, zone_cache_size: int = 512):
+        zones = sorted(available_timezones())
+        self._exact = {}
+        cities = {}
+        for name in zones:
+            self._exact[self._key(name)] = name
+            cities.setdefault(self._key(name.rsplit("/", 1)[-1]), []).append(name)
+        # A bare city ("chicago") resolves only when it is unambiguous
+        for city, names in cities.items():
+            if len(names) == 1:
+                self._exact.setdefault(city, names[0])
+        for alias, name in aliases.items():
+            self._exact[self._key(alias)] = name
+
+        self._keys = sorted(self._exact)
+        self._zones = zones
+        self._by_city = sorted((self._key(n.rsplit("/", 1)[-1]), n) for n in zones)
+        self.zone = functools.lru_cache(maxsize=zone_cache_size)(self._load_zone)
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return text.strip().lower().replace(" ", "_")
+
+    def resolve(self, tz_input: str) -> str:
+        """Canonical IANA name for an alias or zone name; ValueError if unknown."""
+        canonical = self._exact.get(self._key(tz_input))
+        if canonical is None:
+            hint = self.fuzzy(tz_input, limit=3)
+            suffix = f" Did you mean: {', '.join(hint)}?" if hint else ""
+            raise ValueError(f"Invalid timezone: '{tz_input}'.{suffix}")
+        return canonical
+
+    def _load_zone(self, tz_input: str) -> ZoneInfo:
+        return ZoneInfo(self.resolve(tz_input))
+
+    def complete(self, prefix: str, limit: int = 25) -> list[str]:
+        """Canonical zone names matching ``prefix`` by alias/name, then city, then fuzzily."""
+        key = self._key(prefix)
+        if not key:
+            return self._zones[:limit]
+        seen = []
+        for index, pairs in ((self._keys, None), (self._by_city, True)):
+            lo = bisect.bisect_left(index, (key,) if pairs else key)
+            for item in index[lo:]:
+                word, name = item if pairs else (item, self._exact[item])
+                if not word.startswith(key):
+                    break
+                if name not in seen:
+                    seen.append(name)
+                    if len(seen) >= limit:
+                        return seen
+        if not seen:
+            seen = self.fuzzy(prefix, limit)
+        return seen
+
+    def fuzzy(self, text: str, limit: int = 5) -> list[str]:
+        matches = difflib.get_close_matches(self._key(text), self._keys, n=limit * 2, cutoff=0.6)
+        names = []
+        for match in matches:
+            name = self._exact[match]
+            if name not in names:
+                names.append(name)
+        return names[:limit]
+
+_resolver = None
+
+def resolver() -> TimezoneResolver:
+    """The process-wide resolver; call once at startup to build it eagerly."""
+    global _resolver
+    if _resolver is None:
+        _resolver = TimezoneResolver()
+    return _resolver
+
 def normalize_timezone(tz_input: str) -> str:
-    key = tz_input.strip().lower()
-    canonical = ALIAS_MAP.get(key, key)
+    return resolver().resolve(tz_input)
 
-    # Try ZoneInfo validation first
-    try:
-        ZoneInfo(canonical)
-        return canonical
-    except ZoneInfoNotFoundError:
-        pass
-
-    # Try to clean up malformed custom formats like 'europe/paris'
-    if "/" in key:
-        parts = key.split("/", 1)
-        region = parts[0].title()
-        city = parts[1].replace("_", " ").title().replace(" ", "_")
-        fixed = f"{region}/{city}"
-        try:
-            ZoneInfo(fixed)
-            return fixed
-        except ZoneInfoNotFoundError:
-            pass
-
-    raise ValueError(f"Invalid timezone: '{tz_input}'")
+def get_zone(tz_str: str) -> ZoneInfo:
+    """Cached ZoneInfo for a (possibly aliased) timezone string."""
+    return resolver().zone(tz_str)
 
 def parse_time_string(raw: str) -> tuple[int, int]:
     """Support smart formats like '4pm', '04:00', '16', '4:30', '430'"""
@@ -137,8 +222,7 @@ def parse_time_string(raw: str) -> tuple[int, int]:
 def local_to_utc(raw_time: str, tz_str: str) -> datetime.datetime:
     """Convert a smart time string in local timezone to UTC datetime."""
     try:
-        tz_str = normalize_timezone(tz_str)
-        tz = ZoneInfo(tz_str)
+        tz = get_zone(tz_str)
         now = datetime.datetime.now(tz)
         hour, minute = parse_time_string(raw_time)
         local_dt = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
@@ -149,8 +233,7 @@ def local_to_utc(raw_time: str, tz_str: str) -> datetime.datetime:
 def utc_to_local(utc_dt: datetime.datetime, tz_str: str) -> str:
     """Convert UTC datetime to HH:MM string in given timezone."""
     try:
-        tz_str = normalize_timezone(tz_str)
-        local_dt = utc_dt.astimezone(ZoneInfo(tz_str))
+        local_dt = utc_dt.astimezone(get_zone(tz_str))
         return local_dt.strftime("%H:%M")
     except Exception as e:
         raise ValueError(f"Failed to convert to local time: {e}")